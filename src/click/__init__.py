@@ -8,6 +8,7 @@ composable.
 from __future__ import annotations
 
 from .core import Argument as Argument
+from .core import CachedDefault as CachedDefault
 from .core import Command as Command
 from .core import CommandCollection as CommandCollection
 from .core import Context as Context
@@ -57,12 +58,17 @@ from .types import FLOAT as FLOAT
 from .types import FloatRange as FloatRange
 from .types import INT as INT
 from .types import IntRange as IntRange
+from .types import LineStream as LineStream
+from .types import MappedFile as MappedFile
 from .types import ParamType as ParamType
 from .types import Path as Path
+from .types import RecordStream as RecordStream
 from .types import STRING as STRING
 from .types import Tuple as Tuple
 from .types import UNPROCESSED as UNPROCESSED
 from .types import UUID as UUID
+from .utils import atomic_batch as atomic_batch
+from .utils import copy_stream as copy_stream
 from .utils import echo as echo
 from .utils import format_filename as format_filename
 from .utils import get_app_dir as get_app_dir
@@ -6,6 +6,7 @@ import io
 import os
 import re
 import sys
+import threading
 import typing as t
 from types import TracebackType
 from weakref import WeakKeyDictionary
@@ -360,12 +361,13 @@ def _wrap_io_open(
     mode: str,
     encoding: str | None,
     errors: str | None,
+    buffering: int = -1,
 ) -> t.IO[t.Any]:
     """Handles not passing ``encoding`` and ``errors`` in binary mode."""
     if "b" in mode:
-        return open(file, mode)
+        return open(file, mode, buffering)
 
-    return open(file, mode, encoding=encoding, errors=errors)
+    return open(file, mode, buffering, encoding=encoding, errors=errors)
 
 
 def open_stream(
@@ -374,7 +376,26 @@ def open_stream(
     encoding: str | None = None,
     errors: str | None = "strict",
     atomic: bool = False,
+    durability: t.Literal["none", "file", "dir"] = "none",
+    buffering: int = -1,
+    compression: str | None = None,
+    threaded: bool = False,
 ) -> tuple[t.IO[t.Any], bool]:
+    if compression is not None:
+        from ._compression import open_compressed
+
+        return open_compressed(
+            filename,
+            mode,
+            encoding,
+            errors,
+            atomic,
+            durability,
+            buffering,
+            compression,
+            threaded,
+        )
+
     binary = "b" in mode
     filename = os.fspath(filename)
 
@@ -391,7 +412,7 @@ def open_stream(
 
     # Non-atomic writes directly go out through the regular open functions.
     if not atomic:
-        return _wrap_io_open(filename, mode, encoding, errors), True
+        return _wrap_io_open(filename, mode, encoding, errors, buffering), True
 
     # Some usability stuff for atomic writes
     if "a" in mode:
@@ -405,6 +426,8 @@ def open_stream(
         raise ValueError("Use the `overwrite`-parameter instead.")
     if "w" not in mode:
         raise ValueError("Atomic writes only make sense with `w`-mode.")
+    if durability not in ("none", "file", "dir"):
+        raise ValueError("`durability` must be 'none', 'file', or 'dir'.")
 
     # Atomic writes are more complicated.  They work by opening a file
     # as a proxy in the same folder and then using the fdopen
@@ -444,29 +467,188 @@ def open_stream(
     if perm is not None:
         os.chmod(tmp_filename, perm)  # in case perm includes bits in umask
 
-    f = _wrap_io_open(fd, mode, encoding, errors)
-    af = _AtomicFile(f, tmp_filename, os.path.realpath(filename))
+    f = _wrap_io_open(fd, mode, encoding, errors, buffering)
+    af = _AtomicFile(
+        f,
+        tmp_filename,
+        os.path.realpath(filename),
+        durability,
+        (mode, encoding, errors, buffering),
+    )
     return t.cast(t.IO[t.Any], af), True
 
 
+def append_mode(mode: str) -> str:
+    """Get the mode to open a file that was written to again, without
+    truncating it.
+    """
+    return mode.replace("w", "a").replace("x", "a")
+
+
+def _fsync_dir(path: str) -> None:
+    """Flush a directory entry change, such as a rename, to disk. Windows
+    can't open directories, and commits renames itself.
+    """
+    if os.name == "nt":
+        return
+
+    import errno
+
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        # Some file systems don't support syncing directories.
+        if e.errno not in (errno.EINVAL, errno.ENOTSUP):
+            raise
+    finally:
+        os.close(fd)
+
+
+def _is_clean_exit(exc_value: BaseException | None) -> bool:
+    from .exceptions import Exit
+
+    if isinstance(exc_value, Exit):
+        return exc_value.exit_code == 0
+
+    if isinstance(exc_value, SystemExit):
+        return exc_value.code in (0, None)
+
+    return False
+
+
+class _AtomicBatch:
+    """Atomic files opened while the batch is active are written and
+    synced, but only replace their targets once the batch ends, together.
+    If the batch fails, all of them are discarded.
+    """
+
+    def __init__(self) -> None:
+        self.files: list[_AtomicFile] = []
+
+    def commit(self) -> None:
+        try:
+            for f in self.files:
+                f.close()
+
+            dirs = set()
+
+            for f in self.files:
+                os.replace(f._tmp_filename, f._real_filename)
+
+                if f._durability == "dir":
+                    dirs.add(os.path.dirname(f._real_filename))
+
+            for path in dirs:
+                _fsync_dir(path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        for f in list(self.files):
+            f.closed = True
+            f._discard()
+
+
+_atomic_batches = threading.local()
+
+
+def _get_atomic_batch() -> _AtomicBatch | None:
+    batches: list[_AtomicBatch] = getattr(_atomic_batches, "stack", [])
+    return batches[-1] if batches else None
+
+
 class _AtomicFile:
-    def __init__(self, f: t.IO[t.Any], tmp_filename: str, real_filename: str) -> None:
+    def __init__(
+        self,
+        f: t.IO[t.Any],
+        tmp_filename: str,
+        real_filename: str,
+        durability: t.Literal["none", "file", "dir"] = "none",
+        open_args: tuple[str, str | None, str | None, int] = ("w", None, None, -1),
+    ) -> None:
         self._f = f
         self._tmp_filename = tmp_filename
         self._real_filename = real_filename
+        self._durability = durability
+        self._open_args = open_args
+        self._batch = _get_atomic_batch()
         self.closed = False
 
+        if self._batch is not None:
+            self._batch.files.append(self)
+
     @property
     def name(self) -> str:
         return self._real_filename
 
     def close(self, delete: bool = False) -> None:
+        """Replace the target with the written file. If ``delete`` is
+        true, or the file can't be written, the target is left unchanged
+        and the written file is removed instead.
+        """
         if self.closed:
             return
-        self._f.close()
-        os.replace(self._tmp_filename, self._real_filename)
+
         self.closed = True
 
+        if delete:
+            self._discard()
+            return
+
+        try:
+            self._f.flush()
+
+            if self._durability != "none":
+                os.fsync(self._f.fileno())
+
+            self._f.close()
+        except BaseException:
+            self._discard()
+            raise
+
+        # A batch replaces all its files once they're all written.
+        if self._batch is not None:
+            return
+
+        try:
+            os.replace(self._tmp_filename, self._real_filename)
+        except BaseException:
+            self._discard()
+            raise
+
+        if self._durability == "dir":
+            _fsync_dir(os.path.dirname(self._real_filename))
+
+    def _suspend(self) -> None:
+        """Close the written file without replacing the target, to free
+        its descriptor until :meth:`_resume` is called.
+        """
+        self._f.flush()
+        self._f.close()
+
+    def _resume(self) -> None:
+        mode, encoding, errors, buffering = self._open_args
+        mode = append_mode(mode)
+        self._f = _wrap_io_open(self._tmp_filename, mode, encoding, errors, buffering)
+
+    def _discard(self) -> None:
+        # A discarded file doesn't replace its target when the batch ends.
+        if self._batch is not None and self in self._batch.files:
+            self._batch.files.remove(self)
+
+        try:
+            self._f.close()
+        except (OSError, ValueError):
+            pass
+
+        try:
+            os.unlink(self._tmp_filename)
+        except OSError:
+            pass
+
     def __getattr__(self, name: str) -> t.Any:
         return getattr(self._f, name)
 
@@ -479,7 +661,7 @@ class _AtomicFile:
         exc_value: BaseException | None,
         tb: TracebackType | None,
     ) -> None:
-        self.close(delete=exc_type is not None)
+        self.close(delete=exc_type is not None and not _is_clean_exit(exc_value))
 
     def __repr__(self) -> str:
         return repr(self._f)
@@ -0,0 +1,352 @@
+"""Run custom ``shell_complete`` functions, see
+:attr:`Parameter.shell_complete_timeout`.
+
+Functions may return a list, an iterable that produces items one at a
+time, an awaitable, or an async iterable. With a time budget, the
+function runs in a detached process that sends each item to the
+completing process as it's produced. If the budget runs out, the results
+cached by the last finished completion of the same value are used, or
+the items produced so far. The detached process keeps running, up to
+``_MAX_BACKGROUND`` seconds, and caches its results for the next
+completion. The cache keeps the most recent results, up to a limit.
+
+Without :func:`os.fork`, the function runs in a thread, which doesn't
+outlive the completing process. If the function fails, its traceback is
+shown on stderr, and the cached or partial results are used as well.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import inspect
+import os
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .core import Context
+    from .core import Parameter
+    from .shell_completion import CompletionItem
+
+_CACHE_DIR = "completion-cache"
+_MAX_CACHE = 256
+_MAX_BACKGROUND = 60
+
+_Func = t.Callable[["Context", "Parameter", str], t.Any]
+
+
+def iter_results(results: t.Any) -> cabc.Iterator[t.Any]:
+    """Produce the items returned by a ``shell_complete`` function, which
+    may be awaitable or asynchronous.
+    """
+    if inspect.isawaitable(results):
+        import asyncio
+
+        async def wait() -> t.Any:
+            return await results
+
+        results = asyncio.run(wait())
+
+    if hasattr(results, "__aiter__"):
+        import asyncio
+
+        iterator = results.__aiter__()
+        loop = asyncio.new_event_loop()
+
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(iterator.__anext__())
+                except StopAsyncIteration:
+                    break
+        finally:
+            loop.close()
+    else:
+        yield from results
+
+
+def _to_item(value: t.Any) -> CompletionItem:
+    from .shell_completion import CompletionItem
+
+    if isinstance(value, CompletionItem):
+        return value
+
+    return CompletionItem(value)
+
+
+def _dump(item: CompletionItem) -> bytes:
+    import json
+
+    data = [str(item.value), item.type, item.help]
+    return json.dumps(data).encode() + b"\n"
+
+
+def _load(line: bytes) -> CompletionItem:
+    import json
+
+    from .shell_completion import CompletionItem
+
+    value, type, help = json.loads(line)
+    return CompletionItem(value, type=type, help=help)
+
+
+def _cache_path(ctx: Context, param: Parameter, incomplete: str) -> str:
+    import hashlib
+
+    from .utils import get_app_dir
+
+    root = ctx.find_root()
+    app_dir = get_app_dir(root.info_name or root.command.name or "")
+    key = repr((ctx.command_path, param.name, incomplete))
+    name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(app_dir, _CACHE_DIR, name)
+
+
+def _read_cache(
+    ctx: Context, param: Parameter, incomplete: str
+) -> list[CompletionItem] | None:
+    """Find cached results for the incomplete value, or for a shorter
+    prefix of it, filtered to the values that start with it.
+    """
+    for end in range(len(incomplete), -1, -1):
+        try:
+            with open(_cache_path(ctx, param, incomplete[:end]), "rb") as f:
+                items = [_load(line) for line in f]
+        except (OSError, ValueError):
+            continue
+
+        return [item for item in items if str(item.value).startswith(incomplete)]
+
+    return None
+
+
+def _write_cache(
+    ctx: Context, param: Parameter, incomplete: str, items: list[CompletionItem]
+) -> None:
+    path = _cache_path(ctx, param, incomplete)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(tmp_path, "wb") as f:
+            f.writelines(_dump(item) for item in items)
+
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    else:
+        _prune(os.path.dirname(path))
+
+
+def _prune(path: str) -> None:
+    """Remove the oldest results from the cache directory if there are
+    more than the limit.
+    """
+    try:
+        entries = [(e.stat().st_mtime_ns, e.path) for e in os.scandir(path)]
+    except OSError:
+        return
+
+    if len(entries) <= _MAX_CACHE:
+        return
+
+    entries.sort()
+
+    for _, old_path in entries[: len(entries) - _MAX_CACHE]:
+        try:
+            os.unlink(old_path)
+        except OSError:
+            pass
+
+
+def run_with_timeout(
+    func: _Func,
+    ctx: Context,
+    param: Parameter,
+    incomplete: str,
+    timeout: float,
+) -> list[CompletionItem]:
+    """Call the ``shell_complete`` function, waiting up to ``timeout``
+    seconds for it to finish.
+    """
+    if hasattr(os, "fork"):
+        items, done = _run_forked(func, ctx, param, incomplete, timeout)
+    else:
+        items, done = _run_thread(func, ctx, param, incomplete, timeout)
+
+    if done:
+        return items
+
+    cached = _read_cache(ctx, param, incomplete)
+    return cached if cached is not None else items
+
+
+def _run_forked(
+    func: _Func,
+    ctx: Context,
+    param: Parameter,
+    incomplete: str,
+    timeout: float,
+) -> tuple[list[CompletionItem], bool]:
+    import select
+    import time
+
+    deadline = time.monotonic() + timeout
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        os.close(read_fd)
+        _detach()
+        _complete_in_child(func, ctx, param, incomplete, write_fd, deadline)
+
+    os.close(write_fd)
+    # The intermediate process exits as soon as it has forked the worker.
+    os.waitpid(pid, 0)
+    items: list[CompletionItem] = []
+    buffer = b""
+    done = False
+
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                break
+
+            chunk = os.read(read_fd, 65536)
+
+            if not chunk:
+                break
+
+            *lines, buffer = (buffer + chunk).split(b"\n")
+
+            for line in lines:
+                if line:
+                    items.append(_load(line))
+                else:
+                    # An empty line marks the end of the results.
+                    done = True
+    finally:
+        # Closing the pipe doesn't stop the worker, it finishes in the
+        # background and caches the results for the next completion.
+        os.close(read_fd)
+
+    return items, done
+
+
+def _detach() -> None:
+    """Fork again in a new session and exit the intermediate process, so
+    the worker isn't a child of the completing process. It's not waited
+    for, and isn't stopped with the shell's completion job.
+    """
+    try:
+        os.setsid()
+
+        if os.fork() != 0:
+            os._exit(0)
+    except BaseException:
+        os._exit(1)
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    while data:
+        data = data[os.write(fd, data) :]
+
+
+def _complete_in_child(
+    func: _Func,
+    ctx: Context,
+    param: Parameter,
+    incomplete: str,
+    write_fd: int,
+    deadline: float,
+) -> t.NoReturn:
+    """Send each item to the parent as it's produced, then cache the
+    results. Stdout is the shell's completion output, so the function
+    can't write to it. Errors are shown on stderr, like they are when
+    completing without a time budget, unless the parent stopped waiting.
+
+    Once the parent stops waiting, the function keeps running and the
+    results are cached, but the process is stopped after
+    ``_MAX_BACKGROUND`` seconds in case the function never finishes.
+    """
+    import signal
+    import time
+
+    code = 0
+    sending = True
+
+    try:
+        signal.signal(signal.SIGPIPE, signal.SIG_IGN)
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+        signal.alarm(_MAX_BACKGROUND)
+        null_fd = os.open(os.devnull, os.O_RDWR)
+
+        for fd in (0, 1):
+            os.dup2(null_fd, fd)
+
+        items = []
+
+        for value in iter_results(func(ctx, param, incomplete)):
+            item = _to_item(value)
+            items.append(item)
+
+            if sending:
+                try:
+                    _write_all(write_fd, _dump(item))
+                except OSError:
+                    # The parent closed the pipe after its budget ran out.
+                    sending = False
+
+        _write_cache(ctx, param, incomplete, items)
+
+        # Mark the end after caching, so the next completion finds them.
+        if sending:
+            _write_all(write_fd, b"\n")
+    except BaseException:
+        if sending and time.monotonic() < deadline:
+            import traceback
+
+            traceback.print_exc()
+
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def _run_thread(
+    func: _Func,
+    ctx: Context,
+    param: Parameter,
+    incomplete: str,
+    timeout: float,
+) -> tuple[list[CompletionItem], bool]:
+    import threading
+
+    items: list[CompletionItem] = []
+    finished = threading.Event()
+    failed = False
+
+    def target() -> None:
+        nonlocal failed
+
+        try:
+            for value in iter_results(func(ctx, param, incomplete)):
+                items.append(_to_item(value))
+
+            _write_cache(ctx, param, incomplete, items)
+        except Exception:
+            import traceback
+
+            traceback.print_exc()
+            failed = True
+        finally:
+            finished.set()
+
+    threading.Thread(target=target, daemon=True).start()
+    done = finished.wait(timeout) and not failed
+    return list(items), done
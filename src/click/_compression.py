@@ -0,0 +1,380 @@
+"""Open compressed files for :class:`click.File`, see its ``compression``
+parameter.
+
+The data is decompressed or compressed as it's read or written, the
+whole file is never held in memory. When reading, the format is detected
+from the first bytes of the file, so standard input and files with any
+name work. When writing, it's taken from the file name's extension.
+Decompressing can be done in a background thread, which overlaps with
+working with the data, since the decompressors release the GIL.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import errno
+import io
+import os
+import threading
+import typing as t
+from types import TracebackType
+
+_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz", ".zst": "zstd"}
+FORMATS = frozenset(_EXTENSIONS.values())
+
+
+def detect(name: str, head: bytes | None = None) -> str | None:
+    """Get the compression format of a file from its first bytes, or from
+    its name's extension if they're not given.
+    """
+    if head is not None:
+        for magic, format in _MAGIC:
+            if head.startswith(magic):
+                return format
+
+        return None
+
+    return _EXTENSIONS.get(os.path.splitext(name)[1].lower())
+
+
+def _open_zstd(f: t.BinaryIO, mode: str) -> t.BinaryIO:
+    try:
+        # Added in Python 3.14.
+        from compression import zstd  # type: ignore[import-not-found]
+    except ImportError:
+        pass
+    else:
+        return t.cast(t.BinaryIO, zstd.ZstdFile(f, mode))
+
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        raise OSError(
+            errno.ENOTSUP, "zstd requires Python 3.14 or the 'zstandard' library"
+        ) from None
+
+    return t.cast(t.BinaryIO, zstandard.open(f, mode, closefd=False))
+
+
+def _open_format(f: t.BinaryIO, format: str, mode: str) -> t.BinaryIO:
+    """Wrap a binary stream in a stream that decompresses what's read
+    from it or compresses what's written to it. Closing the returned
+    stream finishes the compressed data, but leaves ``f`` open.
+    """
+    if format == "gzip":
+        import gzip
+
+        return t.cast(t.BinaryIO, gzip.GzipFile(fileobj=f, mode=mode))
+
+    if format == "bz2":
+        import bz2
+
+        return t.cast(t.BinaryIO, bz2.BZ2File(f, t.cast(t.Any, mode)))
+
+    if format == "xz":
+        import lzma
+
+        return t.cast(t.BinaryIO, lzma.LZMAFile(f, mode))
+
+    return _open_zstd(f, mode)
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Read from a stream in a background thread, up to ``depth`` chunks
+    ahead of what has been read from this. Once this is closed, the thread
+    closes the stream, and the ``raw`` file it reads from if given, after
+    its current read returns.
+    """
+
+    def __init__(
+        self,
+        stream: t.BinaryIO,
+        raw: t.IO[t.Any] | None = None,
+        size: int = 1 << 16,
+        depth: int = 4,
+    ):
+        import queue
+
+        self._stream = stream
+        self._raw = raw
+        self._size = size
+        self._queue: queue.Queue[t.Any] = queue.Queue(depth)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: t.Any) -> bool:
+        import queue
+
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
+            return True
+
+        return False
+
+    def _run(self) -> None:
+        try:
+            while True:
+                chunk = self._stream.read(self._size)
+
+                if not self._put(chunk) or not chunk:
+                    return
+        except BaseException as e:
+            self._put(e)
+        finally:
+            # Closing a buffered file waits for a read in another thread,
+            # so only this thread closes the files it reads.
+            try:
+                self._stream.close()
+            finally:
+                if self._raw is not None:
+                    self._raw.close()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: t.Any) -> int:
+        if not self._chunk:
+            if self._eof:
+                return 0
+
+            item = self._queue.get()
+
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+
+            if not item:
+                self._eof = True
+                return 0
+
+            self._chunk = memoryview(item)
+
+        n = min(len(buffer), len(self._chunk))
+        buffer[:n] = self._chunk[:n]
+        self._chunk = self._chunk[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stop.set()
+            # A read from a pipe may wait indefinitely for data. Don't wait
+            # for it, the thread closes the stream once the read returns.
+            self._thread.join(1)
+
+        super().close()
+
+
+class _Rewound(io.RawIOBase):
+    """Read ``head`` and then the rest of ``f``, for a stream that can't
+    peek at its first bytes without consuming them.
+    """
+
+    def __init__(self, head: bytes, f: t.IO[bytes], close: bool) -> None:
+        self._head = memoryview(head)
+        self._f = f
+        self._close = close
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: t.Any) -> int:
+        if not self._head:
+            data = self._f.read(len(buffer))
+            buffer[: len(data)] = data
+            return len(data)
+
+        n = min(len(buffer), len(self._head))
+        buffer[:n] = self._head[:n]
+        self._head = self._head[n:]
+        return n
+
+    def close(self) -> None:
+        if not self.closed and self._close:
+            self._f.close()
+
+        super().close()
+
+
+class _CompressedFile:
+    """Close both the compressing stream and the file it uses. If the
+    file is atomic, exiting a ``with`` block with an error discards it.
+    """
+
+    def __init__(
+        self,
+        f: t.IO[t.Any],
+        raw: t.IO[t.Any],
+        close_raw: bool,
+        wrap: cabc.Callable[[t.IO[t.Any]], t.IO[t.Any]],
+    ) -> None:
+        self._f = f
+        self._raw = raw
+        self._close_raw = close_raw
+        self._wrap = wrap
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self._f, name)
+
+    def __iter__(self) -> cabc.Iterator[t.Any]:
+        return iter(self._f)
+
+    def __repr__(self) -> str:
+        return repr(self._f)
+
+    def fileno(self) -> int:
+        # The file descriptor is for the compressed data, so don't let
+        # callers read or write it directly.
+        raise io.UnsupportedOperation("fileno")
+
+    def close(self) -> None:
+        try:
+            self._f.close()
+        finally:
+            if self._close_raw:
+                self._raw.close()
+            elif self._raw.writable():
+                self._raw.flush()
+
+    def _suspend(self) -> None:
+        """Finish the compressed data and suspend the atomic file it's
+        written to. Resuming starts new compressed data after it, which
+        is decompressed as if it was written at once.
+        """
+        self._f.close()
+        self._raw._suspend()  # type: ignore[attr-defined]
+
+    def _resume(self) -> None:
+        self._raw._resume()  # type: ignore[attr-defined]
+        self._f = self._wrap(self._raw)
+
+    def __enter__(self) -> _CompressedFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None or not hasattr(self._raw, "__exit__"):
+            self.close()
+            return
+
+        try:
+            self._f.close()
+        except Exception:
+            pass
+
+        if self._close_raw:
+            self._raw.__exit__(exc_type, exc_value, tb)
+
+
+def open_compressed(
+    filename: str | os.PathLike[str],
+    mode: str,
+    encoding: str | None,
+    errors: str | None,
+    atomic: bool,
+    durability: t.Literal["none", "file", "dir"],
+    buffering: int,
+    compression: str,
+    threaded: bool,
+) -> tuple[t.IO[t.Any], bool]:
+    """Open a file like :func:`~click._compat.open_stream`, decompressing
+    or compressing it. A file that isn't compressed is opened as-is if
+    ``compression`` is ``"auto"``.
+    """
+    from ._compat import get_text_stdin
+    from ._compat import open_stream
+
+    if compression != "auto" and compression not in FORMATS:
+        raise ValueError(
+            f"'compression' must be 'auto' or one of {', '.join(sorted(FORMATS))}."
+        )
+
+    if "+" in mode:
+        raise ValueError("Compressed files can't be opened for reading and writing.")
+
+    name = os.fsdecode(filename)
+    reading = not any(m in mode for m in "wax")
+    format: str | None = compression
+
+    if compression == "auto" and not reading:
+        format = None if name == "-" else detect(name)
+
+        if format is None:
+            return open_stream(
+                filename,
+                mode,
+                encoding,
+                errors,
+                atomic=atomic,
+                durability=durability,
+                buffering=buffering,
+            )
+
+    raw_mode = mode.replace("t", "").replace("b", "") + "b"
+    f, should_close = open_stream(
+        filename,
+        raw_mode,
+        atomic=atomic,
+        durability=durability,
+        buffering=buffering,
+    )
+
+    if compression == "auto" and reading:
+        rewound = not hasattr(f, "peek")
+
+        if not rewound:
+            format = detect(name, t.cast(io.BufferedReader, f).peek(6)[:6])
+        else:
+            head = f.read(6)
+            format = detect(name, head)
+            f = io.BufferedReader(_Rewound(head, f, should_close))
+
+        if format is None:
+            if "b" in mode:
+                return f, should_close
+
+            if not should_close and not rewound:
+                return get_text_stdin(encoding, errors), False
+
+            return io.TextIOWrapper(f, encoding, errors), should_close
+
+    def wrap(raw: t.IO[t.Any]) -> t.IO[t.Any]:
+        stream = _open_format(t.cast(t.BinaryIO, raw), t.cast(str, format), raw_mode)
+
+        if reading and threaded:
+            reader = _ThreadedReader(stream, raw if should_close else None)
+            stream = t.cast(t.BinaryIO, io.BufferedReader(reader))
+
+        if "b" not in mode:
+            return io.TextIOWrapper(stream, encoding, errors)
+
+        return stream
+
+    try:
+        stream = wrap(f)
+    except BaseException:
+        if should_close:
+            f.close()
+
+        raise
+
+    # The compressed data is finished on close, even for stdout. The
+    # background reader closes the file it reads itself.
+    close_raw = should_close and not (reading and threaded)
+    return t.cast(t.IO[t.Any], _CompressedFile(stream, f, close_raw, wrap)), True
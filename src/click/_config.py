@@ -0,0 +1,250 @@
+"""Load :attr:`Context.default_map` from configuration files.
+
+Parsed results are cached in memory for the life of the process, and on
+disk in the application directory, keyed on the path, modification time,
+and size of every file. Repeated runs only stat the files instead of
+parsing them again.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import os
+import sys
+import typing as t
+from gettext import gettext as _
+
+_CACHE_NAME = ".default-map-cache"
+_CACHE_VERSION = 1
+
+_Signature = tuple[tuple[str, int, int], ...]
+_memory_cache: dict[_Signature, dict[str, t.Any]] = {}
+
+
+def _signature(paths: cabc.Sequence[str]) -> _Signature:
+    """Identify the current state of the files. Missing files are left
+    out, so creating one changes the signature.
+    """
+    rv = []
+
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+
+        rv.append((path, st.st_mtime_ns, st.st_size))
+
+    return tuple(rv)
+
+
+def _normalize(data: cabc.Mapping[str, t.Any]) -> dict[str, t.Any]:
+    """Use parameter names as keys. Values are keyed by parameter name,
+    so ``dry-run`` becomes ``dry_run``. Tables are subcommands, and keep
+    their names.
+    """
+    rv: dict[str, t.Any] = {}
+
+    for key, value in data.items():
+        if isinstance(value, cabc.Mapping):
+            rv[key] = _normalize(value)
+        else:
+            rv[key.replace("-", "_")] = value
+
+    return rv
+
+
+def _merge(base: dict[str, t.Any], other: cabc.Mapping[str, t.Any]) -> None:
+    """Merge ``other`` into ``base``, recursing into subcommand tables.
+    Values in ``other`` take precedence.
+    """
+    for key, value in other.items():
+        current = base.get(key)
+
+        if isinstance(value, dict) and isinstance(current, dict):
+            _merge(current, value)
+        else:
+            base[key] = value
+
+
+def _copy(value: t.Any) -> t.Any:
+    """Copy the tables and lists in a parsed value. Other values, such as
+    strings, numbers, and dates, can't be modified and are shared.
+    """
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+
+    return value
+
+
+def _parse_ini(text: str) -> dict[str, t.Any]:
+    """Sections are dotted command paths starting with the name of the
+    root command. ``[tool]`` has values for ``tool`` itself, and
+    ``[tool.sub]`` has values for its subcommand ``sub``.
+    """
+    import configparser
+
+    parser = configparser.ConfigParser(default_section="\0", interpolation=None)
+
+    try:
+        parser.read_string(text)
+    except configparser.Error as e:
+        raise ValueError(str(e)) from e
+
+    rv: dict[str, t.Any] = {}
+
+    for section in parser.sections():
+        node = rv
+
+        for name in section.split(".")[1:]:
+            node = node.setdefault(name, {})
+
+        node.update(parser.items(section))
+
+    return rv
+
+
+def _parse_file(path: str) -> dict[str, t.Any]:
+    ext = os.path.splitext(path)[1].lower()
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if ext == ".toml":
+        if sys.version_info >= (3, 11):
+            import tomllib
+        else:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError(
+                    _("Reading TOML requires Python 3.11 or the 'tomli' library.")
+                ) from None
+
+        rv: dict[str, t.Any] = tomllib.loads(data.decode("utf-8"))
+        return rv
+
+    if ext == ".json":
+        import json
+
+        obj = json.loads(data)
+
+        if not isinstance(obj, dict):
+            raise ValueError(_("The top level value must be an object."))
+
+        return obj
+
+    if ext in {".ini", ".cfg", ".conf"}:
+        return _parse_ini(data.decode("utf-8"))
+
+    raise ValueError(_("Unknown configuration file type {ext!r}.").format(ext=ext))
+
+
+def _read_disk_cache(cache_path: str, signature: _Signature) -> dict[str, t.Any] | None:
+    import marshal
+
+    try:
+        with open(cache_path, "rb") as f:
+            version, cached_signature, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if version != _CACHE_VERSION or cached_signature != signature:
+        return None
+
+    return t.cast("dict[str, t.Any]", data)
+
+
+def _write_disk_cache(
+    cache_path: str, signature: _Signature, data: dict[str, t.Any]
+) -> None:
+    import marshal
+
+    try:
+        payload = marshal.dumps((_CACHE_VERSION, signature, data))
+    except ValueError:
+        # Values such as TOML dates can't be stored. Parse every time.
+        return
+
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+        with open(tmp_path, "wb") as f:
+            f.write(payload)
+
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def load_default_map(
+    filenames: cabc.Iterable[str | os.PathLike[str]],
+    app_dir: str,
+    path: cabc.Sequence[str] = (),
+) -> dict[str, t.Any] | None:
+    """Load and merge the configuration files into a default map. Later
+    files take precedence. Relative names are found in ``app_dir``.
+    Files that don't exist are skipped. Returns ``None`` if no file
+    exists, or if there is no table for the subcommand.
+
+    :param filenames: The configuration files to load.
+    :param app_dir: The application directory, as returned by
+        :func:`~click.get_app_dir`. The parse cache is stored here.
+    :param path: The names of the subcommands below the root command to
+        get the table for.
+    """
+    files = [os.path.join(app_dir, os.fspath(name)) for name in filenames]
+    signature = _signature(files)
+
+    if not signature:
+        return None
+
+    data = _memory_cache.get(signature)
+
+    if data is None:
+        cache_path = os.path.join(app_dir, _CACHE_NAME)
+        data = _read_disk_cache(cache_path, signature)
+
+        if data is None:
+            data = {}
+
+            for file, _mtime, _size in signature:
+                try:
+                    _merge(data, _normalize(_parse_file(file)))
+                except OSError as e:
+                    from .exceptions import FileError
+
+                    raise FileError(file, hint=e.strerror or str(e)) from e
+                except ValueError as e:
+                    from .exceptions import ClickException
+                    from .utils import format_filename
+
+                    raise ClickException(
+                        _("Could not parse file {filename!r}: {message}").format(
+                            filename=format_filename(file), message=e
+                        )
+                    ) from e
+
+            _write_disk_cache(cache_path, signature, data)
+
+        _memory_cache[signature] = data
+
+    table: t.Any = data
+
+    for name in path:
+        table = table.get(name)
+
+        if not isinstance(table, dict):
+            return None
+
+    # Only the returned table is used by the context, and may be modified
+    # by the command. Don't let that leak into the cache.
+    return t.cast("dict[str, t.Any]", _copy(table))
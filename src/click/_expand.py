@@ -0,0 +1,254 @@
+"""Expand glob patterns and directories given to :class:`click.Path`, see
+its ``expand`` parameter.
+
+Directories are read with :func:`os.scandir` one entry at a time, and
+matches are produced as they're found, so a directory with millions of
+files is never held in memory. Symlinks to directories are not followed
+when walking, which could otherwise loop forever.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import os
+import re
+import typing as t
+from functools import lru_cache
+
+_magic_re = re.compile(r"[*?[]")
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str) -> cabc.Callable[[str], t.Any]:
+    import fnmatch
+
+    return re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+
+def _matches(name: str, path: str, patterns: cabc.Sequence[str]) -> bool:
+    """Match the name against each pattern, or the path if the pattern
+    has a separator in it.
+    """
+    name = os.path.normcase(name)
+    path = os.path.normcase(path)
+
+    for pattern in patterns:
+        match = _compile(pattern)
+
+        if "/" in pattern or os.sep in pattern:
+            if match(path):
+                return True
+        elif match(name):
+            return True
+
+    return False
+
+
+class _Filter:
+    def __init__(
+        self,
+        files: bool,
+        dirs: bool,
+        include: cabc.Sequence[str],
+        exclude: cabc.Sequence[str],
+    ) -> None:
+        self.files = files
+        self.dirs = dirs
+        self.include = include
+        self.exclude = exclude
+
+    def excluded(self, name: str, path: str) -> bool:
+        return bool(self.exclude) and _matches(name, path, self.exclude)
+
+    def accept(self, name: str, path: str, is_dir: bool) -> bool:
+        if not (self.dirs if is_dir else self.files):
+            return False
+
+        if self.include and not _matches(name, path, self.include):
+            return False
+
+        return not self.excluded(name, path)
+
+
+def _prefix(path: str) -> str:
+    """Join names to a path by adding to this. Faster than
+    :func:`os.path.join` for each name, and doesn't add ``./`` for the
+    current directory like :attr:`os.DirEntry.path`.
+    """
+    if not path or path.endswith(("/", os.sep)):
+        return path
+
+    return path + os.sep
+
+
+def _scandir(path: str) -> cabc.Iterator[os.DirEntry[str]]:
+    """Produce the entries of a directory, or nothing if it can't be
+    read.
+    """
+    try:
+        with os.scandir(path or os.curdir) as it:
+            yield from it
+    except OSError:
+        pass
+
+
+def _is_dir(entry: os.DirEntry[str], follow_symlinks: bool = True) -> bool:
+    try:
+        return entry.is_dir(follow_symlinks=follow_symlinks)
+    except OSError:
+        return False
+
+
+def iter_tree(root: str, filter: _Filter) -> cabc.Iterator[str]:
+    """Produce the files under a directory, or the directories if
+    ``filter`` doesn't accept files. Excluded directories are skipped
+    along with their contents.
+    """
+    stack = [(root, "")]
+
+    while stack:
+        path, prefix = stack.pop()
+        subdirs = []
+
+        for entry in _scandir(path):
+            # The path relative to the root, for patterns with separators.
+            rel = prefix + entry.name
+
+            if _is_dir(entry, follow_symlinks=False):
+                if filter.excluded(entry.name, rel):
+                    continue
+
+                subdirs.append((entry.path, rel + os.sep))
+
+                if filter.accept(entry.name, rel, True):
+                    yield entry.path
+            elif filter.accept(entry.name, rel, _is_dir(entry)):
+                yield entry.path
+
+        # Walk in the order the directories were found.
+        stack.extend(reversed(subdirs))
+
+
+def _iter_under(
+    path: str, dirs_only: bool, filter: _Filter
+) -> cabc.Iterator[tuple[str, bool]]:
+    """Produce everything under a path for ``**``, and if each is a
+    directory. Hidden names are skipped, like other patterns do, as well
+    as excluded directories.
+    """
+    stack = [path]
+
+    while stack:
+        base = stack.pop()
+        prefix = _prefix(base)
+
+        for entry in _scandir(base):
+            if entry.name.startswith("."):
+                continue
+
+            if _is_dir(entry, follow_symlinks=False):
+                sub = prefix + entry.name
+
+                if filter.excluded(entry.name, sub):
+                    continue
+
+                yield sub, True
+                stack.append(sub)
+            elif not dirs_only:
+                yield prefix + entry.name, _is_dir(entry)
+
+
+def _glob(
+    base: str, parts: list[str], i: int, filter: _Filter
+) -> cabc.Iterator[tuple[str, bool]]:
+    """Produce the paths under ``base`` matching ``parts[i:]``, and if
+    each is a directory. Excluded directories are not looked in.
+    """
+    part = parts[i]
+    last = i == len(parts) - 1
+
+    if part == "**":
+        if last:
+            yield from _iter_under(base, False, filter)
+        else:
+            yield from _glob(base, parts, i + 1, filter)
+
+            for path, _ in _iter_under(base, True, filter):
+                yield from _glob(path, parts, i + 1, filter)
+    elif not _magic_re.search(part):
+        path = os.path.join(base, part)
+
+        if last:
+            if os.path.lexists(path):
+                yield path, os.path.isdir(path)
+        elif os.path.isdir(path) and not filter.excluded(part, path):
+            yield from _glob(path, parts, i + 1, filter)
+    else:
+        # Like the shell, only match hidden names if the pattern does.
+        hidden = part.startswith(".")
+        match = _compile(part)
+        normcase = os.path.normcase
+        prefix = _prefix(base)
+
+        for entry in _scandir(base):
+            if entry.name.startswith(".") and not hidden:
+                continue
+
+            if not match(normcase(entry.name)):
+                continue
+
+            path = prefix + entry.name
+
+            if last:
+                yield path, _is_dir(entry)
+            elif _is_dir(entry) and not filter.excluded(entry.name, path):
+                yield from _glob(path, parts, i + 1, filter)
+
+
+def iter_glob(pattern: str, filter: _Filter) -> cabc.Iterator[str]:
+    """Produce the paths matching a glob pattern. ``**`` matches any
+    number of directories.
+    """
+    drive, rest = os.path.splitdrive(pattern)
+    separators = r"[\\/]" if os.sep == "\\" else "/"
+    parts = [part for part in re.split(separators, rest) if part]
+    base = drive
+
+    if rest[:1] in ("/", os.sep):
+        base += rest[0]
+
+    if not parts:
+        if os.path.lexists(pattern):
+            yield pattern
+
+        return
+
+    patterns = filter.include or filter.exclude
+
+    for path, is_dir in _glob(base, parts, 0, filter):
+        if not patterns:
+            if filter.dirs if is_dir else filter.files:
+                yield path
+        elif filter.accept(os.path.basename(path), path, is_dir):
+            yield path
+
+
+def make_filter(
+    files: bool,
+    dirs: bool,
+    include: cabc.Sequence[str] | None,
+    exclude: cabc.Sequence[str] | None,
+) -> _Filter:
+    return _Filter(files, dirs, include or (), exclude or ())
+
+
+def peek(it: cabc.Iterator[t.Any]) -> tuple[bool, cabc.Iterator[t.Any]]:
+    """Check if an iterator produces anything, and return an iterator
+    that still produces everything.
+    """
+    import itertools
+
+    for first in it:
+        return True, itertools.chain((first,), it)
+
+    return False, it
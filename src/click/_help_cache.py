@@ -0,0 +1,215 @@
+"""Cache formatted help pages, see the ``help_cache`` context setting.
+
+A help page is identified by a fingerprint of everything that goes into
+rendering it: the command and its parameters, the subcommands of a group,
+the context settings that affect help, the formatter width, and the
+locale. Pages are cached in memory, and optionally on disk in the
+application directory of the root command. Both caches are bounded, the
+oldest pages are removed first.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import os
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .core import Command
+    from .core import Context
+    from .formatting import HelpFormatter
+
+_CACHE_DIR = "help-cache"
+_LOCALE_VARS = ("LANGUAGE", "LC_ALL", "LC_MESSAGES", "LANG")
+_MAX_MEMORY = 256
+_MAX_DISK = 128
+
+_memory_cache: dict[str, str] = {}
+
+
+def _describe_value(value: t.Any) -> t.Any:
+    """Describe a value that may be shown in help text. Callables are
+    described by name, and other objects by their type and a repr with
+    memory addresses removed, so the description is the same in every
+    process.
+    """
+    if value is None or isinstance(value, (str, bytes, int, float)):
+        return value
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_describe_value(item) for item in value)
+
+    if isinstance(value, cabc.Mapping):
+        return tuple((str(k), _describe_value(v)) for k, v in value.items())
+
+    if callable(value):
+        func = getattr(value, "func", value)
+        return (
+            "callable",
+            getattr(func, "__module__", None),
+            getattr(func, "__qualname__", None),
+        )
+
+    import re
+
+    return (
+        type(value).__module__,
+        type(value).__qualname__,
+        re.sub(r" at 0x[0-9a-fA-F]+", "", repr(value)),
+    )
+
+
+def _describe_command(command: Command, ctx: Context) -> list[t.Any]:
+    from .core import Group
+
+    items: list[t.Any] = [
+        type(command).__module__,
+        type(command).__qualname__,
+        command.name,
+        command.help,
+        command.epilog,
+        command.short_help,
+        command.options_metavar,
+        command.deprecated,
+        command.no_args_is_help,
+    ]
+
+    for param in command.get_params(ctx):
+        info = param.to_info_dict()
+        info["default"] = _describe_value(info.get("default"))
+        items.append(
+            (
+                type(param).__module__,
+                type(param).__qualname__,
+                tuple(info.values()),
+                param.metavar,
+                getattr(param, "show_default", None),
+                getattr(param, "show_envvar", None),
+                getattr(param, "show_choices", None),
+                getattr(param, "hidden", None),
+            )
+        )
+
+    if isinstance(command, Group):
+        items.append(command.chain)
+        items.append(command.subcommand_metavar)
+        items.append(command.commands_page_size)
+        items.append(ctx._commands_selection)
+
+        # Resolve subcommands the same way the help page does, so lazy
+        # groups and collections see changes to the commands they load.
+        for name in command.list_commands(ctx):
+            sub = command.get_command(ctx, name)
+
+            if sub is None:
+                items.append(name)
+            else:
+                items.append(
+                    (name, sub.help, sub.short_help, sub.hidden, sub.deprecated)
+                )
+
+    return items
+
+
+def _fingerprint(command: Command, ctx: Context, formatter: HelpFormatter) -> str:
+    import hashlib
+
+    environ = ctx.environ
+    items = [
+        ctx.command_path,
+        type(formatter).__module__,
+        type(formatter).__qualname__,
+        formatter.width,
+        formatter.indent_increment,
+        ctx.color,
+        ctx.show_default,
+        ctx.auto_envvar_prefix,
+        ctx.help_option_names,
+        _describe_value(ctx.default_map),
+        [environ.get(name) for name in _LOCALE_VARS],
+        _describe_command(command, ctx),
+    ]
+    return hashlib.blake2b(repr(items).encode(), digest_size=16).hexdigest()
+
+
+def _disk_path(ctx: Context, key: str) -> str:
+    from .utils import get_app_dir
+
+    root = ctx.find_root()
+    app_dir = get_app_dir(root.info_name or root.command.name or "")
+    return os.path.join(app_dir, _CACHE_DIR, key)
+
+
+def get_help(command: Command, ctx: Context, mode: str) -> str:
+    """Get the help page for the command, rendering and caching it if it
+    isn't cached yet.
+
+    :param mode: ``"memory"`` or ``"disk"``.
+    """
+    formatter = ctx.make_formatter()
+    key = _fingerprint(command, ctx, formatter)
+    rv = _memory_cache.get(key)
+
+    if rv is not None:
+        return rv
+
+    path = _disk_path(ctx, key) if mode == "disk" else None
+
+    if path is not None:
+        try:
+            with open(path, encoding="utf-8") as f:
+                rv = f.read()
+        except (OSError, UnicodeError):
+            pass
+
+    if rv is None:
+        command.format_help(ctx, formatter)
+        rv = formatter.getvalue().rstrip("\n")
+
+        if path is not None:
+            _write(path, rv)
+            _prune(os.path.dirname(path))
+
+    if len(_memory_cache) >= _MAX_MEMORY:
+        del _memory_cache[next(iter(_memory_cache))]
+
+    _memory_cache[key] = rv
+    return rv
+
+
+def _write(path: str, text: str) -> None:
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _prune(path: str) -> None:
+    """Remove the oldest pages from the cache directory if there are
+    more than the limit.
+    """
+    try:
+        entries = [(e.stat().st_mtime_ns, e.path) for e in os.scandir(path)]
+    except OSError:
+        return
+
+    if len(entries) <= _MAX_DISK:
+        return
+
+    entries.sort()
+
+    for _, old_path in entries[: len(entries) - _MAX_DISK]:
+        try:
+            os.unlink(old_path)
+        except OSError:
+            pass
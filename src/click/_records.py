@@ -0,0 +1,147 @@
+"""Read delimited records from a binary stream, see
+:class:`click.RecordStream`.
+
+Data is read in large chunks, and each chunk is split with a single call
+to ``split``, so the work per record is done in C. Only a record that
+spans chunks is joined in Python.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import typing as t
+
+AnyStr = t.TypeVar("AnyStr", str, bytes)
+
+
+def iter_chunks(f: t.IO[bytes], size: int, close: bool) -> cabc.Iterator[bytes]:
+    """Read chunks of up to ``size`` bytes until the end of the stream,
+    then close it if ``close`` is true. ``read1`` returns the data that's
+    available instead of waiting for a full chunk, so records from an
+    interactive pipe aren't held back.
+    """
+    read = getattr(f, "read1", f.read)
+
+    try:
+        while True:
+            chunk = read(size)
+
+            if not chunk:
+                return
+
+            yield chunk
+    finally:
+        if close:
+            f.close()
+
+
+def decode_chunks(
+    chunks: cabc.Iterable[bytes], encoding: str, errors: str | None
+) -> cabc.Iterator[str]:
+    import codecs
+
+    decoder = codecs.getincrementaldecoder(encoding)(errors or "strict")
+
+    for chunk in chunks:
+        yield decoder.decode(chunk)
+
+    yield decoder.decode(b"", True)
+
+
+def read_ahead(chunks: cabc.Iterable[AnyStr], depth: int) -> cabc.Iterator[AnyStr]:
+    """Read chunks in a background thread, up to ``depth`` chunks ahead
+    of the ones being split. If the records stop being used, the thread
+    stops reading.
+    """
+    import queue
+    import threading
+
+    done = object()
+    results: queue.Queue[t.Any] = queue.Queue(depth)
+    stop = threading.Event()
+
+    def put(item: t.Any) -> bool:
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+            except queue.Full:
+                continue
+
+            return True
+
+        return False
+
+    def target() -> None:
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except BaseException as e:
+            put(e)
+        else:
+            put(done)
+        finally:
+            # Close the file in this thread, where it's read.
+            getattr(chunks, "close", lambda: None)()
+
+    threading.Thread(target=target, daemon=True).start()
+
+    try:
+        while True:
+            item = results.get()
+
+            if item is done:
+                return
+
+            if isinstance(item, BaseException):
+                raise item
+
+            yield item
+    finally:
+        stop.set()
+
+
+def _split_batches(
+    chunks: cabc.Iterable[AnyStr], separator: AnyStr, size: int
+) -> cabc.Iterator[list[AnyStr]]:
+    empty = separator[:0]
+    # A record spanning chunks, set aside until its end is found.
+    pieces: list[AnyStr] = []
+    rest = empty
+    # The end of a chunk that might be the start of a separator.
+    keep = len(separator) - 1
+
+    for chunk in chunks:
+        data = rest + chunk if rest else chunk
+        records = data.split(separator)
+        rest = records.pop()
+
+        if records:
+            if pieces:
+                pieces.append(records[0])
+                records[0] = empty.join(pieces)
+                pieces = []
+
+            yield records
+        elif len(rest) > size + keep:
+            # Avoid copying a long record for every chunk.
+            cut = len(rest) - keep
+            pieces.append(rest[:cut])
+            rest = rest[cut:]
+
+    if pieces or rest:
+        pieces.append(rest)
+        yield [empty.join(pieces)]
+
+
+def split_records(
+    chunks: cabc.Iterable[AnyStr], separator: AnyStr, size: int
+) -> cabc.Iterator[AnyStr]:
+    """Produce the records between separators in the chunks, without the
+    separators. A separator at the end doesn't produce an empty record.
+    The records from each chunk are produced by :mod:`itertools` rather
+    than a generator, so there's no Python code run for each record.
+    """
+    import itertools
+
+    return itertools.chain.from_iterable(_split_batches(chunks, separator, size))
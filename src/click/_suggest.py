@@ -0,0 +1,159 @@
+"""Suggest similar names for unknown options and commands.
+
+Names are compared by their Damerau-Levenshtein distance, the number of
+inserted, deleted, replaced, or swapped characters. Only names that share
+a bigram with the given word are compared, found using an index built
+once for each set of names. Both the index and the suggestions for each
+word are cached, so repeatedly failing to match the same word, as during
+shell completion, does no work after the first time.
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+from functools import lru_cache
+
+#: The fraction of the longer name's length that may differ.
+_MAX_DIFFERENCE = 0.6
+#: The number of words to cache suggestions for, for each set of names.
+_MAX_CACHED_WORDS = 256
+
+
+def _strip(name: str) -> str:
+    """Compare option names without their prefix, otherwise ``--`` makes
+    every name look similar.
+    """
+    return name.lstrip("-/+") or name
+
+
+def _bigrams(name: str) -> set[str]:
+    padded = f"^{name}$"
+    return {padded[i : i + 2] for i in range(len(padded) - 1)}
+
+
+def _distance(a: str, b: str, bound: int) -> int:
+    """The optimal string alignment distance between ``a`` and ``b``. If
+    it is greater than ``bound``, returns ``bound + 1`` as soon as that
+    is known. Only cells within ``bound`` of the diagonal are computed.
+    """
+    len_a = len(a)
+    len_b = len(b)
+
+    if abs(len_a - len_b) > bound:
+        return bound + 1
+
+    over = bound + 1
+    prev_prev: list[int] = []
+    prev = [j if j <= bound else over for j in range(len_b + 1)]
+
+    for i in range(1, len_a + 1):
+        ca = a[i - 1]
+        row = [over] * (len_b + 1)
+        row[0] = i if i <= bound else over
+        row_min = row[0]
+
+        for j in range(max(1, i - bound), min(len_b, i + bound) + 1):
+            cb = b[j - 1]
+            value = prev[j - 1] if ca == cb else prev[j - 1] + 1
+
+            if prev[j] + 1 < value:
+                value = prev[j] + 1
+
+            if row[j - 1] + 1 < value:
+                value = row[j - 1] + 1
+
+            if (
+                i > 1
+                and j > 1
+                and ca == b[j - 2]
+                and a[i - 2] == cb
+                and prev_prev[j - 2] + 1 < value
+            ):
+                value = prev_prev[j - 2] + 1
+
+            row[j] = value
+
+            if value < row_min:
+                row_min = value
+
+        if row_min > bound:
+            return over
+
+        prev_prev, prev = prev, row
+
+    return min(prev[len_b], over)
+
+
+class _SuggestionIndex:
+    def __init__(self, names: tuple[str, ...]) -> None:
+        self.names = names
+        self.stripped = [_strip(name) for name in names]
+        self.by_bigram: dict[str, list[int]] = {}
+        self.results: dict[tuple[str, int], list[str]] = {}
+
+        for i, name in enumerate(self.stripped):
+            for bigram in _bigrams(name):
+                self.by_bigram.setdefault(bigram, []).append(i)
+
+    def suggest(self, word: str, n: int) -> list[str]:
+        key = (word, n)
+        rv = self.results.get(key)
+
+        if rv is not None:
+            return rv
+
+        stripped = _strip(word)
+        shared: dict[int, int] = {}
+
+        for bigram in _bigrams(stripped):
+            for i in self.by_bigram.get(bigram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        scored: list[tuple[int, str]] = []
+        worst = None
+
+        # Compare the names sharing the most bigrams first. Once there are
+        # enough suggestions, later names only need to be as similar as
+        # the worst of them, which stops comparisons early.
+        for i in sorted(shared, key=shared.__getitem__, reverse=True):
+            name = self.stripped[i]
+            bound = int(max(len(name), len(stripped)) * _MAX_DIFFERENCE)
+
+            if worst is not None and worst < bound:
+                bound = worst
+
+            distance = _distance(stripped, name, bound)
+
+            if distance <= bound:
+                scored.append((distance, self.names[i]))
+
+                if len(scored) >= n:
+                    scored.sort()
+                    del scored[n:]
+                    worst = scored[-1][0]
+
+        scored.sort()
+        rv = [name for _, name in scored[:n]]
+
+        if len(self.results) < _MAX_CACHED_WORDS:
+            self.results[key] = rv
+
+        return rv
+
+
+@lru_cache(maxsize=64)
+def _get_index(names: tuple[str, ...]) -> _SuggestionIndex:
+    return _SuggestionIndex(names)
+
+
+def suggest(word: str, names: cabc.Iterable[str], n: int = 3) -> list[str]:
+    """Get up to ``n`` names similar to ``word``, most similar first. The
+    word itself is never suggested.
+
+    :param word: The unknown name.
+    :param names: The known names. Option names are compared without
+        their prefix characters.
+    :param n: The maximum number of suggestions.
+    """
+    index = _get_index(tuple(names))
+    return [name for name in index.suggest(word, n + 1) if name != word][:n]
@@ -532,13 +532,15 @@ def _tempfilepager(
     import tempfile
 
     fd, filename = tempfile.mkstemp()
-    # TODO: This never terminates if the passed generator never terminates.
-    text = "".join(generator)
-    if not color:
-        text = strip_ansi(text)
     encoding = get_best_encoding(sys.stdout)
+    # Write each chunk as it is produced instead of joining them first.
+    # TODO: This never terminates if the passed generator never terminates.
     with open_stream(filename, "wb")[0] as f:
-        f.write(text.encode(encoding))
+        for text in generator:
+            if not color:
+                text = strip_ansi(text)
+
+            f.write(text.encode(encoding))
     try:
         subprocess.call([str(cmd_path), filename])
     except OSError:
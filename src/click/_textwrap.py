@@ -1,11 +1,44 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import re
 import textwrap
 from contextlib import contextmanager
+from functools import lru_cache
+
+# Text without hyphens or whitespace other than spaces is split into
+# runs of spaces and runs of other characters, the same chunks the
+# stdlib's word separator pattern produces for it, but much faster.
+_needs_full_split = re.compile(r"[^\S ]|-").search
+_split_simple = re.compile(r" +|[^ ]+").findall
 
 
 class TextWrapper(textwrap.TextWrapper):
+    def wrap(self, text: str) -> list[str]:
+        if (
+            self.width <= 0
+            or not self.drop_whitespace
+            or self.fix_sentence_endings
+            or self.max_lines is not None
+            or _needs_full_split(text) is not None
+        ):
+            return super().wrap(text)
+
+        # Tabs and other whitespace are not present, there is nothing to
+        # munge. Text that fits on the first line is the common case.
+        line = text.rstrip(" ")
+
+        if len(self.initial_indent) + len(line) <= self.width:
+            return [f"{self.initial_indent}{line}"] if line else []
+
+        return self._wrap_chunks(_split_simple(text))
+
+    def _split(self, text: str) -> list[str]:
+        if _needs_full_split(text) is None:
+            return _split_simple(text)
+
+        return super()._split(text)
+
     def _handle_long_word(
         self,
         reversed_chunks: list[str],
@@ -49,3 +82,16 @@ class TextWrapper(textwrap.TextWrapper):
             rv.append(f"{indent}{line}")
 
         return "\n".join(rv)
+
+
+@lru_cache(maxsize=128)
+def get_wrapper(width: int, initial_indent: str, subsequent_indent: str) -> TextWrapper:
+    """Get a wrapper for the width and indents. Wrappers are reused
+    between calls, and must not be modified.
+    """
+    return TextWrapper(
+        width,
+        initial_indent=initial_indent,
+        subsequent_indent=subsequent_indent,
+        replace_whitespace=False,
+    )
@@ -19,6 +19,7 @@ from itertools import repeat
 from types import TracebackType
 
 from . import types
+from ._compat import WIN
 from ._utils import FLAG_NEEDS_VALUE
 from ._utils import UNSET
 from .exceptions import Abort
@@ -45,12 +46,120 @@ from .utils import make_str
 from .utils import PacifyFlushWrapper
 
 if t.TYPE_CHECKING:
+    import typing_extensions as te
+
     from .shell_completion import CompletionItem
 
 F = t.TypeVar("F", bound="t.Callable[..., t.Any]")
 V = t.TypeVar("V")
 
 
+class _TrieNode:
+    __slots__ = ("children", "start", "stop")
+
+    def __init__(self, start: int) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.start = start
+        self.stop = start + 1
+
+
+class _CommandTrie:
+    """Prefix tree over sorted command names. Each node stores the range
+    of names that start with its prefix, so finding them takes time
+    proportional to the length of the prefix.
+    """
+
+    def __init__(self, names: cabc.Iterable[str], version: int) -> None:
+        #: The :attr:`_CommandDict.version` the tree was built from.
+        self.version = version
+        self.names = sorted(names)
+        self._root = _TrieNode(0)
+        self._root.stop = len(self.names)
+
+        for index, name in enumerate(self.names):
+            node = self._root
+
+            for char in name:
+                child = node.children.get(char)
+
+                if child is None:
+                    child = node.children[char] = _TrieNode(index)
+                else:
+                    child.stop = index + 1
+
+                node = child
+
+    def with_prefix(self, prefix: str) -> list[str]:
+        """The names that start with ``prefix``, sorted."""
+        node = self._root
+
+        for char in prefix:
+            child = node.children.get(char)
+
+            if child is None:
+                return []
+
+            node = child
+
+        return self.names[node.start : node.stop]
+
+
+class _CommandDict(dict[str, "Command"]):
+    """The commands of a :class:`Group`. Counts changes, so indexes of
+    the names can tell when they need to be rebuilt without comparing
+    all the names.
+    """
+
+    version = 0
+
+    def __setitem__(self, name: str, command: Command) -> None:
+        super().__setitem__(name, command)
+        self.version += 1
+
+    def __delitem__(self, name: str) -> None:
+        super().__delitem__(name)
+        self.version += 1
+
+    def __ior__(self, other: t.Any) -> te.Self:  # type: ignore[override,misc]
+        self.update(other)
+        return self
+
+    def pop(self, *args: t.Any) -> t.Any:
+        self.version += 1
+        return super().pop(*args)
+
+    def popitem(self) -> tuple[str, Command]:
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def update(self, *args: t.Any, **kwargs: t.Any) -> None:
+        super().update(*args, **kwargs)
+        self.version += 1
+
+    def setdefault(self, name: str, default: t.Any = None) -> t.Any:
+        self.version += 1
+        return super().setdefault(name, default)
+
+
+def _commands_key(commands: cabc.Mapping[str, Command]) -> t.Any:
+    """Identify the names in a group's commands, to detect changes."""
+    if isinstance(commands, _CommandDict):
+        return id(commands), commands.version
+
+    return frozenset(commands)
+
+
+def _lists_own_commands(group: Group) -> bool:
+    """Whether the group lists the names in its commands dict, without
+    depending on the context.
+    """
+    return type(group).list_commands is Group.list_commands
+
+
 def _complete_visible_commands(
     ctx: Context, incomplete: str
 ) -> cabc.Iterator[tuple[str, Command]]:
@@ -62,12 +171,11 @@ def _complete_visible_commands(
     """
     multi = t.cast(Group, ctx.command)
 
-    for name in multi.list_commands(ctx):
-        if name.startswith(incomplete):
-            command = multi.get_command(ctx, name)
+    for name in multi._commands_with_prefix(ctx, incomplete):
+        command = multi.get_command(ctx, name)
 
-            if command is not None and not command.hidden:
-                yield name, command
+        if command is not None and not command.hidden:
+            yield name, command
 
 
 def _check_nested_chain(
@@ -140,6 +248,31 @@ def iter_params_for_processing(
     return sorted(declaration_order, key=sort_key)
 
 
+class _EnvironSnapshot(cabc.Mapping[str, str]):
+    """A copy of :data:`os.environ`. On Windows, names are case
+    insensitive, like they are in :data:`os.environ`.
+    """
+
+    def __init__(self, environ: cabc.Mapping[str, str]) -> None:
+        self._upper = WIN
+        self._data = {self._key(name): value for name, value in environ.items()}
+
+    def _key(self, name: str) -> str:
+        return name.upper() if self._upper else name
+
+    def __getitem__(self, name: str) -> str:
+        return self._data[self._key(name)]
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and self._key(name) in self._data
+
+    def __iter__(self) -> cabc.Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
 class ParameterSource(enum.Enum):
     """This is an :class:`~enum.Enum` that indicates the source of a
     parameter's value.
@@ -236,6 +369,27 @@ class Context:
         value is not set, it defaults to the value from the parent
         context. ``Command.show_default`` overrides this default for the
         specific command.
+    :param environ: The environment variables used to resolve parameter
+        values. Defaults to the value from the parent context, or a
+        snapshot of :data:`os.environ` taken the first time the root
+        context needs it.
+    :param default_map_files: Configuration files to load
+        :attr:`default_map` from if it is not otherwise set. Relative
+        names are found in the :func:`get_app_dir` for the name of the
+        root command. Files may be TOML, JSON, or INI, and later files
+        override earlier ones. The parsed result is cached until one of
+        the files changes.
+    :param help_cache: Cache formatted help pages. ``"memory"`` caches
+        them for the life of the process, ``"disk"`` also stores them in
+        the :func:`get_app_dir` for the name of the root command. A
+        cached page is used as long as the command, its parameters and
+        subcommands, the relevant context settings, the terminal width,
+        and the locale are the same. The default is to inherit from the
+        parent context, or not to cache.
+
+    .. versionchanged:: 8.4
+        Added the ``environ``, ``default_map_files``, and ``help_cache``
+        parameters.
 
     .. versionchanged:: 8.2
         The ``protected_args`` attribute is deprecated and will be removed in
@@ -288,6 +442,9 @@ class Context:
         token_normalize_func: t.Callable[[str], str] | None = None,
         color: bool | None = None,
         show_default: bool | None = None,
+        environ: cabc.Mapping[str, str] | None = None,
+        default_map_files: cabc.Sequence[str | os.PathLike[str]] | None = None,
+        help_cache: t.Literal["memory", "disk"] | None = None,
     ) -> None:
         #: the parent context or `None` if none exists.
         self.parent = parent
@@ -314,6 +471,24 @@ class Context:
         #: the user object stored.
         self.obj: t.Any = obj
         self._meta: dict[str, t.Any] = getattr(parent, "meta", {})
+        # Values of CachedDefault shared by the whole invocation.
+        self._default_cache: dict[CachedDefault, t.Any] = (
+            parent._default_cache if parent is not None else {}
+        )
+        # Results of stat, realpath, and access shared by the whole
+        # invocation, see Context.stat and types.Path.
+        self._path_cache: dict[tuple[t.Any, ...], t.Any] = (
+            parent._path_cache if parent is not None else {}
+        )
+        # Set while shell completion resolves the command line. The values
+        # of commands that can't observe them are only recorded, see
+        # _skips_completion_values and shell_completion._resolve_context.
+        self._completion_only: bool = (
+            parent._completion_only if parent is not None else False
+        )
+        # The filter pattern and page of commands to list in help, set if
+        # help was requested, see Group.commands_page_size.
+        self._commands_selection: tuple[str | None, int] | None = None
 
         #: A dictionary (-like object) with defaults for parameters.
         if (
@@ -324,6 +499,24 @@ class Context:
         ):
             default_map = parent.default_map.get(info_name)
 
+        if default_map is None and default_map_files:
+            from ._config import load_default_map
+            from .utils import get_app_dir
+
+            # The files have a table for each subcommand below the root.
+            root: Context = self
+            path: list[str] = []
+
+            while root.parent is not None:
+                path.insert(0, root.info_name or "")
+                root = root.parent
+
+            default_map = load_default_map(
+                default_map_files,
+                get_app_dir(root.info_name or command.name or ""),
+                path,
+            )
+
         self.default_map: cabc.MutableMapping[str, t.Any] | None = default_map
 
         #: This flag indicates if a subcommand is going to be executed. A
@@ -435,6 +628,20 @@ class Context:
         #: Show option default values when formatting help text.
         self.show_default: bool | None = show_default
 
+        if environ is None and parent is not None:
+            environ = parent._environ
+
+        self._environ: cabc.Mapping[str, str] | None = environ
+
+        if help_cache is None and parent is not None:
+            help_cache = parent.help_cache
+
+        #: How formatted help pages are cached, see the ``help_cache``
+        #: parameter.
+        #:
+        #: .. versionadded:: 8.4
+        self.help_cache: t.Literal["memory", "disk"] | None = help_cache
+
         self._close_callbacks: list[t.Callable[[], t.Any]] = []
         self._depth = 0
         self._parameter_source: dict[str, ParameterSource] = {}
@@ -530,6 +737,28 @@ class Context:
             if not cleanup:
                 self._depth -= 1
 
+    @property
+    def environ(self) -> cabc.Mapping[str, str]:
+        """The environment variables used to resolve parameter values
+        for this invocation.
+
+        Unless one was passed when creating the root context, this is a
+        snapshot of :data:`os.environ` taken the first time it is
+        needed, and shared by all contexts of the invocation. Later
+        changes to :data:`os.environ` are not seen by the invocation. Like
+        :data:`os.environ`, the snapshot ignores the case of names on
+        Windows.
+
+        .. versionadded:: 8.4
+        """
+        if self._environ is None:
+            if self.parent is not None:
+                self._environ = self.parent.environ
+            else:
+                self._environ = _EnvironSnapshot(os.environ)
+
+        return self._environ
+
     @property
     def meta(self) -> dict[str, t.Any]:
         """This is a dictionary which is shared with all the contexts
@@ -558,6 +787,32 @@ class Context:
         """
         return self._meta
 
+    def stat(
+        self, path: str | bytes | os.PathLike[str] | os.PathLike[bytes]
+    ) -> os.stat_result:
+        """Get the :func:`os.stat` result for a path. The result is cached
+        and shared by all the contexts of the invocation.
+        :class:`~click.Path` parameters check their values with this, so
+        getting the result for one of their values doesn't access the file
+        system again. Errors aren't cached, a path that didn't exist is
+        checked again.
+
+        The result is from the first time the path was checked. If the
+        command changes the file, call :func:`os.stat` to see the change.
+
+        :param path: The path to get information about.
+        :raise OSError: The path doesn't exist or can't be accessed.
+
+        .. versionadded:: 8.4
+        """
+        key = ("stat", os.fspath(path))
+        rv = self._path_cache.get(key)
+
+        if rv is None:
+            rv = self._path_cache[key] = os.stat(key[1])
+
+        return t.cast(os.stat_result, rv)
+
     def make_formatter(self) -> HelpFormatter:
         """Creates the :class:`~click.HelpFormatter` for the help and
         usage output.
@@ -702,12 +957,19 @@ class Context:
         :param call: If the default is a callable, call it. Disable to
             return the callable instead.
 
+        .. versionchanged:: 8.4
+            A :class:`CachedDefault` is computed once per invocation or
+            process.
+
         .. versionchanged:: 8.0
             Added the ``call`` parameter.
         """
         if self.default_map is not None:
             value = self.default_map.get(name, UNSET)
 
+            if call and isinstance(value, CachedDefault):
+                return value.get(self)
+
             if call and callable(value):
                 return value()
 
@@ -1089,11 +1351,63 @@ class Command:
         """Formats the help into a string and returns it.
 
         Calls :meth:`format_help` internally.
+
+        .. versionchanged:: 8.4
+            Uses a cached page if :attr:`Context.help_cache` is set.
         """
+        if ctx.help_cache is not None:
+            from ._help_cache import get_help
+
+            return get_help(self, ctx, ctx.help_cache)
+
         formatter = ctx.make_formatter()
         self.format_help(ctx, formatter)
         return formatter.getvalue().rstrip("\n")
 
+    def write_help(self, ctx: Context, write: t.Callable[[str], t.Any]) -> None:
+        """Format the help and pass it to ``write`` in chunks while it is
+        produced, instead of building the whole page first. The text is
+        the same as :meth:`get_help` followed by a newline.
+
+        Calls :meth:`format_help` internally.
+
+        :param ctx: The context for this command.
+        :param write: Called with each chunk of text.
+
+        .. versionadded:: 8.4
+        """
+        # Hold back trailing newlines, they are replaced by a single
+        # newline at the end, like get_help strips them.
+        newlines = ""
+
+        def sink(text: str) -> None:
+            nonlocal newlines
+            stripped = text.rstrip("\n")
+
+            if stripped:
+                write(f"{newlines}{stripped}")
+                newlines = text[len(stripped) :]
+            else:
+                newlines += text
+
+        formatter = ctx.make_formatter()
+        cls = type(formatter)
+
+        # A formatter that overrides how text is collected is used as-is.
+        if (
+            isinstance(formatter, HelpFormatter)
+            and cls.write is HelpFormatter.write
+            and cls.getvalue is HelpFormatter.getvalue
+        ):
+            formatter.sink = sink
+            self.format_help(ctx, formatter)
+            formatter.flush()
+        else:
+            self.format_help(ctx, formatter)
+            sink(formatter.getvalue())
+
+        write("\n")
+
     def get_short_help_str(self, limit: int = 45) -> str:
         """Gets short help for the command or makes it by shortening the
         long help string.
@@ -1521,8 +1835,20 @@ class Group(Command):
         all the commands. If ``invoke_without_command`` is enabled, the value
         will be the value returned by the group's callback, or an empty list if
         ``chain`` is enabled.
+    :param commands_page_size: List at most this many commands in the
+        help page. ``--filter PATTERN`` and ``--page N`` can be given
+        with the help option to select which commands are listed. They
+        aren't parameters of the group, and aren't added if the group
+        has options with the same names. Only the listed commands are
+        loaded with :meth:`get_command`.
+    :param allow_abbreviations: Allow invoking a command with a prefix
+        of its name, if no other command starts with the same prefix.
     :param kwargs: Other arguments passed to :class:`Command`.
 
+    .. versionchanged:: 8.4
+        Added the ``commands_page_size`` and ``allow_abbreviations``
+        parameters.
+
     .. versionchanged:: 8.0
         The ``commands`` argument can be a list of command objects.
 
@@ -1564,14 +1890,16 @@ class Group(Command):
         subcommand_metavar: str | None = None,
         chain: bool = False,
         result_callback: t.Callable[..., t.Any] | None = None,
+        commands_page_size: int | None = None,
+        allow_abbreviations: bool = False,
         **kwargs: t.Any,
     ) -> None:
         super().__init__(name, **kwargs)
 
         if commands is None:
-            commands = {}
+            commands = _CommandDict()
         elif isinstance(commands, abc.Sequence):
-            commands = {c.name: c for c in commands if c.name is not None}
+            commands = _CommandDict((c.name, c) for c in commands if c.name is not None)
 
         #: The registered subcommands by their exported names.
         self.commands: cabc.MutableMapping[str, Command] = commands
@@ -1593,6 +1921,13 @@ class Group(Command):
         # The result callback that is stored. This can be set or
         # overridden with the :func:`result_callback` decorator.
         self._result_callback = result_callback
+        self.commands_page_size = commands_page_size
+        self.allow_abbreviations = allow_abbreviations
+        self._command_trie: _CommandTrie | None = None
+        self._selection_options: tuple[Option, Option] | None = None
+
+        if commands_page_size is not None and commands_page_size < 1:
+            raise ValueError("'commands_page_size' must be at least 1.")
 
         if self.chain:
             for param in self.params:
@@ -1628,6 +1963,7 @@ class Group(Command):
             raise TypeError("Command has no name.")
         _check_nested_chain(self, name, cmd, register=True)
         self.commands[name] = cmd
+        self._command_trie = None
 
     @t.overload
     def command(self, __func: t.Callable[..., t.Any]) -> Command: ...
@@ -1785,6 +2121,68 @@ class Group(Command):
         """Returns a list of subcommand names in the order they should appear."""
         return sorted(self.commands)
 
+    def _commands_with_prefix(self, ctx: Context, prefix: str) -> list[str]:
+        """The names from :meth:`list_commands` that start with ``prefix``.
+
+        If ``list_commands`` isn't overridden and the commands dict was
+        created by the group, a prefix tree finds them. The tree is rebuilt
+        when the commands change. Otherwise, all the names are checked.
+        """
+        commands = self.commands
+
+        if type(self).list_commands is not Group.list_commands or not isinstance(
+            commands, _CommandDict
+        ):
+            return [n for n in self.list_commands(ctx) if n.startswith(prefix)]
+
+        trie = self._command_trie
+
+        if trie is None or trie.version != commands.version:
+            trie = self._command_trie = _CommandTrie(commands, commands.version)
+
+        return trie.with_prefix(prefix)
+
+    def _resolve_abbreviation(self, ctx: Context, prefix: str) -> str | None:
+        """Find the single visible command that starts with ``prefix``.
+        Fails if more than one visible command matches. Hidden commands
+        are never resolved, and don't make a prefix ambiguous.
+        """
+        visible = []
+
+        for name in self._commands_with_prefix(ctx, prefix):
+            cmd = self.get_command(ctx, name)
+
+            if cmd is not None and not cmd.hidden:
+                visible.append(name)
+
+                # Enough to show that the prefix is ambiguous.
+                if len(visible) > 10:
+                    break
+
+        if len(visible) > 1:
+            ctx.fail(
+                _("{name!r} is ambiguous, it could be {matches}.").format(
+                    name=prefix,
+                    matches=", ".join(repr(m) for m in visible[:10]),
+                )
+            )
+
+        return visible[0] if visible else None
+
+    def _suggest_commands(self, ctx: Context, cmd_name: str) -> list[str]:
+        """Find visible commands with names similar to ``cmd_name``."""
+        from ._suggest import suggest
+
+        rv = []
+
+        for name in suggest(cmd_name, self.list_commands(ctx)):
+            cmd = self.get_command(ctx, name)
+
+            if cmd is not None and not cmd.hidden:
+                rv.append(name)
+
+        return rv
+
     def collect_usage_pieces(self, ctx: Context) -> list[str]:
         rv = super().collect_usage_pieces(ctx)
         rv.append(self.subcommand_metavar)
@@ -1797,9 +2195,43 @@ class Group(Command):
     def format_commands(self, ctx: Context, formatter: HelpFormatter) -> None:
         """Extra format methods for multi methods that adds all the commands
         after the options.
+
+        .. versionchanged:: 8.4
+            If :attr:`commands_page_size` is set, only one page of the
+            commands matching the filter is listed. A page past the last
+            one is a usage error.
         """
+        names = self.list_commands(ctx)
+        page_size = self.commands_page_size
+        pattern = None
+        start = total = 0
+
+        if page_size is not None:
+            pattern, page = ctx._commands_selection or (None, 1)
+
+            if pattern:
+                from fnmatch import fnmatchcase
+
+                names = [name for name in names if fnmatchcase(name, pattern)]
+
+            total = len(names)
+            start = (page - 1) * page_size
+
+            if total and start >= total:
+                pages = -(-total // page_size)
+                raise UsageError(
+                    ngettext(
+                        "Page {page} doesn't exist, there is {pages} page.",
+                        "Page {page} doesn't exist, there are {pages} pages.",
+                        pages,
+                    ).format(page=page, pages=pages),
+                    ctx,
+                )
+
+            names = names[start : start + page_size]
+
         commands = []
-        for subcommand in self.list_commands(ctx):
+        for subcommand in names:
             cmd = self.get_command(ctx, subcommand)
             # What is this, the tool lied about a command.  Ignore it
             if cmd is None:
@@ -1822,10 +2254,98 @@ class Group(Command):
                 with formatter.section(_("Commands")):
                     formatter.write_dl(rows)
 
+                    if page_size is not None and (start or total > page_size):
+                        formatter.write_paragraph()
+                        formatter.write_text(
+                            _(
+                                "Showing {start}-{end} of {total} commands. Use"
+                                " --page and --filter to list others."
+                            ).format(
+                                start=start + 1,
+                                end=start + len(names),
+                                total=total,
+                            )
+                        )
+        elif pattern:
+            with formatter.section(_("Commands")):
+                formatter.write_text(
+                    _("No commands match {pattern!r}.").format(pattern=pattern)
+                )
+
+    def _get_selection_options(self) -> tuple[Option, Option]:
+        """The ``--filter`` and ``--page`` options accepted with the help
+        option if :attr:`commands_page_size` is set.
+        """
+        if self._selection_options is None:
+            self._selection_options = (
+                Option(["--filter", "_commands_filter"], metavar="PATTERN"),
+                Option(
+                    ["--page", "_commands_page"],
+                    type=types.IntRange(min=1),
+                    metavar="N",
+                ),
+            )
+
+        return self._selection_options
+
+    def make_parser(self, ctx: Context) -> _OptionParser:
+        """Creates the underlying option parser for this command.
+
+        .. versionchanged:: 8.4
+            Accepts ``--filter`` and ``--page`` while help is requested,
+            if :attr:`commands_page_size` is set.
+        """
+        parser = super().make_parser(ctx)
+
+        if ctx._commands_selection is not None:
+            for option in self._get_selection_options():
+                # The group's own options take precedence.
+                if not any(
+                    name in parser._long_opt or name in parser._short_opt
+                    for name in option.opts
+                ):
+                    option.add_to_parser(parser, ctx)
+
+        return parser
+
+    def _parse_commands_selection(self, ctx: Context, args: list[str]) -> None:
+        """The help option is processed before the other parameters, so
+        parse ``--filter`` and ``--page`` ahead of time if the help option
+        is given to this group. Invalid values are reported in any order.
+        """
+        help_option = self.get_help_option(ctx)
+
+        if help_option is None or not set(help_option.opts).intersection(args):
+            return
+
+        ctx._commands_selection = (None, 1)
+
+        try:
+            opts = self.make_parser(ctx).parse_args(args=list(args))[0]
+        except UsageError:
+            # Parsing again for the command reports the error.
+            return
+
+        if help_option.name not in opts:
+            # The help option was given to a subcommand.
+            ctx._commands_selection = None
+            return
+
+        filter_option, page_option = self._get_selection_options()
+        pattern = opts.get("_commands_filter")
+        page = opts.get("_commands_page")
+        ctx._commands_selection = (
+            None if pattern is None else filter_option.type_cast_value(ctx, pattern),
+            1 if page is None else page_option.type_cast_value(ctx, page),
+        )
+
     def parse_args(self, ctx: Context, args: list[str]) -> list[str]:
         if not args and self.no_args_is_help and not ctx.resilient_parsing:
             raise NoArgsIsHelpError(ctx)
 
+        if self.commands_page_size is not None and not ctx.resilient_parsing:
+            self._parse_commands_selection(ctx, args)
+
         rest = super().parse_args(ctx, args)
 
         if self.chain:
@@ -1919,6 +2439,14 @@ class Group(Command):
             cmd_name = ctx.token_normalize_func(cmd_name)
             cmd = self.get_command(ctx, cmd_name)
 
+        # Try the name as an abbreviation, unless it looks like an option.
+        if cmd is None and self.allow_abbreviations and not _split_opt(cmd_name)[0]:
+            full_name = self._resolve_abbreviation(ctx, cmd_name)
+
+            if full_name is not None:
+                cmd_name = full_name
+                cmd = self.get_command(ctx, cmd_name)
+
         # If we don't find the command we want to show an error message
         # to the user that it was not provided.  However, there is
         # something else we should do: if the first argument looks like
@@ -1928,7 +2456,21 @@ class Group(Command):
         if cmd is None and not ctx.resilient_parsing:
             if _split_opt(cmd_name)[0]:
                 self.parse_args(ctx, args)
-            ctx.fail(_("No such command {name!r}.").format(name=original_cmd_name))
+
+            message = _("No such command {name!r}.").format(name=original_cmd_name)
+            possibilities = self._suggest_commands(ctx, original_cmd_name)
+
+            if possibilities:
+                possibility_str = ", ".join(repr(p) for p in sorted(possibilities))
+                suggest = ngettext(
+                    "Did you mean {possibility}?",
+                    "(Possible commands: {possibilities})",
+                    len(possibilities),
+                ).format(possibility=possibility_str, possibilities=possibility_str)
+                message = f"{message} {suggest}"
+
+            ctx.fail(message)
+
         return cmd_name if cmd else None, cmd, args[1:]
 
     def shell_complete(self, ctx: Context, incomplete: str) -> list[CompletionItem]:
@@ -1965,10 +2507,25 @@ class CommandCollection(Group):
     is not invoked when invoking its commands. In other words, this "flattens"
     commands in many groups into this one group.
 
+    The names of sources that are plain :class:`Group` objects are
+    indexed, so finding the source of a command doesn't check every
+    source. The index is rebuilt when the commands of this group or of
+    such a source change. Sources that override ``list_commands`` are
+    asked for their names every time, since they may depend on the
+    context. The first source that lists a name is asked for it first,
+    even if an earlier source could resolve the name without listing it,
+    such as an alias. Names that no source lists are looked up on each
+    source in order.
+
     :param name: The name of the group command.
     :param sources: A list of :class:`Group` objects to look up commands from.
     :param kwargs: Other arguments passed to :class:`Group`.
 
+    .. versionchanged:: 8.4
+        Commands are found using an index of the names of plain group
+        sources. A source that lists a name takes precedence over earlier
+        sources that don't list it.
+
     .. versionchanged:: 8.2
         This is a subclass of ``Group``. Commands are looked up first on this
         group, then each of its sources.
@@ -1983,10 +2540,70 @@ class CommandCollection(Group):
         super().__init__(name, **kwargs)
         #: The list of registered groups.
         self.sources: list[Group] = sources or []
+        self._source_index: dict[str, Group] | None = None
+        self._sorted_commands: list[str] = []
+        self._index_key: tuple[t.Any, ...] = ()
 
     def add_source(self, group: Group) -> None:
         """Add a group as a source of commands."""
         self.sources.append(group)
+        self.invalidate_commands()
+
+    def add_command(self, cmd: Command, name: str | None = None) -> None:
+        super().add_command(cmd, name)
+        self.invalidate_commands()
+
+    def invalidate_commands(self) -> None:
+        """Discard the index of source commands, it will be rebuilt the
+        next time a command is looked up. Changes to the commands of this
+        group and of plain group sources are detected, call this if the
+        names listed by a source change some other way.
+
+        .. versionadded:: 8.4
+        """
+        self._source_index = None
+
+    def _get_index_key(self) -> tuple[t.Any, ...]:
+        """Detect changes that don't go through this collection: the list
+        of sources, and the command names of this group and of plain
+        groups.
+        """
+        return (
+            _commands_key(self.commands),
+            *(
+                (
+                    id(source),
+                    _commands_key(source.commands)
+                    if _lists_own_commands(source)
+                    else None,
+                )
+                for source in self.sources
+            ),
+        )
+
+    def _get_source_index(self, ctx: Context) -> dict[str, Group]:
+        """Map the names of plain group sources to the first source that
+        lists them.
+        """
+        index = self._source_index
+        key = self._get_index_key()
+
+        if index is None or key != self._index_key:
+            index = {}
+
+            # Earlier sources take precedence.
+            for source in self.sources:
+                if _lists_own_commands(source):
+                    for name in source.commands:
+                        index.setdefault(name, source)
+
+            names = set(super().list_commands(ctx))
+            names.update(index)
+            self._sorted_commands = sorted(names)
+            self._source_index = index
+            self._index_key = key
+
+        return index
 
     def get_command(self, ctx: Context, cmd_name: str) -> Command | None:
         rv = super().get_command(ctx, cmd_name)
@@ -1994,24 +2611,69 @@ class CommandCollection(Group):
         if rv is not None:
             return rv
 
+        indexed = self._get_source_index(ctx).get(cmd_name)
+        listed = None
+
+        # Find the first source that lists the name. Plain groups are
+        # checked with the index, other sources list their names now.
         for source in self.sources:
+            if _lists_own_commands(source):
+                if source is indexed:
+                    listed = source
+                    break
+            elif cmd_name in source.list_commands(ctx):
+                listed = source
+                break
+
+        # Try the source listing the name first, then any others that may
+        # resolve names they don't list, such as aliases.
+        sources = self.sources
+
+        if listed is not None:
+            sources = [listed, *(s for s in sources if s is not listed)]
+
+        for source in sources:
             rv = source.get_command(ctx, cmd_name)
 
             if rv is not None:
-                if self.chain:
-                    _check_nested_chain(self, cmd_name, rv)
+                break
+        else:
+            return None
 
-                return rv
+        if self.chain:
+            _check_nested_chain(self, cmd_name, rv)
 
-        return None
+        return rv
 
     def list_commands(self, ctx: Context) -> list[str]:
-        rv: set[str] = set(super().list_commands(ctx))
+        self._get_source_index(ctx)
+        dynamic = [s for s in self.sources if not _lists_own_commands(s)]
+
+        if not dynamic:
+            return list(self._sorted_commands)
+
+        names = set(self._sorted_commands)
+
+        for source in dynamic:
+            names.update(source.list_commands(ctx))
+
+        return sorted(names)
 
-        for source in self.sources:
-            rv.update(source.list_commands(ctx))
 
-        return sorted(rv)
+def _skips_completion_values(command: Command) -> bool:
+    """While completing, the values of a command's parameters can be
+    recorded without processing them if nothing can observe them before
+    the object being completed. A group's ``list_commands`` and
+    ``get_command`` may use its values, and so may a command that
+    customizes how it's parsed. Custom completions get processed values,
+    see ``shell_completion.ShellComplete.get_completions``.
+    """
+    cls = type(command)
+    return (
+        not isinstance(command, Group)
+        and cls.make_context is Command.make_context
+        and cls.parse_args is Command.parse_args
+    )
 
 
 def _check_iter(value: t.Any) -> cabc.Iterator[t.Any]:
@@ -2024,6 +2686,70 @@ def _check_iter(value: t.Any) -> cabc.Iterator[t.Any]:
     return iter(value)
 
 
+class CachedDefault:
+    """Wrap a function that computes a parameter default, so that it is
+    called at most once. Use it as the ``default`` of a parameter, or as
+    a value in :attr:`Context.default_map`.
+
+    .. code-block:: python
+
+        @click.option("--branch", default=click.CachedDefault(current_branch))
+
+    The default is only computed when it is needed, so it is not called
+    if the value was given on the command line or by an environment
+    variable. Help text shows it as ``(dynamic)`` without calling it.
+
+    :param func: Called with no arguments to compute the default.
+    :param per: ``"context"`` computes the value once per invocation,
+        shared by all contexts under the same root context.
+        ``"process"`` computes it once for the life of the process.
+
+    .. versionadded:: 8.4
+    """
+
+    def __init__(
+        self,
+        func: t.Callable[[], t.Any],
+        per: t.Literal["context", "process"] = "context",
+    ) -> None:
+        if per not in {"context", "process"}:
+            raise ValueError("'per' must be 'context' or 'process'.")
+
+        self.func = func
+        self.per = per
+        self._value: t.Any = UNSET
+
+    def get(self, ctx: Context | None) -> t.Any:
+        """Get the value, computing it if it isn't cached yet.
+
+        :param ctx: The current context. If ``per="context"`` and this
+            is ``None``, the value is computed without caching.
+        """
+        if self.per == "process":
+            if self._value is UNSET:
+                self._value = self.func()
+
+            return self._value
+
+        if ctx is None:
+            return self.func()
+
+        cache = ctx._default_cache
+
+        if self not in cache:
+            cache[self] = self.func()
+
+        return cache[self]
+
+    def __call__(self) -> t.Any:
+        from .globals import get_current_context
+
+        return self.get(get_current_context(silent=True))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} {self.func!r} per={self.per!r}>"
+
+
 class Parameter:
     r"""A parameter to a command comes in two versions: they are either
     :class:`Option`\s or :class:`Argument`\s.  Other subclasses are currently
@@ -2065,13 +2791,23 @@ class Parameter:
         completions. Used instead of the param's type completion if
         given. Takes ``ctx, param, incomplete`` and must return a list
         of :class:`~click.shell_completion.CompletionItem` or a list of
-        strings.
+        strings. It may also return an iterable that produces items one
+        at a time, an awaitable, or an async iterable.
+    :param shell_complete_timeout: The time budget in seconds for the
+        ``shell_complete`` function. If it takes longer, the results
+        cached by the last finished completion of the same value are
+        used, or the items produced so far. The function keeps running
+        in the background and caches its results for the next completion.
     :param deprecated: If ``True`` or non-empty string, issues a message
                         indicating that the argument is deprecated and highlights
                         its deprecation in --help. The message can be customized
                         by using a string as the value. A deprecated parameter
                         cannot be required, a ValueError will be raised otherwise.
 
+    .. versionchanged:: 8.4
+        Added ``shell_complete_timeout``. ``shell_complete`` can be
+        asynchronous or produce items one at a time.
+
     .. versionchanged:: 8.2.0
         Introduction of ``deprecated``.
 
@@ -2117,6 +2853,10 @@ class Parameter:
 
     param_type_name = "parameter"
 
+    #: Whether :meth:`handle_parse_result` can use the fast path for
+    #: this parameter. Computed on first use.
+    _fast_path: bool | None = None
+
     def __init__(
         self,
         param_decls: cabc.Sequence[str] | None = None,
@@ -2141,10 +2881,16 @@ class Parameter:
         is_eager: bool = False,
         envvar: str | cabc.Sequence[str] | None = None,
         shell_complete: t.Callable[
-            [Context, Parameter, str], list[CompletionItem] | list[str]
+            [Context, Parameter, str],
+            list[CompletionItem]
+            | list[str]
+            | cabc.Iterable[CompletionItem | str]
+            | cabc.Awaitable[t.Any]
+            | cabc.AsyncIterable[CompletionItem | str],
         ]
         | None = None,
         deprecated: bool | str = False,
+        shell_complete_timeout: float | None = None,
     ) -> None:
         self.name: str | None
         self.opts: list[str]
@@ -2171,7 +2917,10 @@ class Parameter:
         self.is_eager = is_eager
         self.metavar = metavar
         self.envvar = envvar
+        self._envvar_names: tuple[str | cabc.Sequence[str] | None, tuple[str, ...]]
+        self._envvar_names = (None, ())
         self._custom_shell_complete = shell_complete
+        self.shell_complete_timeout = shell_complete_timeout
         self.deprecated = deprecated
 
         if __debug__:
@@ -2265,6 +3014,10 @@ class Parameter:
         :param call: If the default is a callable, call it. Disable to
             return the callable instead.
 
+        .. versionchanged:: 8.4
+            A :class:`CachedDefault` is computed once per invocation or
+            process.
+
         .. versionchanged:: 8.0.2
             Type casting is no longer performed when getting a default.
 
@@ -2283,7 +3036,9 @@ class Parameter:
         if value is UNSET:
             value = self.default
 
-        if call and callable(value):
+        if call and isinstance(value, CachedDefault):
+            value = value.get(ctx)
+        elif call and callable(value):
             value = value()
 
         return value
@@ -2337,6 +3092,10 @@ class Parameter:
     def type_cast_value(self, ctx: Context, value: t.Any) -> t.Any:
         """Convert and validate a value against the parameter's
         :attr:`type`, :attr:`multiple`, and :attr:`nargs`.
+
+        .. versionchanged:: 8.4
+            Uses :meth:`ParamType.convert_many` to convert all the values
+            of ``nargs=-1`` or ``multiple=True``.
         """
         if value is None:
             if self.multiple or self.nargs == -1:
@@ -2344,6 +3103,10 @@ class Parameter:
             else:
                 return value
 
+        # The most common case, avoid defining the closures below.
+        if self.nargs == 1 and not self.multiple:
+            return self.type(value, param=self, ctx=ctx)
+
         def check_iter(value: t.Any) -> cabc.Iterator[t.Any]:
             try:
                 return _check_iter(value)
@@ -2365,7 +3128,7 @@ class Parameter:
         elif self.nargs == -1:
 
             def convert(value: t.Any) -> t.Any:  # tuple[t.Any, ...]
-                return tuple(self.type(x, self, ctx) for x in check_iter(value))
+                return self.type.convert_many(tuple(check_iter(value)), self, ctx)
 
         else:  # nargs > 1
 
@@ -2386,6 +3149,9 @@ class Parameter:
                 return tuple(self.type(x, self, ctx) for x in value)
 
         if self.multiple:
+            if self.nargs == 1 and not self.type.is_composite:
+                return self.type.convert_many(tuple(check_iter(value)), self, ctx)
+
             return tuple(convert(x) for x in check_iter(value))
 
         return convert(value)
@@ -2403,7 +3169,10 @@ class Parameter:
         if value is UNSET:
             return True
 
-        if (self.nargs != 1 or self.multiple) and value == ():
+        # The value may be an array that doesn't compare to a tuple.
+        if (self.nargs != 1 or self.multiple) and (
+            isinstance(value, tuple) and value == ()
+        ):
             return True
 
         return False
@@ -2469,26 +3238,37 @@ class Parameter:
 
         :meta private:
         """
-        if not self.envvar:
-            return None
+        environ = ctx.environ
 
-        if isinstance(self.envvar, str):
-            rv = os.environ.get(self.envvar)
+        # Return the first non-empty value of the list of environment variables.
+        # Absence of value is interpreted as an environment variable that is not
+        # set, so proceed to the next one.
+        for envvar in self._get_envvar_names():
+            rv = environ.get(envvar)
 
             if rv:
                 return rv
-        else:
-            for envvar in self.envvar:
-                rv = os.environ.get(envvar)
-
-                # Return the first non-empty value of the list of environment variables.
-                if rv:
-                    return rv
-                # Else, absence of value is interpreted as an environment variable that
-                # is not set, so proceed to the next one.
 
         return None
 
+    def _get_envvar_names(self) -> tuple[str, ...]:
+        """The names from :attr:`envvar` as a tuple. The result is cached
+        until :attr:`envvar` is replaced.
+        """
+        source, names = self._envvar_names
+
+        if source is not self.envvar:
+            if not self.envvar:
+                names = ()
+            elif isinstance(self.envvar, str):
+                names = (self.envvar,)
+            else:
+                names = tuple(self.envvar)
+
+            self._envvar_names = (self.envvar, names)
+
+        return names
+
     def value_from_envvar(self, ctx: Context) -> str | cabc.Sequence[str] | None:
         """Process the raw environment variable string for this parameter.
 
@@ -2519,6 +3299,35 @@ class Parameter:
 
         :meta private:
         """
+        if ctx._completion_only and _skips_completion_values(ctx.command):
+            return self._record_completion_value(ctx, opts), args
+
+        fast_path = self._fast_path
+
+        if fast_path is None:
+            fast_path = self._fast_path = self._supports_fast_path()
+
+        if fast_path and self.callback is None and not self.deprecated:
+            try:
+                value = self._process_simple_value(ctx, opts)
+            except BadParameter as e:
+                if e.ctx is None:
+                    e.ctx = ctx
+                if e.param is None:
+                    e.param = self
+                raise
+            except UsageError as e:
+                if e.ctx is None:
+                    e.ctx = ctx
+                raise
+
+            if self.expose_value and (
+                self.name not in ctx.params or ctx.params[self.name] is UNSET
+            ):
+                ctx.params[self.name] = value  # type: ignore[index]
+
+            return value, args
+
         with augment_usage_errors(ctx, param=self):
             value, source = self.consume_value(ctx, opts)
 
@@ -2571,6 +3380,82 @@ class Parameter:
 
         return value, args
 
+    def _supports_fast_path(self) -> bool:
+        """Whether values can be processed by
+        :meth:`_process_simple_value`, which does the same work as
+        :meth:`consume_value` and :meth:`process_value` without the steps
+        that only matter for multiple values. Subclasses that override
+        those methods always use them.
+        """
+        if self.nargs != 1 or self.multiple:
+            return False
+
+        base = Option if isinstance(self, Option) else Parameter
+
+        return all(
+            getattr(type(self), name) is getattr(base, name)
+            for name in (
+                "consume_value",
+                "process_value",
+                "type_cast_value",
+                "value_is_missing",
+            )
+        )
+
+    def _process_simple_value(
+        self, ctx: Context, opts: cabc.Mapping[str, t.Any]
+    ) -> t.Any:
+        """Process the value of a parameter with ``nargs=1``, no
+        :attr:`callback`, and none of the features that need extra steps.
+        Only used if :meth:`_supports_fast_path` is true.
+        """
+        value, source = Parameter.consume_value(self, ctx, opts)
+        ctx.set_parameter_source(self.name, source)  # type: ignore[arg-type]
+
+        try:
+            if value is UNSET:
+                if self.required:
+                    raise MissingParameter(ctx=ctx, param=self)
+
+                # An unset boolean flag is false, see Option.process_value.
+                if getattr(self, "is_bool_flag", False):
+                    return False
+            elif value is not None:
+                value = self.type(value, self, ctx)
+        except Exception:
+            if not ctx.resilient_parsing:
+                raise
+
+            value = UNSET
+
+        return value
+
+    def _record_completion_value(
+        self, ctx: Context, opts: cabc.Mapping[str, t.Any]
+    ) -> t.Any:
+        """Record the value given on the command line without processing
+        it. Shell completion only needs to know which parameters were
+        given, so this doesn't look up defaults or environment variables,
+        convert the value, or call the callback.
+        """
+        value = opts.get(self.name, UNSET)  # type: ignore[arg-type]
+
+        if value is UNSET:
+            source = ParameterSource.DEFAULT
+            value = () if self.multiple or self.nargs == -1 else None
+        else:
+            source = ParameterSource.COMMANDLINE
+
+        ctx.set_parameter_source(self.name, source)  # type: ignore[arg-type]
+
+        if self.expose_value:
+            current = ctx.params.get(self.name, UNSET)  # type: ignore[arg-type]
+
+            if current is UNSET or current is None:
+                ctx.params[self.name] = value  # type: ignore[index]
+
+        return value
+
     def get_help_record(self, ctx: Context) -> tuple[str, str] | None:
         pass
 
@@ -2596,8 +3481,24 @@ class Parameter:
         .. versionadded:: 8.0
         """
         if self._custom_shell_complete is not None:
+            if self.shell_complete_timeout is not None:
+                from ._completion_runner import run_with_timeout
+
+                return run_with_timeout(
+                    self._custom_shell_complete,
+                    ctx,
+                    self,
+                    incomplete,
+                    self.shell_complete_timeout,
+                )
+
             results = self._custom_shell_complete(ctx, self, incomplete)
 
+            if not isinstance(results, list):
+                from ._completion_runner import iter_results
+
+                results = list(iter_results(results))
+
             if results and isinstance(results[0], str):
                 from click.shell_completion import CompletionItem
 
@@ -2806,6 +3707,7 @@ class Option(Parameter):
                 self.default = 0
 
         self.allow_from_autoenv = allow_from_autoenv
+        self._auto_envvar_names: dict[str, str] = {}
         self.help = help
         self.show_default = show_default
         self.show_choices = show_choices
@@ -2833,6 +3735,16 @@ class Option(Parameter):
                 if self.is_flag:
                     raise TypeError("'count' is not valid with 'is_flag'.")
 
+    def _supports_fast_path(self) -> bool:
+        # Prompts and flags with a non-boolean flag_value are handled by
+        # Option.consume_value.
+        return (
+            self.prompt is None
+            and not self._flag_needs_value
+            and (self.is_bool_flag or not self.is_flag)
+            and super()._supports_fast_path()
+        )
+
     def to_info_dict(self) -> dict[str, t.Any]:
         """
         .. versionchanged:: 8.3.0
@@ -3004,12 +3916,7 @@ class Option(Parameter):
             envvar = self.envvar
 
             if envvar is None:
-                if (
-                    self.allow_from_autoenv
-                    and ctx.auto_envvar_prefix is not None
-                    and self.name is not None
-                ):
-                    envvar = f"{ctx.auto_envvar_prefix}_{self.name.upper()}"
+                envvar = self._get_auto_envvar_name(ctx)
 
             if envvar is not None:
                 if isinstance(envvar, str):
@@ -3048,7 +3955,9 @@ class Option(Parameter):
                 default_string = ", ".join(str(d) for d in default_value)
             elif isinstance(default_value, enum.Enum):
                 default_string = default_value.name
-            elif inspect.isfunction(default_value):
+            elif inspect.isfunction(default_value) or isinstance(
+                default_value, CachedDefault
+            ):
                 default_string = _("(dynamic)")
             elif self.is_bool_flag and self.secondary_opts:
                 # For boolean flags that have distinct True/False opts,
@@ -3146,19 +4055,32 @@ class Option(Parameter):
         if rv is not None:
             return rv
 
-        if (
-            self.allow_from_autoenv
-            and ctx.auto_envvar_prefix is not None
-            and self.name is not None
-        ):
-            envvar = f"{ctx.auto_envvar_prefix}_{self.name.upper()}"
-            rv = os.environ.get(envvar)
+        envvar = self._get_auto_envvar_name(ctx)
+
+        if envvar is not None:
+            rv = ctx.environ.get(envvar)
 
             if rv:
                 return rv
 
         return None
 
+    def _get_auto_envvar_name(self, ctx: Context) -> str | None:
+        """The name of the automatic environment variable for this option
+        under :attr:`Context.auto_envvar_prefix`, or ``None`` if it isn't
+        used. Names are cached per prefix.
+        """
+        prefix = ctx.auto_envvar_prefix
+
+        if not self.allow_from_autoenv or prefix is None or self.name is None:
+            return None
+
+        try:
+            return self._auto_envvar_names[prefix]
+        except KeyError:
+            envvar = self._auto_envvar_names[prefix] = f"{prefix}_{self.name.upper()}"
+            return envvar
+
     def value_from_envvar(self, ctx: Context) -> t.Any:
         """For :class:`Option`, this method processes the raw environment variable
         string the same way as :func:`Parameter.value_from_envvar` does.
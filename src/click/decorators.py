@@ -536,7 +536,20 @@ def help_option(*param_decls: str, **kwargs: t.Any) -> t.Callable[[FC], FC]:
     def show_help(ctx: Context, param: Parameter, value: bool) -> None:
         """Callback that print the help page on ``<stdout>`` and exits."""
         if value and not ctx.resilient_parsing:
-            echo(ctx.get_help(), color=ctx.color)
+            command = ctx.command
+
+            # Stream the page unless it's cached or get_help is customized.
+            if (
+                ctx.help_cache is None
+                and type(ctx).get_help is Context.get_help
+                and type(command).get_help is Command.get_help
+            ):
+                command.write_help(
+                    ctx, lambda text: echo(text, nl=False, color=ctx.color)
+                )
+            else:
+                echo(ctx.get_help(), color=ctx.color)
+
             ctx.exit()
 
     if not param_decls:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import typing as t
 from contextlib import contextmanager
 from gettext import gettext as _
 
@@ -53,17 +54,22 @@ def wrap_text(
     :param preserve_paragraphs: if this flag is set then the wrapping will
                                 intelligently handle paragraphs.
     """
-    from ._textwrap import TextWrapper
+    from ._textwrap import get_wrapper
 
     text = text.expandtabs()
-    wrapper = TextWrapper(
-        width,
-        initial_indent=initial_indent,
-        subsequent_indent=subsequent_indent,
-        replace_whitespace=False,
-    )
+
     if not preserve_paragraphs:
-        return wrapper.fill(text)
+        return get_wrapper(width, initial_indent, subsequent_indent).fill(text)
+
+    lines = text.splitlines()
+
+    # A single line is a single paragraph, unless it only has the marker.
+    if len(lines) == 1 and lines[0].strip() != "\b":
+        line = lines[0].lstrip()
+        prefix = " " * (term_len(lines[0]) - term_len(line))
+        return get_wrapper(
+            width, initial_indent + prefix, subsequent_indent + prefix
+        ).fill(line)
 
     p: list[tuple[int, bool, str]] = []
     buf: list[str] = []
@@ -78,7 +84,7 @@ def wrap_text(
             p.append((indent or 0, False, " ".join(buf)))
         del buf[:]
 
-    for line in text.splitlines():
+    for line in lines:
         if not line:
             _flush_par()
             indent = None
@@ -92,11 +98,13 @@ def wrap_text(
 
     rv = []
     for indent, raw, text in p:
-        with wrapper.extra_indent(" " * indent):
-            if raw:
-                rv.append(wrapper.indent_only(text))
-            else:
-                rv.append(wrapper.fill(text))
+        extra = " " * indent
+        wrapper = get_wrapper(width, initial_indent + extra, subsequent_indent + extra)
+
+        if raw:
+            rv.append(wrapper.indent_only(text))
+        else:
+            rv.append(wrapper.fill(text))
 
     return "\n\n".join(rv)
 
@@ -106,11 +114,21 @@ class HelpFormatter:
     usually just needed for very special internal cases, but it's also
     exposed so that developers can write their own fancy outputs.
 
-    At present, it always writes into memory.
+    By default, it writes into memory. If a ``sink`` is given, buffered
+    text is passed to it once it reaches ``flush_size`` characters and
+    at the end of each section, so large pages can be written out while
+    they are produced.
 
     :param indent_increment: the additional increment for each level.
     :param width: the width for the text.  This defaults to the terminal
                   width clamped to a maximum of 78.
+    :param sink: Called with chunks of formatted text. :meth:`flush`
+        must be called after formatting to pass the remaining text.
+    :param flush_size: The number of buffered characters that causes
+        the buffer to be passed to the ``sink``.
+
+    .. versionchanged:: 8.4
+        Added the ``sink`` and ``flush_size`` parameters.
     """
 
     def __init__(
@@ -118,6 +136,8 @@ class HelpFormatter:
         indent_increment: int = 2,
         width: int | None = None,
         max_width: int | None = None,
+        sink: t.Callable[[str], t.Any] | None = None,
+        flush_size: int = 8192,
     ) -> None:
         self.indent_increment = indent_increment
         if max_width is None:
@@ -131,11 +151,34 @@ class HelpFormatter:
         self.width = width
         self.current_indent: int = 0
         self.buffer: list[str] = []
+        self.sink = sink
+        self.flush_size = flush_size
+        self._buffered_size = 0
+        self._flushed = False
 
     def write(self, string: str) -> None:
         """Writes a unicode string into the internal buffer."""
         self.buffer.append(string)
 
+        if self.sink is not None:
+            self._buffered_size += len(string)
+
+            if self._buffered_size >= self.flush_size:
+                self.flush()
+
+    def flush(self) -> None:
+        """Pass the buffered text to the ``sink`` and clear the buffer.
+        Does nothing if there is no sink.
+
+        .. versionadded:: 8.4
+        """
+        if self.sink is not None and self.buffer:
+            text = "".join(self.buffer)
+            self.buffer.clear()
+            self._buffered_size = 0
+            self._flushed = True
+            self.sink(text)
+
     def indent(self) -> None:
         """Increases the indentation."""
         self.current_indent += self.indent_increment
@@ -188,7 +231,7 @@ class HelpFormatter:
 
     def write_paragraph(self) -> None:
         """Writes a paragraph into the buffer."""
-        if self.buffer:
+        if self.buffer or self._flushed:
             self.write("\n")
 
     def write_text(self, text: str) -> None:
@@ -266,6 +309,8 @@ class HelpFormatter:
         finally:
             self.dedent()
 
+        self.flush()
+
     @contextmanager
     def indentation(self) -> cabc.Iterator[None]:
         """A context manager that increases the indentation."""
@@ -276,7 +321,9 @@ class HelpFormatter:
             self.dedent()
 
     def getvalue(self) -> str:
-        """Returns the buffer contents."""
+        """Returns the buffer contents. If there is a ``sink``, this is
+        only the text that has not been flushed yet.
+        """
         return "".join(self.buffer)
 
 
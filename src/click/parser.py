@@ -360,9 +360,9 @@ class _OptionParser:
         self, opt: str, explicit_value: str | None, state: _ParsingState
     ) -> None:
         if opt not in self._long_opt:
-            from difflib import get_close_matches
+            from ._suggest import suggest
 
-            possibilities = get_close_matches(opt, self._long_opt)
+            possibilities = suggest(opt, self._long_opt)
             raise NoSuchOption(opt, possibilities=possibilities, ctx=self.ctx)
 
         option = self._long_opt[opt]
@@ -0,0 +1,378 @@
+"""Run a command as a resident process that accepts invocations over a
+Unix socket.
+
+Starting a Python program and importing a large command tree can take
+far longer than the work a single invocation does. :func:`serve` pays
+that cost once: it keeps the command loaded and listens on a Unix
+socket. A small client, :func:`call`, forwards its arguments,
+environment, working directory, and standard streams to the server and
+returns the exit code of the invocation.
+
+Each request is handled in a process forked from the server, so every
+invocation gets a fresh :class:`~click.Context`, and changes a command
+makes to the environment, working directory, or global state never leak
+into the server or into other requests.
+
+This is only available on platforms that support passing file
+descriptors over Unix sockets.
+
+.. versionadded:: 8.4
+"""
+
+from __future__ import annotations
+
+import collections.abc as cabc
+import json
+import os
+import socket
+import struct
+import sys
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .core import Command
+
+# A request is a 4 byte big-endian length followed by a JSON object with
+# the "args", "env", and "cwd" of the invocation. The three standard
+# streams are sent as ancillary data with the first chunk. The response
+# is a 4 byte big-endian exit code.
+_LENGTH = struct.Struct("!I")
+_EXIT_CODE = struct.Struct("!i")
+_MAX_REQUEST_SIZE = 16 * 1024 * 1024
+
+
+def _check_supported() -> None:
+    if not hasattr(socket, "AF_UNIX") or not hasattr(socket, "send_fds"):
+        raise RuntimeError(
+            "Server mode requires Unix sockets with file descriptor passing."
+        )
+
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+
+    while len(buf) < size:
+        chunk = conn.recv(size - len(buf))
+
+        if not chunk:
+            raise ConnectionError("Connection closed before the request ended.")
+
+        buf += chunk
+
+    return bytes(buf)
+
+
+def _read_request(conn: socket.socket) -> tuple[dict[str, t.Any], list[int]]:
+    """Read one request from the connection. Returns the decoded request
+    and the received standard stream file descriptors.
+    """
+    data, fds, _, _ = socket.recv_fds(conn, 65536, 3)
+
+    try:
+        while len(data) < _LENGTH.size:
+            chunk = conn.recv(_LENGTH.size - len(data))
+
+            if not chunk:
+                raise ConnectionError("Connection closed before the request ended.")
+
+            data += chunk
+
+        (size,) = _LENGTH.unpack_from(data)
+
+        if size > _MAX_REQUEST_SIZE:
+            raise ValueError("Request is too large.")
+
+        payload = data[_LENGTH.size :]
+
+        if len(payload) < size:
+            payload += _recv_exactly(conn, size - len(payload))
+
+        request = json.loads(payload)
+    except BaseException:
+        for fd in fds:
+            os.close(fd)
+
+        raise
+
+    if len(fds) != 3:
+        for fd in fds:
+            os.close(fd)
+
+        raise ValueError("Request must pass stdin, stdout, and stderr.")
+
+    return request, fds
+
+
+def _run_request(
+    cli: Command,
+    conn: socket.socket,
+    prog_name: str | None,
+    isolate_env: bool,
+    extra: cabc.Mapping[str, t.Any],
+) -> int:
+    """Execute a single request in the forked worker process and return
+    the exit code.
+    """
+    request, fds = _read_request(conn)
+
+    for target, fd in enumerate(fds):
+        os.dup2(fd, target)
+        os.close(fd)
+
+    env = request.get("env") or {}
+
+    if isolate_env:
+        os.environ.clear()
+
+    os.environ.update(env)
+    cwd = request.get("cwd")
+
+    if cwd:
+        os.chdir(cwd)
+
+    sys.argv[1:] = request.get("args") or []
+
+    try:
+        cli.main(args=sys.argv[1:], prog_name=prog_name, standalone_mode=True, **extra)
+    except SystemExit as e:
+        code = e.code
+    except BaseException:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    else:
+        code = 0
+
+    if code is None:
+        code = 0
+    elif not isinstance(code, int):
+        print(code, file=sys.stderr)
+        code = 1
+
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+
+    return code
+
+
+def serve(
+    cli: Command,
+    path: str | os.PathLike[str],
+    *,
+    prog_name: str | None = None,
+    max_concurrency: int = 8,
+    isolate_env: bool = True,
+    backlog: int = 64,
+    **extra: t.Any,
+) -> None:
+    """Listen on a Unix socket and run ``cli`` once for every request
+    sent by :func:`call`. This blocks until the process is interrupted
+    or terminated.
+
+    Every request is run in a worker process forked from the server, and
+    uses :meth:`Command.main <click.Command.main>` in standalone mode, so
+    each invocation has its own :class:`~click.Context` and exit code.
+
+    The socket is created so that only the current user can connect to
+    it, and is removed when the server stops.
+
+    :param cli: The command to run.
+    :param path: File system path of the Unix socket to listen on. An
+        existing socket at this path is replaced.
+    :param prog_name: The program name to use. Defaults to detecting it
+        from ``sys.argv[0]`` of the server.
+    :param max_concurrency: The maximum number of requests handled at
+        the same time. Further connections wait until a worker exits.
+    :param isolate_env: Replace the worker's environment with the
+        client's environment. If disabled, the client's environment is
+        applied on top of the server's environment.
+    :param backlog: The number of connections that can be queued.
+    :param extra: Extra keyword arguments are forwarded to the context
+        constructor. See :class:`~click.Context` for more information.
+        Requests always run in standalone mode with the client's
+        arguments, so ``args`` and ``standalone_mode`` can't be passed.
+
+    .. versionadded:: 8.4
+    """
+    for name in ("args", "standalone_mode"):
+        if name in extra:
+            raise TypeError(f"serve() got an unexpected keyword argument {name!r}")
+
+    _check_supported()
+
+    if max_concurrency < 1:
+        raise ValueError("'max_concurrency' must be at least 1.")
+
+    if prog_name is None:
+        from .utils import _detect_program_name
+
+        prog_name = _detect_program_name()
+
+    import signal
+
+    path = os.fspath(path)
+
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(old_umask)
+
+    sock.listen(backlog)
+    workers: set[int] = set()
+
+    def _reap(block: bool) -> None:
+        while workers:
+            try:
+                pid, _ = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                workers.clear()
+                return
+
+            if pid == 0:
+                return
+
+            workers.discard(pid)
+
+            if block:
+                return
+
+    def _terminate(signum: int, frame: t.Any) -> None:
+        raise KeyboardInterrupt
+
+    old_handler = signal.signal(signal.SIGTERM, _terminate)
+
+    try:
+        while True:
+            _reap(block=False)
+
+            while len(workers) >= max_concurrency:
+                _reap(block=True)
+
+            conn, _ = sock.accept()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+
+            if pid == 0:
+                code = 1
+
+                try:
+                    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                    sock.close()
+                    code = _run_request(cli, conn, prog_name, isolate_env, extra)
+                    conn.sendall(_EXIT_CODE.pack(code))
+                finally:
+                    os._exit(code)
+
+            conn.close()
+            workers.add(pid)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, old_handler)
+        sock.close()
+
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+        while workers:
+            _reap(block=True)
+
+
+def call(
+    path: str | os.PathLike[str],
+    args: cabc.Sequence[str] | None = None,
+    *,
+    env: cabc.Mapping[str, str] | None = None,
+    cwd: str | os.PathLike[str] | None = None,
+    stdin: t.IO[t.Any] | int | None = None,
+    stdout: t.IO[t.Any] | int | None = None,
+    stderr: t.IO[t.Any] | int | None = None,
+) -> int:
+    """Run a command in the server listening at ``path`` and return its
+    exit code. The server uses the given streams directly, so output is
+    written as the command runs.
+
+    :param path: File system path of the server's Unix socket.
+    :param args: The command line arguments. Defaults to
+        ``sys.argv[1:]``.
+    :param env: The environment of the invocation. Defaults to
+        ``os.environ``.
+    :param cwd: The working directory of the invocation. Defaults to the
+        current working directory.
+    :param stdin: File object or descriptor to use as standard input.
+        Defaults to ``sys.stdin``.
+    :param stdout: File object or descriptor to use as standard output.
+        Defaults to ``sys.stdout``.
+    :param stderr: File object or descriptor to use as standard error.
+        Defaults to ``sys.stderr``.
+
+    .. versionadded:: 8.4
+    """
+    _check_supported()
+
+    if args is None:
+        args = sys.argv[1:]
+
+    if env is None:
+        env = os.environ
+
+    if cwd is None:
+        cwd = os.getcwd()
+
+    fds = []
+
+    for stream, default in ((stdin, 0), (stdout, 1), (stderr, 2)):
+        if stream is None:
+            fds.append(default)
+        elif isinstance(stream, int):
+            fds.append(stream)
+        else:
+            stream.flush()
+            fds.append(stream.fileno())
+
+    payload = json.dumps(
+        {"args": list(args), "env": dict(env), "cwd": os.fspath(cwd)}
+    ).encode()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(os.fspath(path))
+        socket.send_fds(sock, [_LENGTH.pack(len(payload)) + payload], fds)
+        response = _recv_exactly(sock, _EXIT_CODE.size)
+
+    (code,) = _EXIT_CODE.unpack(response)
+    return t.cast(int, code)
+
+
+def main(argv: cabc.Sequence[str] | None = None) -> t.NoReturn:
+    """Entry point of the client shim, run as
+    ``python -m click.server SOCKET [ARGS]...``.
+
+    .. versionadded:: 8.4
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if not argv:
+        print("Usage: python -m click.server SOCKET [ARGS]...", file=sys.stderr)
+        sys.exit(2)
+
+    sys.exit(call(argv[0], argv[1:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -51,6 +51,10 @@ def shell_complete(
         echo(comp.complete())
         return 0
 
+    if instruction == "static_source":
+        echo(comp.static_source())
+        return 0
+
     return 1
 
 
@@ -196,6 +200,99 @@ complete --no-files --command %(prog_name)s --arguments \
 "(%(complete_func)s)";
 """
 
+# The static script below is appended to the part of the dynamic script
+# that defines the completion function, which is called for anything that
+# needs to run the program. The tables are filled in from ``_StaticTree``.
+# Each command in the tree is numbered, and the tables map to:
+#
+# C: node -> visible subcommands       N: "node name" -> subcommand node
+# O: node -> visible option names      V: "node option" -> "nargs kind"
+# P: "node index" or "node +" -> kind  K: "node option" or "node index"
+#                                         -> choices
+# D: node -> 1 if the command can only be completed dynamically
+_STATIC_BASH = """\
+%(complete_func)s_static() {
+    local -A C=(%(commands)s)
+    local -A N=(%(children)s)
+    local -A O=(%(options)s)
+    local -A V=(%(values)s)
+    local -A P=(%(positions)s)
+    local -A K=(%(choices)s)
+    local -A D=(%(dynamic)s)
+    local cur=${COMP_WORDS[COMP_CWORD]}
+    local node=0 pos=0 skip=0 key= spec= word value i
+
+    for ((i = 1; i < COMP_CWORD; i++)); do
+        word=${COMP_WORDS[i]}
+
+        if [[ -n ${D[$node]} || $word == -- ]]; then
+            %(complete_func)s "$@"
+            return
+        fi
+
+        # Bash splits "--name=value" into three words.
+        if [[ $word == = ]]; then
+            continue
+        elif ((skip > 0)); then
+            ((skip--))
+        elif [[ $word == -* ]]; then
+            key="$node ${word%%%%=*}"
+            value=${V[$key]}
+
+            if [[ -n $value ]]; then
+                skip=${value%%%% *}
+                spec=${value#* }
+                [[ $word == *=* ]] && ((skip--))
+            fi
+        elif [[ -n ${N["$node $word"]} && -z ${P["$node $pos"]} ]]; then
+            node=${N["$node $word"]}
+            pos=0
+        else
+            ((pos++))
+        fi
+    done
+
+    [[ $cur == = ]] && cur=
+
+    if [[ -n ${D[$node]} || $cur == -*=* ]]; then
+        %(complete_func)s "$@"
+        return
+    fi
+
+    if [[ $cur == -* ]]; then
+        COMPREPLY=($(compgen -W "${O[$node]}" -- "$cur"))
+        return
+    fi
+
+    if ((skip == 0)); then
+        key="$node $pos"
+        spec=${P[$key]}
+
+        if [[ -z $spec ]]; then
+            key="$node +"
+            spec=${P[$key]}
+        fi
+    fi
+
+    case $spec in
+        choice) COMPREPLY=($(compgen -W "${K[$key]}" -- "$cur")) ;;
+        file)
+            COMPREPLY=()
+            compopt -o default
+            ;;
+        dir)
+            COMPREPLY=()
+            compopt -o dirnames
+            ;;
+        dynamic) %(complete_func)s "$@" ;;
+        plain) COMPREPLY=() ;;
+        *) COMPREPLY=($(compgen -W "${C[$node]}" -- "$cur")) ;;
+    esac
+}
+
+complete -o nosort -F %(complete_func)s_static %(prog_name)s
+"""
+
 
 class ShellComplete:
     """Base class for providing shell completion support. A subclass for
@@ -261,6 +358,21 @@ class ShellComplete:
         """
         return self.source_template % self.source_vars()
 
+    def static_source(self) -> str:
+        """Produce a completion script that completes the parts of the
+        command tree that don't change without running the program, such
+        as subcommand names, option names, choices, and paths. It falls
+        back to the dynamic completion of :meth:`source` for the rest,
+        such as parameters with a custom ``shell_complete`` function. The
+        script must be generated again when the CLI changes.
+
+        By default this returns :meth:`source`, for shells that don't
+        have a static script. Only Bash has one.
+
+        .. versionadded:: 8.4
+        """
+        return self.source()
+
     def get_completion_args(self) -> tuple[list[str], str]:
         """Use the env vars defined by the shell script to return a
         tuple of ``args, incomplete``. This must be implemented by
@@ -277,8 +389,16 @@ class ShellComplete:
         :param incomplete: Value being completed. May be empty.
         """
         ctx = _resolve_context(self.cli, self.ctx_args, self.prog_name, args)
-        obj, incomplete = _resolve_incomplete(ctx, args, incomplete)
-        return obj.shell_complete(ctx, incomplete)
+        obj, obj_incomplete = _resolve_incomplete(ctx, args.copy(), incomplete)
+
+        # Custom completions may use the values of other parameters.
+        if _has_custom_completion(obj):
+            ctx = _resolve_context(
+                self.cli, self.ctx_args, self.prog_name, args, process_values=True
+            )
+            obj, obj_incomplete = _resolve_incomplete(ctx, args, incomplete)
+
+        return obj.shell_complete(ctx, obj_incomplete)
 
     def format_completion(self, item: CompletionItem) -> str:
         """Format a completion item into the form recognized by the
@@ -344,6 +464,17 @@ class BashComplete(ShellComplete):
         self._check_version()
         return super().source()
 
+    def static_source(self) -> str:
+        source, _, _ = self.source().partition(f"{self.func_name}_setup()")
+        tables = _StaticTree(self.cli, self.ctx_args, self.prog_name).tables()
+        table_vars = {
+            name: " ".join(
+                f"[{_posix_quote(k)}]={_posix_quote(v)}" for k, v in table.items()
+            )
+            for name, table in tables.items()
+        }
+        return source + _STATIC_BASH % {**self.source_vars(), **table_vars}
+
     def get_completion_args(self) -> tuple[list[str], str]:
         cwords = split_arg_string(os.environ["COMP_WORDS"])
         cword = int(os.environ["COMP_CWORD"])
@@ -559,22 +690,60 @@ def _is_incomplete_option(ctx: Context, args: list[str], param: Parameter) -> bo
     return last_option is not None and last_option in param.opts
 
 
+def _make_root_context(
+    cli: Command,
+    prog_name: str,
+    args: list[str],
+    ctx_args: cabc.MutableMapping[str, t.Any],
+) -> Context:
+    """Like :meth:`Command.make_context`, but the context and its children
+    are marked as resolving completion. The values of commands that can't
+    observe them are only recorded, without processing them. Groups
+    process their values as usual. A command that overrides
+    ``make_context`` uses its own.
+    """
+    if type(cli).make_context is not Command.make_context:
+        return cli.make_context(prog_name, args, **ctx_args)
+
+    extra = {**cli.context_settings, **ctx_args}
+    ctx = cli.context_class(cli, info_name=prog_name, **extra)
+    ctx._completion_only = True
+
+    with ctx.scope(cleanup=False):
+        cli.parse_args(ctx, args)
+
+    return ctx
+
+
 def _resolve_context(
     cli: Command,
     ctx_args: cabc.MutableMapping[str, t.Any],
     prog_name: str,
     args: list[str],
+    process_values: bool = False,
 ) -> Context:
     """Produce the context hierarchy starting with the command and
     traversing the complete arguments. This only follows the commands,
     it doesn't trigger input prompts or callbacks.
 
+    Parameter values are recorded as given, without converting them or
+    calling callbacks, unless ``process_values`` is enabled.
+
     :param cli: Command being called.
     :param prog_name: Name of the executable in the shell.
     :param args: List of complete args before the incomplete value.
+    :param process_values: Process parameter values the same as when
+        invoking the command. Needed by custom completions, which may
+        use the values of other parameters.
     """
     ctx_args["resilient_parsing"] = True
-    with cli.make_context(prog_name, args.copy(), **ctx_args) as ctx:
+
+    if process_values:
+        root = cli.make_context(prog_name, args.copy(), **ctx_args)
+    else:
+        root = _make_root_context(cli, prog_name, args.copy(), ctx_args)
+
+    with root as ctx:
         args = ctx._protected_args + ctx.args
 
         while args:
@@ -620,6 +789,34 @@ def _resolve_context(
     return ctx
 
 
+def _has_custom_completion(obj: Command | Parameter) -> bool:
+    """Check if the object completes values with something other than
+    Click's built-in completions, which don't use parameter values.
+    """
+    if isinstance(obj, Parameter):
+        from .types import Choice
+        from .types import File
+        from .types import ParamType
+        from .types import Path
+
+        return (
+            obj._custom_shell_complete is not None
+            or type(obj).shell_complete is not Parameter.shell_complete
+            or type(obj.type).shell_complete
+            not in {
+                ParamType.shell_complete,
+                Choice.shell_complete,
+                File.shell_complete,
+                Path.shell_complete,
+            }
+        )
+
+    return type(obj).shell_complete not in {
+        Command.shell_complete,
+        Group.shell_complete,
+    }
+
+
 def _resolve_incomplete(
     ctx: Context, args: list[str], incomplete: str
 ) -> tuple[Command | Parameter, str]:
@@ -665,3 +862,214 @@ def _resolve_incomplete(
     # There were no unparsed arguments, the command may be a group that
     # will provide command name completions.
     return ctx.command, incomplete
+
+
+# Values that the static scripts can list without quoting or being split
+# into separate words by the shell.
+_static_word = re.compile(r"[\w.,@%+/-]+").fullmatch
+
+
+def _one_line(text: str | None) -> str:
+    return " ".join(text.split()) if text else ""
+
+
+def _static_value(param: Parameter) -> tuple[str, list[str]]:
+    """Describe how the static scripts complete a parameter's values.
+    Returns the kind of completion, ``"plain"``, ``"choice"``, ``"file"``,
+    ``"dir"``, or ``"dynamic"``, and the choices for ``"choice"``.
+    """
+    from .types import Choice
+    from .types import File
+    from .types import ParamType
+    from .types import Path
+
+    if (
+        param._custom_shell_complete is not None
+        or type(param).shell_complete is not Parameter.shell_complete
+    ):
+        return "dynamic", []
+
+    method = type(param.type).shell_complete
+
+    if method is ParamType.shell_complete:
+        return "plain", []
+
+    if method is Choice.shell_complete:
+        choice_type = t.cast("Choice[t.Any]", param.type)
+        choices = [str(c) for c in choice_type.choices]
+
+        if choice_type.case_sensitive and all(_static_word(c) for c in choices):
+            return "choice", choices
+
+    elif method is File.shell_complete:
+        return "file", []
+
+    elif method is Path.shell_complete:
+        path_type = t.cast(Path, param.type)
+        return "dir" if path_type.dir_okay and not path_type.file_okay else "file", []
+
+    return "dynamic", []
+
+
+class _StaticTree:
+    """The parts of a command tree that can be completed without running
+    the program, used to generate static completion scripts. Commands are
+    numbered in the order they are visited, starting with ``0`` for the
+    CLI. Commands and values that need to run the program are marked
+    dynamic, and the scripts fall back to dynamic completion for them.
+    See the ``_STATIC_BASH`` template for what each table holds.
+
+    Every group in the tree lists and loads its commands.
+    """
+
+    def __init__(
+        self,
+        cli: Command,
+        ctx_args: cabc.MutableMapping[str, t.Any],
+        prog_name: str,
+    ) -> None:
+        self.commands: dict[str, list[tuple[str, str]]] = {}
+        self.children: dict[str, str] = {}
+        self.options: dict[str, list[tuple[str, str]]] = {}
+        self.values: dict[str, str] = {}
+        self.positions: dict[str, str] = {}
+        self.choices: dict[str, list[str]] = {}
+        self.dynamic: set[str] = set()
+        self._count = 0
+        ctx = cli.context_class(
+            cli,
+            info_name=prog_name,
+            **{**cli.context_settings, **ctx_args, "resilient_parsing": True},
+        )
+        self._add(ctx, ())
+
+    def _add(self, ctx: Context, seen: tuple[Command, ...]) -> None:
+        node = str(self._count)
+        self._count += 1
+        command = ctx.command
+
+        if not self._add_params(ctx, node) or command in seen:
+            self.dynamic.add(node)
+            return
+
+        if not isinstance(command, Group):
+            return
+
+        items = []
+
+        for name in command.list_commands(ctx):
+            sub = command.get_command(ctx, name)
+
+            if sub is None:
+                continue
+
+            if not _static_word(name):
+                self.dynamic.add(node)
+                return
+
+            if not sub.hidden:
+                items.append((name, sub.get_short_help_str()))
+
+            self.children[f"{node} {name}"] = str(self._count)
+            sub_ctx = sub.context_class(
+                sub,
+                info_name=name,
+                parent=ctx,
+                **{**sub.context_settings, "resilient_parsing": True},
+            )
+            self._add(sub_ctx, (*seen, command))
+
+        self.commands[node] = items
+
+    def _add_params(self, ctx: Context, node: str) -> bool:
+        """Add the parameters of the command. Returns ``False`` if the
+        command's arguments can't be followed without running it.
+        """
+        command = ctx.command
+        cls = type(command)
+
+        if isinstance(command, Group):
+            if (
+                cls.shell_complete is not Group.shell_complete
+                or command.chain
+                or command.allow_abbreviations
+            ):
+                return False
+        elif (
+            cls.shell_complete is not Command.shell_complete
+            or not ctx.allow_interspersed_args
+        ):
+            return False
+
+        if ctx.token_normalize_func is not None:
+            return False
+
+        options: list[tuple[str, str]] = []
+        index = 0
+        variadic = False
+
+        for param in command.get_params(ctx):
+            kind, choices = _static_value(param)
+
+            if isinstance(param, Option):
+                names = [*param.opts, *param.secondary_opts]
+
+                if param._flag_needs_value or not all(
+                    name[0] == "-" and _static_word(name) for name in names
+                ):
+                    return False
+
+                if not param.hidden:
+                    options.extend((name, _one_line(param.help)) for name in names)
+
+                if not (param.is_flag or param.count):
+                    for name in param.opts:
+                        self.values[f"{node} {name}"] = f"{param.nargs} {kind}"
+                        self.choices[f"{node} {name}"] = choices
+            elif isinstance(param, Argument):
+                # Only a final variadic argument can be followed, and
+                # groups pass remaining arguments to subcommands.
+                if variadic:
+                    return False
+
+                if param.nargs == -1:
+                    if isinstance(command, Group):
+                        return False
+
+                    variadic = True
+                    keys = [f"{node} +"]
+                else:
+                    keys = [f"{node} {index + i}" for i in range(param.nargs)]
+                    index += param.nargs
+
+                for key in keys:
+                    self.positions[key] = kind
+                    self.choices[key] = choices
+            else:
+                return False
+
+        self.options[node] = options
+        return True
+
+    def tables(self) -> dict[str, dict[str, str]]:
+        """Get the tables used by the static script template, with each
+        value as a string. Subcommands and options are listed by name,
+        separated by spaces.
+        """
+
+        def listing(items: list[tuple[str, str]]) -> str:
+            return " ".join(name for name, _ in items)
+
+        return {
+            "commands": {k: listing(v) for k, v in self.commands.items()},
+            "children": self.children,
+            "options": {k: listing(v) for k, v in self.options.items()},
+            "values": self.values,
+            "positions": self.positions,
+            "choices": {k: " ".join(v) for k, v in self.choices.items() if v},
+            "dynamic": dict.fromkeys(self.dynamic, "1"),
+        }
+
+
+def _posix_quote(value: str) -> str:
+    return "'{}'".format(value.replace("'", "'\\''"))
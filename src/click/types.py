@@ -13,6 +13,7 @@ from gettext import ngettext
 from ._compat import _get_argv_encoding
 from ._compat import open_stream
 from .exceptions import BadParameter
+from .utils import _FilePool
 from .utils import format_filename
 from .utils import LazyFile
 from .utils import safecall
@@ -123,6 +124,28 @@ class ParamType:
         """
         return value
 
+    def convert_many(
+        self,
+        values: cabc.Sequence[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> cabc.Iterable[t.Any]:
+        """Convert all the values given to a parameter with ``nargs=-1``
+        or ``multiple=True``, and return them, usually as a tuple. By
+        default, each value is converted by calling the type. Override
+        this to convert values together, if that is faster than one at a
+        time.
+
+        :param values: The values to convert.
+        :param param: The parameter that is using this type to convert
+            its values. May be ``None``.
+        :param ctx: The current context that arrived at these values. May
+            be ``None``.
+
+        .. versionadded:: 8.4
+        """
+        return tuple(self(value, param, ctx) for value in values)
+
     def split_envvar_value(self, rv: str) -> cabc.Sequence[str]:
         """Given a value from an environment variable this splits it up
         into small chunks depending on the defined envvar list splitter.
@@ -471,6 +494,25 @@ class DateTime(ParamType):
 
 class _NumberParamTypeBase(ParamType):
     _number_class: t.ClassVar[type[t.Any]]
+    #: The :mod:`array` type code for ``container="array"``.
+    _typecode: t.ClassVar[str]
+    container: t.Literal["tuple", "array", "numpy"] = "tuple"
+
+    def __init__(
+        self, container: t.Literal["tuple", "array", "numpy"] = "tuple"
+    ) -> None:
+        if container not in ("tuple", "array", "numpy"):
+            raise ValueError("'container' must be 'tuple', 'array', or 'numpy'.")
+
+        if container == "numpy":
+            import importlib.util
+
+            # Find it without importing it, which is slow, so a missing
+            # install fails when the parameter is defined.
+            if importlib.util.find_spec("numpy") is None:
+                raise RuntimeError("NumPy must be installed to use container='numpy'.")
+
+        self.container = container
 
     def convert(
         self, value: t.Any, param: Parameter | None, ctx: Context | None
@@ -486,6 +528,78 @@ class _NumberParamTypeBase(ParamType):
                 ctx,
             )
 
+    def convert_many(
+        self,
+        values: cabc.Sequence[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> cabc.Iterable[t.Any]:
+        """Convert all the values at once, then check them at once, which
+        is much faster than one at a time for many values. The values are
+        returned in the :attr:`container` type. If no values are given,
+        an empty tuple is returned.
+        """
+        if not values:
+            return ()
+
+        convert = type(self).convert
+
+        if (
+            convert is not _NumberParamTypeBase.convert
+            and convert is not _NumberRangeBase.convert
+        ):
+            # A subclass changed how values are converted.
+            rv = tuple(self(value, param, ctx) for value in values)
+        else:
+            try:
+                rv = tuple(map(self._number_class, values))
+            except Exception:
+                # Convert one at a time to fail for the invalid value, or
+                # pass through values such as None that aren't converted.
+                rv = tuple(self(value, param, ctx) for value in values)
+            else:
+                rv = self._check_many(rv, param, ctx)
+
+        if self.container == "tuple":
+            return rv
+
+        if self.container == "array":
+            import array
+
+            try:
+                return array.array(self._typecode, rv)
+            except OverflowError:
+                self.fail(
+                    _("{value} is too large to store in an array.").format(
+                        value=max(rv, key=abs)
+                    ),
+                    param,
+                    ctx,
+                )
+
+        import numpy
+
+        try:
+            result: cabc.Iterable[t.Any] = numpy.array(
+                rv, dtype=numpy.dtype(self._typecode)
+            )
+        except OverflowError:
+            self.fail(
+                _("{value} is too large to store in an array.").format(
+                    value=max(rv, key=abs)
+                ),
+                param,
+                ctx,
+            )
+
+        return result
+
+    def _check_many(
+        self, values: tuple[t.Any, ...], param: Parameter | None, ctx: Context | None
+    ) -> tuple[t.Any, ...]:
+        """Check the converted values, and return the valid values."""
+        return values
+
 
 class _NumberRangeBase(_NumberParamTypeBase):
     def __init__(
@@ -495,7 +609,9 @@ class _NumberRangeBase(_NumberParamTypeBase):
         min_open: bool = False,
         max_open: bool = False,
         clamp: bool = False,
+        container: t.Literal["tuple", "array", "numpy"] = "tuple",
     ) -> None:
+        super().__init__(container=container)
         self.min = min
         self.max = max
         self.min_open = min_open
@@ -544,6 +660,28 @@ class _NumberRangeBase(_NumberParamTypeBase):
 
         return rv
 
+    def _check_many(
+        self, values: tuple[t.Any, ...], param: Parameter | None, ctx: Context | None
+    ) -> tuple[t.Any, ...]:
+        # Compare only the smallest and largest values to the bounds. If
+        # either is NaN, min and max can't be used to find them.
+        low = min(values)
+        high = max(values)
+
+        if low == low and high == high:
+            in_min = self.min is None or (
+                low > self.min if self.min_open else low >= self.min
+            )
+            in_max = self.max is None or (
+                high < self.max if self.max_open else high <= self.max
+            )
+
+            if in_min and in_max:
+                return values
+
+        # Clamp or fail one value at a time.
+        return tuple(self.convert(value, param, ctx) for value in values)
+
     def _clamp(self, bound: float, dir: t.Literal[1, -1], open: bool) -> float:
         """Find the valid value to clamp to bound in the given
         direction.
@@ -576,6 +714,7 @@ class _NumberRangeBase(_NumberParamTypeBase):
 class IntParamType(_NumberParamTypeBase):
     name = "integer"
     _number_class = int
+    _typecode = "q"
 
     def __repr__(self) -> str:
         return "INT"
@@ -592,6 +731,14 @@ class IntRange(_NumberRangeBase, IntParamType):
     If ``clamp`` is enabled, a value outside the range is clamped to the
     boundary instead of failing.
 
+    The values of a parameter with ``nargs=-1`` or ``multiple=True`` are
+    returned as a tuple, or with ``container`` set to ``"array"`` or
+    ``"numpy"``, as an :class:`array.array` or a NumPy array of 64-bit
+    integers.
+
+    .. versionchanged:: 8.4
+        Added the ``container`` parameter.
+
     .. versionchanged:: 8.0
         Added the ``min_open`` and ``max_open`` parameters.
     """
@@ -610,6 +757,7 @@ class IntRange(_NumberRangeBase, IntParamType):
 class FloatParamType(_NumberParamTypeBase):
     name = "float"
     _number_class = float
+    _typecode = "d"
 
     def __repr__(self) -> str:
         return "FLOAT"
@@ -627,6 +775,14 @@ class FloatRange(_NumberRangeBase, FloatParamType):
     boundary instead of failing. This is not supported if either
     boundary is marked ``open``.
 
+    The values of a parameter with ``nargs=-1`` or ``multiple=True`` are
+    returned as a tuple, or with ``container`` set to ``"array"`` or
+    ``"numpy"``, as an :class:`array.array` or a NumPy array of 64-bit
+    floats.
+
+    .. versionchanged:: 8.4
+        Added the ``container`` parameter.
+
     .. versionchanged:: 8.0
         Added the ``min_open`` and ``max_open`` parameters.
     """
@@ -640,9 +796,15 @@ class FloatRange(_NumberRangeBase, FloatParamType):
         min_open: bool = False,
         max_open: bool = False,
         clamp: bool = False,
+        container: t.Literal["tuple", "array", "numpy"] = "tuple",
     ) -> None:
         super().__init__(
-            min=min, max=max, min_open=min_open, max_open=max_open, clamp=clamp
+            min=min,
+            max=max,
+            min_open=min_open,
+            max_open=max_open,
+            clamp=clamp,
+            container=container,
         )
 
         if (min_open or max_open) and clamp:
@@ -773,10 +935,40 @@ class File(ParamType):
     Files can also be opened atomically in which case all writes go into a
     separate file in the same folder and upon completion the file will
     be moved over to the original location.  This is useful if a file
-    regularly read by other users is modified.
+    regularly read by other users is modified. If the command fails, the
+    original file is left unchanged. The ``durability`` parameter controls
+    how the file is flushed to disk before replacing the original:
+    ``"none"`` leaves it to the operating system, ``"file"`` syncs the
+    written file, and ``"dir"`` also syncs its directory after replacing.
+
+    The ``buffering`` parameter sets the buffer size of files, the same as
+    for :func:`open`. A binary file opened with ``0`` is unbuffered, so
+    ``readinto`` reads directly into the given buffer. Standard streams keep
+    their own buffering.
+
+    The ``compression`` parameter decompresses the file when reading, or
+    compresses it when writing, including atomic files. It's one of
+    ``"gzip"``, ``"bz2"``, ``"xz"``, or ``"zstd"``, which needs Python
+    3.14 or the ``zstandard`` library. With ``"auto"``, the format is
+    detected from the first bytes of the file when reading, or from its
+    extension when writing, and other files are opened as-is. With
+    ``threaded``, the file is decompressed in a background thread while
+    the data that has been read is used.
+
+    The ``max_open`` parameter limits how many lazy files opened for
+    writing are open at once, for commands that write to many files with
+    ``multiple=True`` or ``nargs=-1``. When another file is opened, the
+    least recently used one is closed, and it's opened again without
+    truncating it when it's written to next. An atomic file is only
+    closed, its target is replaced once the command finishes.
 
     See :ref:`file-args` for more information.
 
+    .. versionchanged:: 8.4
+        Added the ``durability``, ``buffering``, ``compression``,
+        ``threaded``, and ``max_open`` parameters. An atomic file is
+        discarded if the command fails.
+
     .. versionchanged:: 2.0
         Added the ``atomic`` parameter.
     """
@@ -791,12 +983,35 @@ class File(ParamType):
         errors: str | None = "strict",
         lazy: bool | None = None,
         atomic: bool = False,
+        durability: t.Literal["none", "file", "dir"] = "none",
+        buffering: int = -1,
+        compression: str | None = None,
+        threaded: bool = False,
+        max_open: int | None = None,
     ) -> None:
+        if max_open is not None and max_open < 1:
+            raise ValueError("'max_open' must be at least 1.")
+
+        if compression is not None and compression != "auto":
+            from ._compression import FORMATS
+
+            if compression not in FORMATS:
+                raise ValueError(
+                    "'compression' must be 'auto' or one of"
+                    f" {', '.join(sorted(FORMATS))}."
+                )
+
         self.mode = mode
         self.encoding = encoding
         self.errors = errors
         self.lazy = lazy
         self.atomic = atomic
+        self.durability = durability
+        self.buffering = buffering
+        self.compression = compression
+        self.threaded = threaded
+        self.max_open = max_open
+        self._pool = _FilePool(max_open) if max_open is not None else None
 
     def to_info_dict(self) -> dict[str, t.Any]:
         info_dict = super().to_info_dict()
@@ -828,16 +1043,38 @@ class File(ParamType):
 
             if lazy:
                 lf = LazyFile(
-                    value, self.mode, self.encoding, self.errors, atomic=self.atomic
+                    value,
+                    self.mode,
+                    self.encoding,
+                    self.errors,
+                    atomic=self.atomic,
+                    durability=self.durability,
+                    buffering=self.buffering,
+                    compression=self.compression,
+                    threaded=self.threaded,
                 )
+                lf._pool = self._pool
 
                 if ctx is not None:
-                    ctx.call_on_close(lf.close_intelligently)
+                    # An atomic file sees if the command failed, to discard
+                    # the written file.
+                    if self.atomic:
+                        ctx.with_resource(lf)
+                    else:
+                        ctx.call_on_close(lf.close_intelligently)
 
                 return t.cast("t.IO[t.Any]", lf)
 
             f, should_close = open_stream(
-                value, self.mode, self.encoding, self.errors, atomic=self.atomic
+                value,
+                self.mode,
+                self.encoding,
+                self.errors,
+                atomic=self.atomic,
+                durability=self.durability,
+                buffering=self.buffering,
+                compression=self.compression,
+                threaded=self.threaded,
             )
 
             # If a context is provided, we automatically close the file
@@ -846,7 +1083,9 @@ class File(ParamType):
             # properly close the file.  This for instance happens when the
             # type is used with prompts.
             if ctx is not None:
-                if should_close:
+                if should_close and self.atomic:
+                    ctx.with_resource(f)
+                elif should_close:
                     ctx.call_on_close(safecall(f.close))
                 else:
                     ctx.call_on_close(safecall(f.flush))
@@ -872,10 +1111,250 @@ class File(ParamType):
         return [CompletionItem(incomplete, type="file")]
 
 
+class MappedFile(File):
+    """Declares a parameter to be a file that is memory mapped for reading
+    binary data. Instead of a stream, the value is a read-only
+    :class:`mmap.mmap`, which supports ``read``, ``seek``, slicing, and
+    the buffer protocol, so ``memoryview(value)`` accesses the data
+    without copying it. The map is closed once the context tears down.
+
+    The special value ``-`` for stdin, and files that can't be mapped
+    such as pipes, devices, and empty files, are opened as a binary stream
+    instead, the same as ``File("rb")``. Use ``isinstance(value, mmap.mmap)``
+    to check which was returned.
+
+    Keep any ``memoryview`` of the map only while the command runs, the
+    map can't be closed while one exists.
+
+    .. versionadded:: 8.4
+    """
+
+    def __init__(self) -> None:
+        super().__init__(mode="rb", lazy=False)
+
+    def convert(
+        self,
+        value: str | os.PathLike[str] | t.IO[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> t.IO[t.Any]:
+        if _is_file_like(value):
+            return super().convert(value, param, ctx)
+
+        value = t.cast("str | os.PathLike[str]", value)
+
+        if os.fspath(value) == "-":
+            return super().convert(value, param, ctx)
+
+        # Check the type before opening, opening a pipe or device can
+        # block or consume its input.
+        try:
+            st = os.stat(value)
+        except OSError as e:
+            self.fail(f"'{format_filename(value)}': {e.strerror}", param, ctx)
+
+        if not stat.S_ISREG(st.st_mode) or st.st_size == 0:
+            return super().convert(value, param, ctx)
+
+        import mmap
+
+        try:
+            with open(value, "rb") as f:
+                # The map keeps its own handle, the file can be closed.
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as e:
+            self.fail(f"'{format_filename(value)}': {e.strerror}", param, ctx)
+        except ValueError:
+            # The file was emptied after checking it.
+            return super().convert(value, param, ctx)
+
+        if ctx is not None:
+            ctx.call_on_close(safecall(mapped.close))
+
+        return t.cast("t.IO[t.Any]", mapped)
+
+
+class RecordStream(File):
+    """Declares a parameter to be a file that is read as a sequence of
+    records separated by ``separator``. The value is an iterator that
+    produces each record without its separator. The file is closed once
+    the context tears down. The special value ``-`` reads stdin.
+
+    The file is read ``buffer_size`` bytes at a time, and each chunk is
+    split into records at once, which is much faster than reading one line
+    at a time for large inputs. From a pipe, the records are produced as
+    soon as they're available.
+
+    :param separator: The string that separates records, such as ``b"\\n"``
+        or ``b"\\0"``. If it's bytes the records are bytes, otherwise they
+        are decoded strings.
+    :param encoding: The encoding to decode text records with. Defaults to
+        the encoding of stdin for ``-``, otherwise the locale encoding.
+    :param errors: The error handling scheme for decoding.
+    :param buffer_size: The number of bytes to read at a time.
+    :param read_ahead: Read the next chunks in a background thread while
+        the records in the current one are used. This helps when reading
+        is slow and working with the records takes time as well.
+
+    .. versionadded:: 8.4
+    """
+
+    def __init__(
+        self,
+        separator: str | bytes = b"\n",
+        encoding: str | None = None,
+        errors: str | None = "strict",
+        buffer_size: int = 1 << 16,
+        read_ahead: bool = False,
+    ) -> None:
+        if not separator:
+            raise ValueError("'separator' must not be empty.")
+
+        super().__init__(mode="rb", encoding=encoding, errors=errors, lazy=False)
+        self.separator = separator
+        self.buffer_size = buffer_size
+        self.read_ahead = read_ahead
+
+    def convert(  # type: ignore[override]
+        self,
+        value: str | os.PathLike[str] | t.IO[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> cabc.Iterator[t.Any]:
+        from . import _records
+        from ._compat import _find_binary_reader
+
+        f: t.IO[bytes]
+
+        if _is_file_like(value):
+            reader = _find_binary_reader(value)
+
+            if reader is None:
+                message = _("{stream!r} is not a binary stream.").format(stream=value)
+                self.fail(message, param, ctx)
+
+            f = reader
+            close = False
+        else:
+            f = super().convert(value, param, ctx)
+            # Close the file once it's read, or the context closes it.
+            close = os.fspath(t.cast("str | os.PathLike[str]", value)) != "-"
+
+        chunks: cabc.Iterable[t.Any] = _records.iter_chunks(f, self.buffer_size, close)
+        separator = self.separator
+
+        if isinstance(separator, str):
+            encoding = self.encoding
+
+            if encoding is None and value == "-":
+                from ._compat import get_best_encoding
+
+                encoding = get_best_encoding(sys.stdin)
+            elif encoding is None:
+                import locale
+
+                encoding = locale.getpreferredencoding(False)
+
+            chunks = _records.decode_chunks(chunks, encoding, self.errors)
+
+        if self.read_ahead:
+            chunks = _records.read_ahead(chunks, 2)
+
+        return _records.split_records(chunks, separator, self.buffer_size)
+
+
+class LineStream(RecordStream):
+    """Declares a parameter to be a text file that is read as a sequence
+    of lines. The value is an iterator that produces each line without its
+    ``\\n``, a ``\\r`` before it is kept. This is the same as
+    ``RecordStream("\\n")``, see :class:`RecordStream` for the parameters.
+
+    .. versionadded:: 8.4
+    """
+
+    def __init__(
+        self,
+        encoding: str | None = None,
+        errors: str | None = "strict",
+        buffer_size: int = 1 << 16,
+        read_ahead: bool = False,
+    ) -> None:
+        super().__init__(
+            "\n",
+            encoding=encoding,
+            errors=errors,
+            buffer_size=buffer_size,
+            read_ahead=read_ahead,
+        )
+
+
 def _is_file_like(value: t.Any) -> te.TypeGuard[t.IO[t.Any]]:
     return hasattr(value, "read") or hasattr(value, "write")
 
 
+def _realpath(
+    path: str | os.PathLike[str], ctx: Context | None
+) -> str | os.PathLike[str]:
+    if ctx is None:
+        return os.path.realpath(path)
+
+    key = ("realpath", os.fspath(path))
+    rv = ctx._path_cache.get(key)
+
+    if rv is None:
+        rv = ctx._path_cache[key] = os.path.realpath(path)
+
+    return t.cast("str", rv)
+
+
+_ACCESS_MODE_BITS = {
+    os.R_OK: stat.S_IRUSR,
+    os.W_OK: stat.S_IWUSR,
+    os.X_OK: stat.S_IXUSR,
+}
+
+
+def _access(
+    path: str | os.PathLike[str], st: os.stat_result, mode: int, ctx: Context | None
+) -> bool:
+    """Check access like :func:`os.access`, but use the owner's bits of
+    the file mode when they decide it, to avoid another system call.
+    Only denied and readable are decided by them. A read-only or noexec
+    mount can still deny writing or executing. Allowed access is cached
+    for the invocation.
+    """
+    getuid = getattr(os, "getuid", None)
+
+    # The superuser isn't limited by the mode, and other users are also
+    # affected by groups and ACLs.
+    if getuid is not None and st.st_uid == getuid() != 0:
+        if not st.st_mode & _ACCESS_MODE_BITS[mode]:
+            return False
+
+        if mode == os.R_OK:
+            return True
+
+    if ctx is None:
+        return os.access(path, mode)
+
+    key = ("access", os.fspath(path), mode)
+
+    if key in ctx._path_cache:
+        return True
+
+    rv = os.access(path, mode)
+
+    if rv:
+        ctx._path_cache[key] = rv
+
+    return rv
+
+
+#: The number of values at which :meth:`Path.convert_many` checks them
+#: concurrently. Below this, starting threads takes longer than it saves.
+_PARALLEL_PATHS = 64
+
+
 class Path(ParamType):
     """The ``Path`` type is similar to the :class:`File` type, but
     returns the filename instead of an open file. Various checks can be
@@ -898,6 +1377,42 @@ class Path(ParamType):
     :param path_type: Convert the incoming path value to this type. If
         ``None``, keep Python's default, which is ``str``. Useful to
         convert to :class:`pathlib.Path`.
+    :param expand: Expand each value to the paths it refers to. The value
+        is an iterator that finds them as it's used. ``"glob"`` treats the
+        value as a glob pattern, where ``**`` matches any number of
+        directories. ``"recursive"`` expands a directory to every file
+        under it, or every directory if ``file_okay`` is false.
+    :param include: With ``expand``, only produce paths that match one of
+        these glob patterns.
+    :param exclude: With ``expand``, skip paths that match one of these
+        glob patterns, and don't look in directories that do.
+
+    Patterns for ``include`` and ``exclude`` match the name of each path,
+    or the whole path if the pattern contains a separator. With
+    ``"recursive"``, the path is relative to the given directory.
+
+    Expanded paths are not checked for permissions. With ``exists``, a
+    pattern must match at least one path. A required parameter is
+    missing if its values expand to nothing. Expansion doesn't follow
+    symlinks to directories. With ``nargs=-1`` or ``multiple=True``, the
+    value is a single iterator over the paths of all the values.
+
+    With ``nargs=-1`` or ``multiple=True``, many values are checked
+    concurrently in a thread pool, which is faster on network file
+    systems. The first invalid value is reported, as when checking them
+    one at a time. Subclasses that override ``convert`` check values one
+    at a time.
+
+    The results of looking up each path are cached for the invocation,
+    so parameters that refer to the same files only look them up once.
+    Use :meth:`Context.stat` to get the :func:`os.stat` result of a value
+    without looking it up again.
+
+    .. versionchanged:: 8.4
+        Added the ``expand``, ``include``, and ``exclude`` parameters.
+        Many values are checked concurrently. Lookups are cached for the
+        invocation, and the file mode is used to check permissions when
+        possible.
 
     .. versionchanged:: 8.1
         Added the ``executable`` parameter.
@@ -922,7 +1437,13 @@ class Path(ParamType):
         allow_dash: bool = False,
         path_type: type[t.Any] | None = None,
         executable: bool = False,
+        expand: t.Literal["glob", "recursive"] | None = None,
+        include: cabc.Sequence[str] | None = None,
+        exclude: cabc.Sequence[str] | None = None,
     ):
+        if expand not in (None, "glob", "recursive"):
+            raise ValueError("'expand' must be None, 'glob', or 'recursive'.")
+
         self.exists = exists
         self.file_okay = file_okay
         self.dir_okay = dir_okay
@@ -932,6 +1453,9 @@ class Path(ParamType):
         self.resolve_path = resolve_path
         self.allow_dash = allow_dash
         self.type = path_type
+        self.expand = expand
+        self.include = include
+        self.exclude = exclude
 
         if self.file_okay and not self.dir_okay:
             self.name: str = _("file")
@@ -970,17 +1494,30 @@ class Path(ParamType):
         value: str | os.PathLike[str],
         param: Parameter | None,
         ctx: Context | None,
-    ) -> str | bytes | os.PathLike[str]:
+    ) -> str | bytes | os.PathLike[str] | cabc.Iterator[str | bytes | os.PathLike[str]]:
+        if self.expand is not None:
+            paths = self._expand_value(value, param, ctx)
+
+            if (
+                param is not None
+                and param.required
+                and param.nargs == 1
+                and not param.multiple
+            ):
+                return self._require_paths(paths, param, ctx)
+
+            return paths
+
         rv = value
 
         is_dash = self.file_okay and self.allow_dash and rv in (b"-", "-")
 
         if not is_dash:
             if self.resolve_path:
-                rv = os.path.realpath(rv)
+                rv = _realpath(rv, ctx)
 
             try:
-                st = os.stat(rv)
+                st = ctx.stat(rv) if ctx is not None else os.stat(rv)
             except OSError:
                 if not self.exists:
                     return self.coerce_path_result(rv)
@@ -1009,7 +1546,7 @@ class Path(ParamType):
                     ctx,
                 )
 
-            if self.readable and not os.access(rv, os.R_OK):
+            if self.readable and not _access(rv, st, os.R_OK, ctx):
                 self.fail(
                     _("{name} {filename!r} is not readable.").format(
                         name=self.name.title(), filename=format_filename(value)
@@ -1018,7 +1555,7 @@ class Path(ParamType):
                     ctx,
                 )
 
-            if self.writable and not os.access(rv, os.W_OK):
+            if self.writable and not _access(rv, st, os.W_OK, ctx):
                 self.fail(
                     _("{name} {filename!r} is not writable.").format(
                         name=self.name.title(), filename=format_filename(value)
@@ -1027,7 +1564,7 @@ class Path(ParamType):
                     ctx,
                 )
 
-            if self.executable and not os.access(value, os.X_OK):
+            if self.executable and not _access(value, st, os.X_OK, ctx):
                 self.fail(
                     _("{name} {filename!r} is not executable.").format(
                         name=self.name.title(), filename=format_filename(value)
@@ -1038,6 +1575,162 @@ class Path(ParamType):
 
         return self.coerce_path_result(rv)
 
+    def convert_many(
+        self,
+        values: cabc.Sequence[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> cabc.Iterable[t.Any]:
+        # A subclass that overrides convert may not be safe to call from
+        # several threads, only check Path's own conversion concurrently.
+        if len(values) < _PARALLEL_PATHS or type(self).convert is not Path.convert:
+            results = [self(value, param, ctx) for value in values]
+        else:
+            results = self._convert_parallel(values, param, ctx)
+
+        if self.expand is not None:
+            import itertools
+
+            paths = itertools.chain.from_iterable(results)
+
+            if param is not None and param.required:
+                return self._require_paths(paths, param, ctx)
+
+            return paths
+
+        return tuple(results)
+
+    def _convert_parallel(
+        self,
+        values: cabc.Sequence[t.Any],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> list[t.Any]:
+        """Check the values in a thread pool. The first invalid value is
+        reported, the same as checking them in order.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        def check_chunk(chunk: cabc.Sequence[t.Any]) -> list[t.Any]:
+            if ctx is None:
+                return [self(value, param, ctx) for value in chunk]
+
+            # The current context is local to each thread, push it in the
+            # workers so conversions can use get_current_context.
+            with ctx.scope(cleanup=False):
+                return [self(value, param, ctx) for value in chunk]
+
+        # The same bound as the executor's default. Each worker checks a
+        # chunk of values, a task for each value would take longer than
+        # checking it on a local file system.
+        workers = min(32, (os.cpu_count() or 1) + 4)
+        size = -(-len(values) // (workers * 4))
+        chunks = [values[i : i + size] for i in range(0, len(values), size)]
+        executor = ThreadPoolExecutor(workers)
+
+        try:
+            # Results are produced in order, so the first chunk that failed
+            # raises, and the chunks after it that haven't started are
+            # cancelled.
+            return [rv for chunk in executor.map(check_chunk, chunks) for rv in chunk]
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    def _require_paths(
+        self,
+        paths: cabc.Iterator[str | bytes | os.PathLike[str]],
+        param: Parameter,
+        ctx: Context | None,
+    ) -> cabc.Iterator[str | bytes | os.PathLike[str]]:
+        """Fail like a missing value if a required parameter's values
+        expand to nothing.
+        """
+        from . import _expand
+        from .exceptions import MissingParameter
+
+        found, paths = _expand.peek(paths)
+
+        if not found:
+            raise MissingParameter(ctx=ctx, param=param)
+
+        return paths
+
+    def _expand_value(
+        self,
+        value: str | os.PathLike[str],
+        param: Parameter | None,
+        ctx: Context | None,
+    ) -> cabc.Iterator[str | bytes | os.PathLike[str]]:
+        """Check the value, then return an iterator that finds the paths
+        it expands to.
+        """
+        from . import _expand
+
+        if self.file_okay and self.allow_dash and value in (b"-", "-"):
+            return iter((self.coerce_path_result(value),))
+
+        path = os.fsdecode(value)
+
+        if self.expand == "glob":
+            filter = _expand.make_filter(
+                self.file_okay, self.dir_okay, self.include, self.exclude
+            )
+            paths = _expand.iter_glob(path, filter)
+
+            if self.exists:
+                found, paths = _expand.peek(paths)
+
+                if not found:
+                    self.fail(
+                        _("{name} pattern {pattern!r} matches nothing.").format(
+                            name=self.name.title(), pattern=format_filename(value)
+                        ),
+                        param,
+                        ctx,
+                    )
+        else:
+            try:
+                st = ctx.stat(path) if ctx is not None else os.stat(path)
+            except OSError:
+                if not self.exists:
+                    return iter(())
+
+                self.fail(
+                    _("{name} {filename!r} does not exist.").format(
+                        name=self.name.title(), filename=format_filename(value)
+                    ),
+                    param,
+                    ctx,
+                )
+
+            if stat.S_ISDIR(st.st_mode):
+                filter = _expand.make_filter(
+                    self.file_okay,
+                    self.dir_okay and not self.file_okay,
+                    self.include,
+                    self.exclude,
+                )
+                paths = _expand.iter_tree(path, filter)
+            elif self.file_okay:
+                # A file is used as given, even if it doesn't match.
+                paths = iter((path,))
+            else:
+                self.fail(
+                    _("{name} {filename!r} is a file.").format(
+                        name=self.name.title(), filename=format_filename(value)
+                    ),
+                    param,
+                    ctx,
+                )
+
+        if self.resolve_path:
+            paths = map(os.path.realpath, paths)
+
+        if self.type is not None:
+            return map(self.coerce_path_result, paths)
+
+        return paths
+
     def shell_complete(
         self, ctx: Context, param: Parameter, incomplete: str
     ) -> list[CompletionItem]:
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import collections.abc as cabc
+import io
 import os
 import re
 import sys
 import typing as t
+from contextlib import contextmanager
 from functools import update_wrapper
 from types import ModuleType
 from types import TracebackType
@@ -106,11 +108,53 @@ def make_default_short_help(help: str, max_length: int = 45) -> str:
     return " ".join(words[:i]) + "..."
 
 
+class _FilePool:
+    """Keep at most ``max_open`` lazy files open for writing. When another
+    is opened, one that hasn't been used recently is closed, and opened
+    again without truncating it when it's used next. An atomic file is
+    closed without replacing its target until it's used next or closed for
+    good.
+
+    Files are closed in the order they were opened, but a file that was
+    used since it was last checked gets a second chance. This avoids
+    reordering the files every time one is used.
+    """
+
+    def __init__(self, max_open: int) -> None:
+        import collections
+
+        self.max_open = max_open
+        self.files: collections.OrderedDict[LazyFile, None] = collections.OrderedDict()
+
+    def opened(self, lf: LazyFile) -> None:
+        files = self.files
+        files[lf] = None
+        # Don't close the file that's about to be used.
+        lf._used = True
+
+        while len(files) > self.max_open:
+            oldest = files.popitem(last=False)[0]
+
+            if oldest._used:
+                oldest._used = False
+                files[oldest] = None
+            else:
+                oldest._evict()
+
+    def closed(self, lf: LazyFile) -> None:
+        self.files.pop(lf, None)
+
+
 class LazyFile:
     """A lazy file works like a regular file but it does not fully open
     the file but it does perform some basic checks early to see if the
     filename parameter does make sense.  This is useful for safely opening
     files for writing.
+
+    .. versionchanged:: 8.4
+        Added the ``durability``, ``buffering``, ``compression``, and
+        ``threaded`` parameters. Exiting a ``with`` block with an error
+        discards an atomic file.
     """
 
     def __init__(
@@ -120,17 +164,38 @@ class LazyFile:
         encoding: str | None = None,
         errors: str | None = "strict",
         atomic: bool = False,
+        durability: t.Literal["none", "file", "dir"] = "none",
+        buffering: int = -1,
+        compression: str | None = None,
+        threaded: bool = False,
     ):
         self.name: str = os.fspath(filename)
         self.mode = mode
         self.encoding = encoding
         self.errors = errors
         self.atomic = atomic
+        self.durability = durability
+        self.buffering = buffering
+        self.compression = compression
+        self.threaded = threaded
         self._f: t.IO[t.Any] | None
         self.should_close: bool
+        # Set by File to limit how many files are open, see _FilePool.
+        self._pool: _FilePool | None = None
+        self._pooled = False
+        self._used = False
+        self._suspended = False
+        self._reopen = False
 
         if self.name == "-":
-            self._f, self.should_close = open_stream(filename, mode, encoding, errors)
+            self._f, self.should_close = open_stream(
+                filename,
+                mode,
+                encoding,
+                errors,
+                compression=compression,
+                threaded=threaded,
+            )
         else:
             if "r" in mode:
                 # Open and close the file in case we're opening it for
@@ -154,20 +219,72 @@ class LazyFile:
         that Click shows.
         """
         if self._f is not None:
+            if self._suspended:
+                self._resume()
+
+            self._used = True
             return self._f
+
+        from ._compat import append_mode
+
         try:
             rv, self.should_close = open_stream(
-                self.name, self.mode, self.encoding, self.errors, atomic=self.atomic
+                self.name,
+                append_mode(self.mode) if self._reopen else self.mode,
+                self.encoding,
+                self.errors,
+                atomic=self.atomic,
+                durability=self.durability,
+                buffering=self.buffering,
+                compression=self.compression,
+                threaded=self.threaded,
             )
         except OSError as e:
             from .exceptions import FileError
 
             raise FileError(self.name, hint=e.strerror) from e
         self._f = rv
+
+        if (
+            self._pool is not None
+            and self.should_close
+            and any(m in self.mode for m in "wax")
+        ):
+            self._pooled = True
+            self._pool.opened(self)
+
         return rv
 
+    def _evict(self) -> None:
+        """Close the file to free its descriptor, it's opened again when
+        it's used next.
+        """
+        f = t.cast("t.Any", self._f)
+
+        if self.atomic:
+            f._suspend()
+            self._suspended = True
+        else:
+            f.close()
+            self._f = None
+            self._reopen = True
+
+    def _resume(self) -> None:
+        t.cast("t.Any", self._f)._resume()
+        self._suspended = False
+        t.cast(_FilePool, self._pool).opened(self)
+
     def close(self) -> None:
         """Closes the underlying file, no matter what."""
+        if self._pooled:
+            t.cast(_FilePool, self._pool).closed(self)
+            self._pooled = False
+
+        if self._suspended:
+            # Open the atomic file again to finish writing it.
+            t.cast("t.Any", self._f)._resume()
+            self._suspended = False
+
         if self._f is not None:
             self._f.close()
 
@@ -187,7 +304,19 @@ class LazyFile:
         exc_value: BaseException | None,
         tb: TracebackType | None,
     ) -> None:
-        self.close_intelligently()
+        from ._compat import _is_clean_exit
+
+        if self.should_close and self._f is not None:
+            if exc_type is None or _is_clean_exit(exc_value):
+                self.close()
+                return
+
+            if self._pooled:
+                t.cast(_FilePool, self._pool).closed(self)
+                self._pooled = False
+
+            # A suspended atomic file is discarded without opening it.
+            self._f.__exit__(exc_type, exc_value, tb)
 
     def __iter__(self) -> cabc.Iterator[t.AnyStr]:
         self.open()
@@ -362,6 +491,10 @@ def open_file(
     errors: str | None = "strict",
     lazy: bool = False,
     atomic: bool = False,
+    durability: t.Literal["none", "file", "dir"] = "none",
+    buffering: int = -1,
+    compression: str | None = None,
+    threaded: bool = False,
 ) -> t.IO[t.Any]:
     """Open a file, with extra behavior to handle ``'-'`` to indicate
     a standard stream, lazy open on write, and atomic write. Similar to
@@ -387,16 +520,58 @@ def open_file(
         mode, the file is temporarily opened to raise access errors
         early, then closed until it is read again.
     :param atomic: Write to a temporary file and replace the given file
-        on close.
+        on close. If a ``with`` block exits with an error, the given file
+        is left unchanged.
+    :param durability: How an atomic file is flushed to disk before
+        replacing the given file. ``"none"`` leaves it to the operating
+        system, ``"file"`` syncs the written file, and ``"dir"`` also syncs
+        its directory after replacing, so the replacement survives a power
+        loss.
+    :param buffering: The buffer size, passed to :func:`open`. ``0``
+        opens a binary file unbuffered, so ``readinto`` reads directly
+        into the given buffer. Not used for standard streams.
+    :param compression: Decompress the file when reading, or compress it
+        when writing. One of ``"gzip"``, ``"bz2"``, ``"xz"``, or
+        ``"zstd"``. ``"auto"`` detects the format from the first bytes
+        of the file when reading, or the extension when writing, and
+        opens other files as-is.
+    :param threaded: Decompress in a background thread while the data
+        that has been read is used.
+
+    .. versionchanged:: 8.4
+        Added the ``durability``, ``buffering``, ``compression``, and
+        ``threaded`` parameters. An atomic file is discarded if a
+        ``with`` block exits with an error.
 
     .. versionadded:: 3.0
     """
     if lazy:
         return t.cast(
-            "t.IO[t.Any]", LazyFile(filename, mode, encoding, errors, atomic=atomic)
+            "t.IO[t.Any]",
+            LazyFile(
+                filename,
+                mode,
+                encoding,
+                errors,
+                atomic=atomic,
+                durability=durability,
+                buffering=buffering,
+                compression=compression,
+                threaded=threaded,
+            ),
         )
 
-    f, should_close = open_stream(filename, mode, encoding, errors, atomic=atomic)
+    f, should_close = open_stream(
+        filename,
+        mode,
+        encoding,
+        errors,
+        atomic=atomic,
+        durability=durability,
+        buffering=buffering,
+        compression=compression,
+        threaded=threaded,
+    )
 
     if not should_close:
         f = t.cast("t.IO[t.Any]", KeepOpenFile(f))
@@ -404,6 +579,200 @@ def open_file(
     return f
 
 
+@contextmanager
+def atomic_batch() -> cabc.Iterator[None]:
+    """Commit several atomic files together. Atomic files opened in the
+    block, with :func:`open_file` or :class:`File`, are written and synced
+    as they're closed, but only replace their targets once the block ends.
+    Files still open at that point are closed first. Each directory is
+    synced once for all its files.
+
+    If the block exits with an error, none of the targets are replaced.
+    A file whose own ``with`` block exits with an error is discarded, and
+    isn't part of the batch even if the error is caught in the block.
+    The targets are replaced one after another, so a crash while doing so
+    can still leave some of them replaced.
+
+    .. code-block:: python
+
+        with click.atomic_batch():
+            with click.open_file("data.json", "w", atomic=True) as f:
+                ...
+
+            with click.open_file("index.json", "w", atomic=True) as f:
+                ...
+
+    A ``File`` parameter that opens files for writing only opens them when
+    they're first written to, which must be in the block for them to be
+    part of the batch. Nested blocks are part of the outermost batch.
+
+    .. versionadded:: 8.4
+    """
+    from ._compat import _atomic_batches
+    from ._compat import _AtomicBatch
+    from ._compat import _is_clean_exit
+
+    stack: list[_AtomicBatch] = _atomic_batches.__dict__.setdefault("stack", [])
+
+    if stack:
+        yield
+        return
+
+    batch = _AtomicBatch()
+    stack.append(batch)
+
+    try:
+        yield
+    except BaseException as e:
+        stack.pop()
+
+        if _is_clean_exit(e):
+            batch.commit()
+        else:
+            batch.discard()
+
+        raise
+
+    stack.pop()
+    batch.commit()
+
+
+def _fileno(stream: t.IO[t.Any]) -> int | None:
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        # io.UnsupportedOperation is both an OSError and a ValueError.
+        return None
+
+
+def _unwrap_stream(stream: t.IO[t.Any]) -> t.IO[t.Any]:
+    """Get the stream behind a lazy or kept open file from :class:`File`."""
+    if isinstance(stream, LazyFile):
+        return stream.open()
+
+    if isinstance(stream, KeepOpenFile):
+        return stream._file
+
+    return stream
+
+
+def _copy_fds(in_fd: int, out_fd: int, size: int) -> int | None:
+    """Copy from one file descriptor to another in the kernel, without
+    reading the data into Python. Returns ``None`` if neither
+    :func:`os.sendfile` nor :func:`os.splice` supports the descriptors.
+    """
+    import errno
+
+    unsupported = (errno.EINVAL, errno.ENOSYS, errno.EBADF, errno.ENOTSUP)
+    total = 0
+
+    for name in ("sendfile", "splice"):
+        func = getattr(os, name, None)
+
+        if func is None:
+            continue
+
+        while True:
+            try:
+                if name == "sendfile":
+                    n = func(out_fd, in_fd, None, size)
+                else:
+                    n = func(in_fd, out_fd, size)
+            except OSError as e:
+                # Only fall back if nothing was copied yet.
+                if total == 0 and e.errno in unsupported:
+                    break
+
+                raise
+
+            if n == 0:
+                return total
+
+            total += n
+
+    return None
+
+
+def copy_stream(src: t.IO[t.Any], dst: t.IO[t.Any], buffer_size: int = 1 << 16) -> int:
+    """Copy everything remaining in ``src`` to ``dst``, and return the
+    number of bytes or characters copied.
+
+    On Linux, if both are plain binary files, pipes, or standard streams
+    opened with :func:`open`, the data is copied by the kernel with
+    :func:`os.sendfile` or :func:`os.splice`, without reading it into
+    Python. Otherwise, such as for streams opened for both reading and
+    writing or streams that transform the data, the data is copied through
+    a reusable buffer of ``buffer_size``.
+
+    .. code-block:: python
+
+        @click.command()
+        @click.argument("src", type=click.File("rb"))
+        def cat(src):
+            click.copy_stream(src, click.get_binary_stream("stdout"))
+
+    :param src: The stream to read from.
+    :param dst: The stream to write to.
+    :param buffer_size: The size of the buffer used without the kernel.
+
+    .. versionadded:: 8.4
+    """
+    total = 0
+    src = _unwrap_stream(src)
+    dst = _unwrap_stream(dst)
+    text = isinstance(src, io.TextIOBase) or isinstance(dst, io.TextIOBase)
+
+    # Only streams whose position is known to match their file descriptor
+    # can be copied directly. Subclasses and wrappers may transform the
+    # data or keep their own buffers.
+    if (
+        not text
+        and sys.platform.startswith("linux")
+        and type(src) in (io.FileIO, io.BufferedReader)
+        and type(dst) in (io.FileIO, io.BufferedWriter)
+    ):
+        in_fd = _fileno(src)
+        out_fd = _fileno(dst) if in_fd is not None else None
+
+        if in_fd is not None and out_fd is not None:
+            # Copy data already read into the source's buffer, so its file
+            # descriptor is at the logical position.
+            if isinstance(src, io.BufferedReader):
+                buffered = src.peek(1)
+
+                if buffered:
+                    dst.write(src.read(len(buffered)))
+                    total += len(buffered)
+
+            dst.flush()
+            copied = _copy_fds(in_fd, out_fd, 1 << 30)
+
+            if copied is not None:
+                return total + copied
+
+    if text or not hasattr(src, "readinto"):
+        while True:
+            chunk = src.read(buffer_size)
+
+            if not chunk:
+                return total
+
+            dst.write(chunk)
+            total += len(chunk)
+
+    buffer = bytearray(buffer_size)
+    view = memoryview(buffer)
+
+    while True:
+        n = src.readinto(buffer)
+
+        if not n:
+            return total
+
+        dst.write(view[:n])
+        total += n
+
+
 def format_filename(
     filename: str | bytes | os.PathLike[str] | os.PathLike[bytes],
     shorten: bool = False,
@@ -1,3 +1,4 @@
+import os
 import sys
 from unittest import mock
 
@@ -156,6 +157,191 @@ def test_file_atomics(runner):
             assert f.read() == b"Foo bar baz\n"
 
 
+@pytest.mark.parametrize("lazy", [True, False])
+def test_file_atomic_discard_on_error(runner, lazy):
+    @click.command()
+    @click.argument("output", type=click.File("w", lazy=lazy, atomic=True))
+    def cli(output):
+        output.write("new")
+        raise click.Abort()
+
+    with runner.isolated_filesystem():
+        with open("foo.txt", "w") as f:
+            f.write("old")
+
+        result = runner.invoke(cli, ["foo.txt"])
+        assert result.exit_code == 1
+
+        with open("foo.txt") as f:
+            assert f.read() == "old"
+
+        assert os.listdir() == ["foo.txt"]
+
+
+@pytest.mark.parametrize("name", ["out.gz", "out.bz2", "out.xz", "out.txt"])
+@pytest.mark.parametrize("lazy", [True, False])
+@pytest.mark.parametrize("threaded", [True, False])
+def test_file_compression(runner, name, lazy, threaded):
+    @click.command()
+    @click.argument(
+        "output", type=click.File("w", lazy=lazy, atomic=True, compression="auto")
+    )
+    def write(output):
+        output.write("hello\nworld\n")
+
+    @click.command()
+    @click.argument(
+        "input", type=click.File("r", compression="auto", threaded=threaded)
+    )
+    def read(input):
+        click.echo(list(input))
+
+    with runner.isolated_filesystem():
+        result = runner.invoke(write, [name])
+        assert result.exit_code == 0
+
+        with open(name, "rb") as f:
+            data = f.read()
+
+        assert (data == b"hello\nworld\n") == name.endswith(".txt")
+        # Reading detects the format from the data, not the name.
+        os.rename(name, "data")
+        result = runner.invoke(read, ["data"])
+        assert result.output == "['hello\\n', 'world\\n']\n"
+        result = runner.invoke(read, ["-"], input=data)
+        assert result.output == "['hello\\n', 'world\\n']\n"
+
+
+def test_file_compression_stdout(runner):
+    import gzip
+
+    @click.command()
+    @click.argument("output", type=click.File("wb", compression="gzip"))
+    def cli(output):
+        output.write(b"data")
+
+    result = runner.invoke(cli, ["-"])
+    assert gzip.decompress(result.stdout_bytes) == b"data"
+
+
+def test_file_compression_copy_stream(runner, tmp_path):
+    import gzip
+
+    data = os.urandom(100_000)
+    (tmp_path / "in.gz").write_bytes(gzip.compress(data))
+
+    @click.command()
+    @click.argument("src", type=click.File("rb", compression="auto"))
+    @click.argument("dst", type=click.File("wb"))
+    def cli(src, dst):
+        with pytest.raises(OSError):
+            src.fileno()
+
+        click.copy_stream(src, dst)
+
+    result = runner.invoke(cli, [str(tmp_path / "in.gz"), str(tmp_path / "out")])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / "out").read_bytes() == data
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires mkfifo")
+def test_file_compression_threaded_close_blocked(tmp_path):
+    import gzip
+    import threading
+    import time
+
+    path = tmp_path / "fifo"
+    os.mkfifo(path)
+    # Keep a writer open, so opening to read doesn't block, and send part
+    # of the data, so the background read waits for more.
+    fd = os.open(path, os.O_RDWR)
+    os.write(fd, gzip.compress(b"data")[:4])
+    threads = set(threading.enumerate())
+    f = click.open_file(path, "rb", compression="gzip", threaded=True)
+    (thread,) = set(threading.enumerate()) - threads
+    start = time.monotonic()
+    f.close()
+    assert time.monotonic() - start < 5
+    assert thread.is_alive()
+    # The thread finishes once the read returns.
+    os.close(fd)
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def test_file_compression_discard_on_error(runner):
+    @click.command()
+    @click.argument("output", type=click.File("w", atomic=True, compression="gzip"))
+    def cli(output):
+        output.write("new")
+        raise click.Abort()
+
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["foo.gz"])
+        assert result.exit_code == 1
+        assert os.listdir() == []
+
+
+@pytest.mark.parametrize("atomic", [True, False])
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_file_max_open(runner, atomic, compression):
+    import gzip
+
+    open_names = []
+
+    @click.command()
+    @click.argument(
+        "outputs",
+        nargs=-1,
+        type=click.File("w", atomic=atomic, compression=compression, max_open=2),
+    )
+    @click.option("--fail", is_flag=True)
+    def cli(outputs, fail):
+        for i in range(3):
+            for output in outputs:
+                output.write(f"{i}")
+                open_names.append(
+                    sorted(o.name for o in outputs if o._f and not o._suspended)
+                )
+
+        if fail:
+            raise click.Abort()
+
+    names = [f"{i}.txt" for i in range(4)]
+
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, names)
+        assert result.exit_code == 0
+        assert max(len(names) for names in open_names) == 2
+
+        for name in names:
+            with open(name, "rb") as f:
+                data = f.read()
+
+            if compression is not None:
+                data = gzip.decompress(data)
+
+            assert data == b"012"
+
+        result = runner.invoke(cli, ["new.txt", *names, "--fail"])
+        assert result.exit_code == 1
+        expect = names if atomic else [*names, "new.txt"]
+        assert sorted(os.listdir()) == expect
+
+
+def test_file_max_open_invalid():
+    with pytest.raises(ValueError, match="'max_open' must be"):
+        click.File("w", max_open=0)
+
+
+def test_file_compression_invalid():
+    with pytest.raises(ValueError, match="'compression' must be"):
+        click.File(compression="zip")
+
+    with pytest.raises(ValueError, match="'compression' must be"):
+        click.open_file(__file__, compression="zip")
+
+
 def test_stdout_default(runner):
     @click.command()
     @click.argument("output", type=click.File("w"), default="-")
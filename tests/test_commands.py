@@ -573,3 +573,279 @@ def test_abort_exceptions_with_disabled_standalone_mode(runner, exc):
     assert rv.exit_code == 1
     assert isinstance(rv.exception.__cause__, exc)
     assert rv.exception.__cause__.args == ("catch me!",)
+
+
+def test_group_commands_page_size(runner):
+    loaded = []
+
+    class LazyGroup(click.Group):
+        def list_commands(self, ctx):
+            return [f"db-{i}" for i in range(30)] + [f"web-{i}" for i in range(30)]
+
+        def get_command(self, ctx, name):
+            loaded.append(name)
+            return click.Command(name, help=f"Run {name}.")
+
+    cli = LazyGroup("cli", commands_page_size=10)
+    result = runner.invoke(cli, ["--help"])
+    assert "  db-9  Run db-9." in result.output
+    assert "db-10" not in result.output
+    assert "Showing 1-10 of 60 commands." in result.output
+    assert len(loaded) == 10
+
+    loaded.clear()
+    result = runner.invoke(cli, ["--help", "--filter", "web-*", "--page", "3"])
+    assert "web-20" in result.output
+    assert "db-" not in result.output
+    assert "Showing 21-30 of 30 commands." in result.output
+    assert len(loaded) == 10
+
+    result = runner.invoke(cli, ["--filter", "x*", "--help"])
+    assert "No commands match 'x*'." in result.output
+
+    result = runner.invoke(cli, ["--help", "--filter", "web-*", "--page", "4"])
+    assert result.exit_code == 2
+    assert "Page 4 doesn't exist, there are 3 pages." in result.output
+
+    # Invalid values are reported whether they come before or after help.
+    for args in (["--help", "--page", "0"], ["--page", "0", "--help"]):
+        result = runner.invoke(cli, args)
+        assert result.exit_code == 2
+        assert "Invalid value for '--page'" in result.output
+
+    # The options aren't parameters, and only accepted with help.
+    assert [p.name for p in cli.get_params(click.Context(cli))] == ["help"]
+    result = runner.invoke(cli, ["--page", "2"])
+    assert "No such option: --page" in result.output
+
+
+def test_group_commands_page_size_own_options(runner):
+    @click.group(commands_page_size=1)
+    @click.option("--page", default="home")
+    def cli(page):
+        pass
+
+    @cli.command()
+    @click.option("--page", type=int)
+    def sub(page):
+        click.echo(page)
+
+    cli.command("other")(lambda: None)
+
+    # The group's own option isn't replaced.
+    result = runner.invoke(cli, ["--page", "x", "--help"])
+    assert result.exit_code == 0
+    assert "Showing 1-1 of 2 commands." in result.output
+    assert "--page TEXT" in result.output
+
+    # Help for a subcommand leaves its options alone.
+    result = runner.invoke(cli, ["sub", "--page", "3", "--help"])
+    assert result.exit_code == 0
+    assert "--page INTEGER" in result.output
+    result = runner.invoke(cli, ["sub", "--page", "3"])
+    assert result.output == "3\n"
+
+
+def test_group_abbreviations(runner):
+    @click.group(allow_abbreviations=True)
+    def cli():
+        pass
+
+    @cli.command()
+    def status():
+        click.echo("status")
+
+    @cli.command()
+    def stash():
+        click.echo("stash")
+
+    @cli.command(hidden=True)
+    def debug():
+        click.echo("debug")
+
+    @cli.command(hidden=True)
+    def stats():
+        click.echo("stats")
+
+    assert runner.invoke(cli, ["stat"]).output == "status\n"
+    result = runner.invoke(cli, ["st"])
+    assert "'st' is ambiguous, it could be 'stash', 'status'." in result.output
+    # Hidden commands are only run by their full name.
+    assert "No such command 'd'." in runner.invoke(cli, ["d"]).output
+    assert runner.invoke(cli, ["debug"]).output == "debug\n"
+    result = runner.invoke(cli, ["x"])
+    assert "No such command 'x'." in result.output
+
+    # Replacing a command directly, keeping the same number, is detected.
+    del cli.commands["stash"]
+    cli.commands["shelve"] = click.Command("shelve", callback=lambda: print("s"))
+    assert runner.invoke(cli, ["st"]).output == "status\n"
+    assert runner.invoke(cli, ["sh"]).output == "s\n"
+
+    # The prefix tree is rebuilt when a command is added.
+    @cli.command()
+    def start():
+        click.echo("start")
+
+    assert runner.invoke(cli, ["star"]).output == "start\n"
+    assert "'sta' is ambiguous" in runner.invoke(cli, ["sta"]).output
+
+
+def test_group_abbreviations_disabled(runner):
+    cli = click.Group("cli", commands=[click.Command("status")])
+    result = runner.invoke(cli, ["stat"])
+    assert "No such command 'stat'." in result.output
+
+
+def test_command_trie():
+    from click.core import _CommandTrie
+
+    trie = _CommandTrie(["b", "ab", "a", "abc"], 0)
+    assert trie.with_prefix("") == ["a", "ab", "abc", "b"]
+    assert trie.with_prefix("ab") == ["ab", "abc"]
+    assert trie.with_prefix("abcd") == []
+
+
+def test_group_abbreviations_commands_changed(runner):
+    cli = click.Group("cli", allow_abbreviations=True)
+    cli.commands.update(status=click.Command("status", callback=lambda: print("a")))
+    assert runner.invoke(cli, ["st"]).output == "a\n"
+    cli.commands |= {"stash": click.Command("stash")}
+    assert "'st' is ambiguous" in runner.invoke(cli, ["st"]).output
+    cli.commands.pop("stash")
+    cli.commands.setdefault("show", click.Command("show"))
+    assert runner.invoke(cli, ["st"]).output == "a\n"
+    cli.commands.clear()
+    assert "No such command 'st'." in runner.invoke(cli, ["st"]).output
+
+    # A dict passed by the caller is used as is, and checked every time.
+    commands = {"status": click.Command("status", callback=lambda: print("b"))}
+    cli = click.Group("cli", commands=commands, allow_abbreviations=True)
+    assert cli.commands is commands
+    assert runner.invoke(cli, ["st"]).output == "b\n"
+    commands["stash"] = click.Command("stash")
+    assert "'st' is ambiguous" in runner.invoke(cli, ["st"]).output
+
+
+def test_group_abbreviations_list_commands(runner):
+    """An overridden list_commands is checked in its own order."""
+
+    class Ordered(click.Group):
+        def list_commands(self, ctx):
+            return ["stop", "start", "status"]
+
+    cli = Ordered(
+        "cli",
+        commands=[click.Command(n) for n in ("start", "status", "stop")],
+        allow_abbreviations=True,
+    )
+    result = runner.invoke(cli, ["st"])
+    assert "it could be 'stop', 'start', 'status'." in result.output
+    assert cli._command_trie is None
+
+
+def test_command_collection_index(runner):
+    calls = []
+
+    class Source(click.Group):
+        def get_command(self, ctx, cmd_name):
+            calls.append(self.name)
+            return super().get_command(ctx, cmd_name)
+
+    sources = [
+        Source(f"s{i}", commands=[click.Command(f"cmd{i}", callback=print)])
+        for i in range(5)
+    ]
+    sources.append(Source("dup", commands=[click.Command("cmd0")]))
+    cli = click.CommandCollection("cli", sources=sources)
+    ctx = click.Context(cli)
+    assert cli.get_command(ctx, "cmd3").name == "cmd3"
+    assert calls == ["s3"]
+    # Earlier sources take precedence.
+    assert cli.get_command(ctx, "cmd0").callback is print
+    assert cli.list_commands(ctx) == [f"cmd{i}" for i in range(5)]
+
+    # Adding to a plain group source is detected.
+    sources[0].add_command(click.Command("new"))
+    assert "new" in cli.list_commands(ctx)
+
+    cli.add_source(click.Group(commands=[click.Command("other")]))
+    assert cli.get_command(ctx, "other") is not None
+    assert cli.get_command(ctx, "missing") is None
+
+
+def test_command_collection_listed_name_precedence():
+    class Aliases(click.Group):
+        def get_command(self, ctx, cmd_name):
+            name = {"s": "status", "st": "status"}.get(cmd_name, cmd_name)
+            return super().get_command(ctx, name)
+
+    aliases = Aliases(commands=[click.Command("status")])
+    other = click.Group(commands=[click.Command("st")])
+    cli = click.CommandCollection("cli", sources=[aliases, other])
+    ctx = click.Context(cli)
+    # The source listing the name wins over an earlier alias.
+    assert cli.get_command(ctx, "st") is other.commands["st"]
+    # Names no source lists are looked up in order.
+    assert cli.get_command(ctx, "s") is aliases.commands["status"]
+
+
+def test_command_collection_dynamic_source():
+    """A source that overrides list_commands is asked every time, its
+    names may depend on the context.
+    """
+
+    class Dynamic(click.Group):
+        def list_commands(self, ctx):
+            return ["a", ctx.obj]
+
+        def get_command(self, ctx, cmd_name):
+            if cmd_name in self.list_commands(ctx):
+                return click.Command(cmd_name)
+
+            return None
+
+    cli = click.CommandCollection("cli", sources=[Dynamic()])
+    assert cli.list_commands(click.Context(cli, obj="b")) == ["a", "b"]
+    ctx = click.Context(cli, obj="c")
+    assert cli.list_commands(ctx) == ["a", "c"]
+    assert cli.get_command(ctx, "c") is not None
+
+
+def test_command_collection_source_changed():
+    source = click.Group(commands=[click.Command("a"), click.Command("b")])
+    other = click.Group(commands=[click.Command("c")])
+    cli = click.CommandCollection("cli", sources=[source, other])
+    ctx = click.Context(cli)
+    assert cli.list_commands(ctx) == ["a", "b", "c"]
+
+    # Replacing a command keeps the number of commands the same.
+    del source.commands["b"]
+    source.commands["c"] = replaced = click.Command("c")
+    assert cli.list_commands(ctx) == ["a", "c"]
+    assert cli.get_command(ctx, "c") is replaced
+
+    # A mapping the group didn't create is compared by its names.
+    commands = {"d": click.Command("d")}
+    cli.add_source(click.Group(commands=commands))
+    assert cli.list_commands(ctx) == ["a", "c", "d"]
+    commands["e"] = commands.pop("d")
+    assert cli.list_commands(ctx) == ["a", "c", "e"]
+
+
+def test_suggest_commands(runner):
+    cli = click.Group(
+        "cli",
+        commands=[
+            click.Command("status"),
+            click.Command("statistics", hidden=True),
+            click.Command("push"),
+            click.Command("pull"),
+        ],
+    )
+    result = runner.invoke(cli, ["stauts"])
+    assert "No such command 'stauts'. Did you mean 'status'?" in result.output
+    result = runner.invoke(cli, ["puss"])
+    assert "(Possible commands: 'pull', 'push')" in result.output
+    result = runner.invoke(cli, ["xyz"])
+    assert result.output.endswith("No such command 'xyz'.\n")
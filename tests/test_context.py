@@ -670,3 +670,47 @@ def test_propagate_opt_prefixes():
     ctx = click.Context(click.Command("test2"), parent=parent)
 
     assert ctx._opt_prefixes == {"-", "--", "!"}
+
+
+def test_environ_injected():
+    @click.group()
+    @click.option("--name", envvar="NAME")
+    def cli(name):
+        pass
+
+    @cli.command()
+    @click.option("--level")
+    def sub(level):
+        pass
+
+    ctx = cli.make_context("cli", ["sub"], environ={"NAME": "a", "CLI_SUB_LEVEL": "2"})
+    assert ctx.params["name"] == "a"
+    sub_ctx = sub.make_context("sub", [], parent=ctx, auto_envvar_prefix="CLI_SUB")
+    assert sub_ctx.environ is ctx.environ
+    assert sub_ctx.params["level"] == "2"
+
+
+def test_environ_snapshot(monkeypatch):
+    monkeypatch.setenv("NAME", "before")
+    ctx = click.Context(click.Command("test"))
+    environ = ctx.environ
+    monkeypatch.setenv("NAME", "after")
+    assert ctx.environ is environ
+    assert ctx.environ["NAME"] == "before"
+    assert click.Context(click.Command("test")).environ["NAME"] == "after"
+
+
+@pytest.mark.parametrize("win", [True, False])
+def test_environ_snapshot_case(monkeypatch, win):
+    # Windows stores names upper case and looks them up ignoring case.
+    monkeypatch.setattr(click.core, "WIN", win)
+    monkeypatch.setenv("LEVEL" if win else "Level", "2")
+
+    @click.command()
+    @click.option("--level", envvar="Level")
+    def cli(level):
+        click.echo(level)
+
+    ctx = cli.make_context("cli", [])
+    assert ctx.params["level"] == "2"
+    assert ("level" in ctx.environ) is win
@@ -1,3 +1,7 @@
+import sys
+
+import pytest
+
 import click
 
 
@@ -110,3 +114,165 @@ def test_shared_param_prefers_first_default(runner):
     assert "red" in result.output
     result = runner.invoke(prefers_red, ["--green"])
     assert "green" in result.output
+
+
+@pytest.fixture
+def app_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setattr("click._config._memory_cache", {})
+    path = tmp_path / "cli"
+    path.mkdir()
+    return path
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files(runner, app_dir):
+    (app_dir / "base.toml").write_text(
+        'name = "base"\ncount = 1\n[sub]\ndry-run = true\nlabel = "a"\n'
+    )
+    (app_dir / "local.json").write_text('{"count": 2, "sub": {"label": "b"}}')
+    (app_dir / "extra.ini").write_text("[cli.sub]\nlabel = c\n")
+
+    files = ["base.toml", "local.json", "extra.ini", "missing.toml"]
+
+    @click.group(context_settings={"default_map_files": files})
+    @click.option("--name")
+    @click.option("--count", type=int)
+    def cli(name, count):
+        click.echo(f"{name} {count}")
+
+    @cli.command()
+    @click.option("--dry-run", is_flag=True)
+    @click.option("--label")
+    def sub(dry_run, label):
+        click.echo(f"{dry_run} {label}")
+
+    result = runner.invoke(cli, ["sub"], prog_name="cli")
+    assert result.output == "base 2\nTrue c\n"
+    assert (app_dir / ".default-map-cache").exists()
+
+    # The on-disk cache is used, and invalidated when a file changes.
+    click._config._memory_cache.clear()
+    result = runner.invoke(cli, ["sub"], prog_name="cli")
+    assert result.output == "base 2\nTrue c\n"
+    (app_dir / "local.json").write_text('{"count": 30}')
+    result = runner.invoke(cli, ["sub"], prog_name="cli")
+    assert result.output == "base 30\nTrue c\n"
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files_modified(runner, app_dir):
+    (app_dir / "config.json").write_text('{"sub": {"tags": ["a"]}}')
+
+    @click.group(context_settings={"default_map_files": ["config.json"]})
+    def cli():
+        pass
+
+    @cli.command()
+    @click.option("--tags", multiple=True)
+    @click.pass_context
+    def sub(ctx, tags):
+        click.echo(" ".join(tags))
+        ctx.default_map["tags"].append("b")
+
+    # Changes to the loaded map don't affect the cached map.
+    for _ in range(2):
+        result = runner.invoke(cli, ["sub"], prog_name="cli")
+        assert result.output == "a\n"
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files_unknown_type(runner, app_dir):
+    (app_dir / "config.yaml").write_text("name: a\n")
+
+    @click.command(context_settings={"default_map_files": ["config.yaml"]})
+    def cli():
+        pass
+
+    result = runner.invoke(cli, prog_name="cli")
+    assert result.exit_code == 1
+    assert "Unknown configuration file type '.yaml'." in result.output
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files_invalid(runner, app_dir):
+    (app_dir / "bad.json").write_text("{")
+
+    @click.command(context_settings={"default_map_files": ["bad.json"]})
+    def cli():
+        pass
+
+    result = runner.invoke(cli, prog_name="cli")
+    assert result.exit_code == 1
+    assert "Could not parse file" in result.output
+    assert "bad.json" in result.output
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files_invalid_ini(runner, app_dir):
+    (app_dir / "bad.ini").write_text("label = c\n")
+
+    @click.command(context_settings={"default_map_files": ["bad.ini"]})
+    def cli():
+        pass
+
+    result = runner.invoke(cli, prog_name="cli")
+    assert result.exit_code == 1
+    assert "Could not parse file" in result.output
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_default_map_files_toml_unsupported(runner, app_dir, monkeypatch):
+    (app_dir / "config.toml").write_text('name = "a"\n')
+    monkeypatch.setattr(sys, "version_info", (3, 10))
+    monkeypatch.setitem(sys.modules, "tomli", None)
+
+    @click.command(context_settings={"default_map_files": ["config.toml"]})
+    def cli():
+        pass
+
+    result = runner.invoke(cli, prog_name="cli")
+    assert result.exit_code == 1
+    assert "requires Python 3.11 or the 'tomli' library" in result.output
+
+
+@pytest.mark.parametrize("per", ["context", "process"])
+def test_cached_default(runner, per):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "main"
+
+    default = click.CachedDefault(compute, per=per)
+
+    @click.group(invoke_without_command=True)
+    @click.option("--branch", default=default, show_default=True)
+    def cli(branch):
+        click.echo(branch)
+
+    @cli.command()
+    @click.option("--branch", default=default)
+    def sub(branch):
+        click.echo(branch)
+
+    result = runner.invoke(cli, ["--branch", "dev"])
+    assert result.output == "dev\n"
+    assert calls == []
+
+    result = runner.invoke(cli, ["--help"])
+    assert "[default: (dynamic)]" in result.output
+    assert calls == []
+
+    result = runner.invoke(cli, ["sub"])
+    assert result.output == "main\nmain\n"
+    assert len(calls) == 1
+
+    result = runner.invoke(cli, ["sub"], default_map={"sub": {"branch": default}})
+    assert result.output == "main\nmain\n"
+    assert len(calls) == (2 if per == "context" else 1)
+
+
+def test_cached_default_invalid():
+    with pytest.raises(ValueError, match="'per'"):
+        click.CachedDefault(lambda: 1, per="thread")
@@ -1,3 +1,7 @@
+import sys
+
+import pytest
+
 import click
 
 
@@ -366,3 +370,210 @@ def test_help_formatter_write_text():
     actual = formatter.getvalue()
     expected = "  Lorem ipsum dolor sit amet,\n  consectetur adipiscing elit\n"
     assert actual == expected
+
+
+@pytest.mark.parametrize(
+    "mode",
+    [
+        "memory",
+        pytest.param(
+            "disk",
+            marks=pytest.mark.skipif(
+                sys.platform in ("win32", "darwin"), reason="XDG app dir"
+            ),
+        ),
+    ],
+)
+def test_help_cache(runner, tmp_path, monkeypatch, mode):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setattr("click._help_cache._memory_cache", {})
+    calls = []
+
+    class Group(click.Group):
+        def format_help(self, ctx, formatter):
+            calls.append(ctx.info_name)
+            super().format_help(ctx, formatter)
+
+    @click.group(cls=Group, context_settings={"help_cache": mode})
+    @click.option("--name", default="a", show_default=True)
+    def cli(name):
+        pass
+
+    @cli.command()
+    def sub():
+        """Does things."""
+
+    first = runner.invoke(cli, ["--help"], terminal_width=80).output
+    assert runner.invoke(cli, ["--help"], terminal_width=80).output == first
+    assert "sub  Does things." in first
+    assert calls == ["cli"]
+
+    if mode == "disk":
+        assert len(list((tmp_path / "cli" / "help-cache").iterdir())) == 1
+        click._help_cache._memory_cache.clear()
+        assert runner.invoke(cli, ["--help"], terminal_width=80).output == first
+        assert calls == ["cli"]
+
+    # Width, defaults, and the command tree are part of the key.
+    runner.invoke(cli, ["--help"], terminal_width=60)
+    assert len(calls) == 2
+    result = runner.invoke(
+        cli, ["--help"], terminal_width=80, default_map={"name": "b"}
+    )
+    assert "[default: b]" in result.output
+
+    @cli.command()
+    def other():
+        """Other things."""
+
+    assert "other  Other things." in runner.invoke(cli, ["--help"]).output
+    assert len(calls) == 4
+
+
+def test_help_cache_lazy_commands(runner, monkeypatch):
+    """Commands that a group loads in get_command are part of the key."""
+    monkeypatch.setattr("click._help_cache._memory_cache", {})
+    loaded = {"sub": click.Command("sub", help="Old help.")}
+
+    class Lazy(click.Group):
+        def list_commands(self, ctx):
+            return sorted(loaded)
+
+        def get_command(self, ctx, name):
+            return loaded.get(name)
+
+    cli = Lazy("cli", context_settings={"help_cache": "memory"})
+    assert "Old help." in runner.invoke(cli, ["--help"]).output
+    loaded["sub"] = click.Command("sub", help="New help.")
+    assert "New help." in runner.invoke(cli, ["--help"]).output
+
+
+def test_help_cache_key_is_stable():
+    """Values with memory addresses in their repr, such as lambdas and
+    plain objects, describe the same way in every process.
+    """
+    from click._help_cache import _fingerprint
+
+    class Value:
+        pass
+
+    def make_cli():
+        @click.command()
+        @click.option("--name", default=lambda: "a", show_default=True)
+        @click.option("--value", default=Value(), show_default=True)
+        def cli(name, value):
+            pass
+
+        return cli
+
+    keys = set()
+
+    for _ in range(2):
+        cli = make_cli()
+        ctx = cli.make_context("cli", [], default_map={"name": lambda: "b"})
+        keys.add(_fingerprint(cli, ctx, ctx.make_formatter()))
+
+    assert len(keys) == 1
+
+
+@pytest.mark.skipif(sys.platform in ("win32", "darwin"), reason="XDG app dir")
+def test_help_cache_bounded(runner, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path))
+    monkeypatch.setattr("click._help_cache._memory_cache", {})
+    monkeypatch.setattr("click._help_cache._MAX_MEMORY", 2)
+    monkeypatch.setattr("click._help_cache._MAX_DISK", 2)
+
+    @click.command(context_settings={"help_cache": "disk"})
+    def cli():
+        pass
+
+    for width in (50, 60, 70, 80):
+        runner.invoke(cli, ["--help"], terminal_width=width, prog_name="cli")
+
+    assert len(click._help_cache._memory_cache) == 2
+    assert len(list((tmp_path / "cli" / "help-cache").iterdir())) == 2
+
+
+def test_wrap_text_matches_textwrap():
+    """The fast paths in TextWrapper produce the same lines as the
+    stdlib implementation.
+    """
+    import random
+    import textwrap
+
+    from click._textwrap import TextWrapper
+
+    class Reference(TextWrapper):
+        wrap = textwrap.TextWrapper.wrap
+        _split = textwrap.TextWrapper._split
+
+    rng = random.Random(42)
+    pieces = ["a", "word", "longer words", "x" * 30, " ", "  ", "well-known"]
+    pieces += ["--", "\t", "\n", "\xa0", "é", "\x1b[31mred\x1b[0m", "end."]
+
+    for _ in range(2000):
+        text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 20)))
+        kwargs = dict(
+            width=rng.randint(10, 50),
+            initial_indent=" " * rng.randint(0, 4),
+            subsequent_indent=" " * rng.randint(0, 4),
+            replace_whitespace=False,
+        )
+        expect = Reference(**kwargs).wrap(text)
+        assert TextWrapper(**kwargs).wrap(text) == expect, text
+
+
+def test_help_formatter_sink():
+    chunks = []
+    formatter = click.HelpFormatter(width=40, sink=chunks.append, flush_size=10)
+    formatter.write_usage("cli", "[OPTIONS]")
+
+    with formatter.section("Options"):
+        formatter.write_dl([("--a", "First."), ("--b", "Second.")])
+
+    assert formatter.getvalue() == ""
+    formatter.write_paragraph()
+    formatter.write_text("Epilog.")
+    assert chunks[0] == "Usage: cli [OPTIONS]"
+    formatter.flush()
+    assert "".join(chunks) == (
+        "Usage: cli [OPTIONS]\n\nOptions:\n  --a  First.\n  --b  Second.\n\nEpilog.\n"
+    )
+
+
+def test_write_help_matches_get_help():
+    @click.group(epilog="The end.\n\n")
+    def cli():
+        """Many commands."""
+
+    for i in range(200):
+        cli.command(f"cmd{i}", help=f"Command {i}.")(lambda: None)
+
+    ctx = click.Context(cli, info_name="cli", terminal_width=80)
+    chunks = []
+    cli.write_help(ctx, chunks.append)
+    assert len(chunks) > 2
+    assert "".join(chunks) == f"{cli.get_help(ctx)}\n"
+
+
+def test_write_help_custom_formatter():
+    class Formatter(click.HelpFormatter):
+        def write(self, string):
+            super().write(string.upper())
+
+        def getvalue(self):
+            return f"{super().getvalue()}Custom."
+
+    class Context(click.Context):
+        formatter_class = Formatter
+
+    @click.command(context_settings={"terminal_width": 80})
+    def cli():
+        pass
+
+    cli.context_class = Context
+    ctx = cli.make_context("cli", [])
+    chunks = []
+    cli.write_help(ctx, chunks.append)
+    assert "".join(chunks) == f"{cli.get_help(ctx)}\n"
+    assert "".join(chunks).endswith("Custom.\n")
@@ -149,6 +149,7 @@ def test_unknown_options(runner, unknown_flag):
         ("--cat", "Did you mean --count?"),
         ("--bounds", "(Possible options: --bound, --count)"),
         ("--bount", "(Possible options: --bound, --count)"),
+        ("--cuont", "Did you mean --count?"),
     ],
 )
 def test_suggest_possible_options(runner, value, expect):
@@ -2275,3 +2276,25 @@ def test_custom_type_frozenset_flag_value(runner):
     result = runner.invoke(rcli, ["--without-scm-ignore-files"])
     assert result.stdout == "frozenset()"
     assert result.exit_code == 0
+
+
+def test_simple_option_fast_path(runner):
+    class Upper(click.Option):
+        def process_value(self, ctx, value):
+            return super().process_value(ctx, value).upper()
+
+    @click.command()
+    @click.option("--a", type=int)
+    @click.option("--b", default="x")
+    @click.option("--flag/--no-flag")
+    @click.option("--c", cls=Upper, default="y")
+    @click.pass_context
+    def cli(ctx, a, b, flag, c):
+        sources = [ctx.get_parameter_source(n).name for n in ("a", "b", "flag", "c")]
+        click.echo(f"{a!r} {b!r} {flag!r} {c!r} {' '.join(sources)}")
+
+    result = runner.invoke(cli, ["--a", "1", "--no-flag"])
+    assert result.output == "1 'x' False 'Y' COMMANDLINE DEFAULT COMMANDLINE DEFAULT\n"
+    result = runner.invoke(cli, ["--a", "z"])
+    assert "'z' is not a valid integer." in result.output
+    assert "Invalid value for '--a'" in result.output
@@ -0,0 +1,140 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import click
+from click._compat import WIN
+from click.server import call
+
+pytestmark = pytest.mark.skipif(
+    WIN or not hasattr(socket, "send_fds"), reason="requires fd passing"
+)
+
+SERVER_SCRIPT = """\
+import os
+import sys
+
+import click
+from click.server import serve
+
+STATE = []
+
+
+@click.command()
+@click.option("--name", default="World")
+@click.option("--env", "env_name")
+@click.option("--fail", is_flag=True)
+@click.option("--cwd", is_flag=True)
+def cli(name, env_name, fail, cwd):
+    STATE.append(name)
+    click.echo(f"Hello {name}! {len(STATE)}")
+
+    if env_name is not None:
+        click.echo(os.environ.get(env_name, "<unset>"))
+
+    if cwd:
+        click.echo(os.getcwd())
+
+    os.environ["LEAKED"] = "1"
+
+    if fail:
+        raise click.ClickException("failed")
+
+
+serve(cli, sys.argv[1], prog_name="cli", max_concurrency=2)
+"""
+
+
+@pytest.fixture
+def server(tmp_path):
+    script = tmp_path / "server.py"
+    script.write_text(SERVER_SCRIPT)
+    path = str(tmp_path / "cli.sock")
+    env = dict(os.environ)
+    src = os.path.dirname(os.path.dirname(click.__file__))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [src, env.get("PYTHONPATH")]))
+    proc = subprocess.Popen([sys.executable, str(script), path], env=env)
+
+    try:
+        for _ in range(200):
+            if os.path.exists(path):
+                break
+
+            time.sleep(0.05)
+        else:
+            pytest.fail("server did not start")
+
+        yield path
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    assert not os.path.exists(path)
+
+
+def _call(path, tmp_path, args, **kwargs):
+    out_path = tmp_path / "out"
+    err_path = tmp_path / "err"
+
+    with open(out_path, "wb") as out, open(err_path, "wb") as err:
+        code = call(path, args, stdout=out, stderr=err, **kwargs)
+
+    return code, out_path.read_text(), err_path.read_text()
+
+
+def test_call(server, tmp_path):
+    code, out, err = _call(server, tmp_path, ["--name", "Click"])
+    assert code == 0
+    assert out == "Hello Click! 1\n"
+    assert err == ""
+
+
+def test_fresh_state_per_request(server, tmp_path):
+    for _ in range(2):
+        code, out, _ = _call(server, tmp_path, [])
+        assert out == "Hello World! 1\n"
+
+
+def test_exit_codes(server, tmp_path):
+    code, _, err = _call(server, tmp_path, ["--fail"])
+    assert code == 1
+    assert err == "Error: failed\n"
+
+    code, _, err = _call(server, tmp_path, ["--unknown"])
+    assert code == 2
+    assert "No such option: --unknown" in err
+
+
+def test_env_isolation(server, tmp_path):
+    env = {"GREETING": "hi"}
+    code, out, _ = _call(server, tmp_path, ["--env", "GREETING"], env=env)
+    assert out.splitlines()[1] == "hi"
+
+    code, out, _ = _call(server, tmp_path, ["--env", "LEAKED"], env={})
+    assert out.splitlines()[1] == "<unset>"
+
+
+def test_cwd(server, tmp_path):
+    (tmp_path / "sub").mkdir()
+    code, out, _ = _call(server, tmp_path, ["--cwd"], cwd=tmp_path / "sub")
+    assert out.splitlines()[1] == str(tmp_path / "sub")
+
+
+def test_help(server, tmp_path):
+    code, out, _ = _call(server, tmp_path, ["--help"])
+    assert code == 0
+    assert out.startswith("Usage: cli [OPTIONS]")
+
+
+@pytest.mark.parametrize("name", ["args", "standalone_mode"])
+def test_serve_rejects_main_arguments(tmp_path, name):
+    from click.server import serve
+
+    with pytest.raises(TypeError, match=name):
+        serve(click.Command("cli"), tmp_path / "cli.sock", **{name: None})
+
+    assert not (tmp_path / "cli.sock").exists()
@@ -1,4 +1,9 @@
+import os
+import shlex
+import shutil
+import subprocess
 import textwrap
+import time
 import warnings
 from collections.abc import Mapping
 
@@ -350,6 +355,90 @@ def test_full_source(runner, shell):
     assert f"_CLI_COMPLETE={shell}_complete" in result.output
 
 
+def _static_cli():
+    return Group(
+        "cli",
+        params=[Option(["--color"], type=Choice(["red", "green"]))],
+        commands=[
+            Command(
+                "run",
+                params=[
+                    Option(["--name"], shell_complete=lambda *a: ["x"]),
+                    Argument(["mode"], type=Choice(["fast", "slow"])),
+                    Argument(["files"], nargs=-1, type=File()),
+                ],
+            ),
+            Group("pipe", chain=True),
+            Command("secret", hidden=True),
+        ],
+    )
+
+
+@pytest.mark.usefixtures("_patch_for_completion")
+def test_static_source(runner):
+    result = runner.invoke(_static_cli(), env={"_CLI_COMPLETE": "bash_static_source"})
+    # The dynamic completion function is defined as the fallback.
+    assert "_CLI_COMPLETE=bash_complete" in result.output
+    assert "_cli_completion_static" in result.output
+    assert "red green" in result.output
+
+
+@pytest.mark.parametrize("shell", ["zsh", "fish"])
+@pytest.mark.usefixtures("_patch_for_completion")
+def test_static_source_dynamic(runner, shell):
+    """Shells without a static script get the dynamic script."""
+    cli = _static_cli()
+    result = runner.invoke(cli, env={"_CLI_COMPLETE": f"{shell}_static_source"})
+    expect = runner.invoke(cli, env={"_CLI_COMPLETE": f"{shell}_source"})
+    assert result.output == expect.output
+
+
+def test_static_tree():
+    tree = click.shell_completion._StaticTree(_static_cli(), {}, "cli")
+    assert tree.commands["0"] == [("pipe", ""), ("run", "")]
+    assert tree.children == {"0 pipe": "1", "0 run": "2", "0 secret": "3"}
+    assert tree.values == {"0 --color": "1 choice", "2 --name": "1 dynamic"}
+    assert tree.positions == {"2 0": "choice", "2 +": "file"}
+    assert tree.choices["2 0"] == ["fast", "slow"]
+    # Chained groups complete siblings, which needs to run the program.
+    assert tree.dynamic == {"1"}
+
+
+@pytest.mark.skipif(shutil.which("bash") is None, reason="requires bash")
+@pytest.mark.parametrize(
+    ("words", "expect"),
+    [
+        (["cli", ""], "pipe run"),
+        (["cli", "r"], "run"),
+        (["cli", "--"], "--color --help"),
+        (["cli", "--color", "g"], "green"),
+        (["cli", "--color", "=", ""], "red green"),
+        (["cli", "--color", "red", "run", ""], "fast slow"),
+        (["cli", "run", "--name", ""], "dynamic"),
+        (["cli", "run", "--name=a", "s"], "slow"),
+        (["cli", "pipe", ""], "dynamic"),
+        (["cli", "secret", ""], ""),
+    ],
+)
+@pytest.mark.usefixtures("_patch_for_completion")
+def test_static_bash(runner, tmp_path, words, expect):
+    result = runner.invoke(_static_cli(), env={"_CLI_COMPLETE": "bash_static_source"})
+    script = tmp_path / "completion.sh"
+    script.write_text(result.output)
+    test = f"""\
+source {script}
+_cli_completion() {{ COMPREPLY=(dynamic); }}
+COMP_WORDS=({" ".join(shlex.quote(w) for w in words)})
+COMP_CWORD={len(words) - 1}
+_cli_completion_static
+echo "${{COMPREPLY[*]}}"
+"""
+    out = subprocess.run(
+        ["bash", "--norc", "-c", test], capture_output=True, text=True
+    ).stdout
+    assert out == f"{expect}\n"
+
+
 @pytest.mark.parametrize(
     ("shell", "env", "expect"),
     [
@@ -559,3 +648,170 @@ def test_files_closed(runner) -> None:
             assert not current_warnings, "There should be no warnings to start"
             _get_completions(cli, args=[], incomplete="")
             assert not current_warnings, "There should be no warnings after either"
+
+
+def test_values_not_processed(tmp_path):
+    calls = []
+
+    def callback(ctx, param, value):
+        calls.append(param.name)
+        return value
+
+    run = Command(
+        "run",
+        params=[
+            Option(["--path"], type=Path(exists=True), callback=callback),
+            Option(["--count"], type=int),
+            Argument(["src"], type=File()),
+        ],
+    )
+    cli = Group("cli", commands=[run])
+    args = ["run", "--path", str(tmp_path / "missing"), "--count", "x"]
+    assert _get_words(cli, args, "--h") == ["--help"]
+    assert _get_words(cli, ["run", str(tmp_path / "missing")], "") == []
+    assert calls == []
+
+
+def test_group_values_processed():
+    class PluginGroup(Group):
+        def list_commands(self, ctx):
+            return ["a", "b"] if ctx.params["plugin_dir"] == "/x" else []
+
+        def get_command(self, ctx, name):
+            return Command(name)
+
+    calls = []
+    cli = PluginGroup(
+        "cli",
+        params=[
+            Option(["--plugin-dir"], default="/x"),
+            Option(["--flag"], callback=lambda *a: calls.append("flag")),
+        ],
+    )
+    assert _get_words(cli, [], "") == ["a", "b"]
+    assert calls == ["flag"]
+
+
+def test_unset_values_not_recorded():
+    seen = {}
+
+    class Recorder(Command):
+        def get_params(self, ctx):
+            seen.update(ctx.params)
+            return super().get_params(ctx)
+
+    cli = Recorder("cli", params=[Option(["--a"]), Option(["--b"], multiple=True)])
+    _get_words(cli, [], "-")
+    assert seen == {"a": None, "b": ()}
+
+
+def test_custom_completion_gets_processed_values():
+    def complete(ctx, param, incomplete):
+        return [str(ctx.params["count"] + 1)]
+
+    cli = Command(
+        "cli",
+        params=[
+            Option(["--count"], type=int),
+            Option(["--next"], shell_complete=complete),
+        ],
+    )
+    assert _get_words(cli, ["--count", "1", "--next"], "") == ["2"]
+
+
+def test_async_shell_complete():
+    async def complete_async(ctx, param, incomplete):
+        return ["a", "b"]
+
+    async def complete_agen(ctx, param, incomplete):
+        for value in ("c", "d"):
+            yield value
+
+    def complete_gen(ctx, param, incomplete):
+        yield CompletionItem("e", help="eee")
+
+    cli = Command(
+        "cli",
+        params=[
+            Option(["--x"], shell_complete=complete_async),
+            Option(["--y"], shell_complete=complete_agen),
+            Option(["--z"], shell_complete=complete_gen),
+        ],
+    )
+    assert _get_words(cli, ["--x"], "") == ["a", "b"]
+    assert _get_words(cli, ["--y"], "") == ["c", "d"]
+    assert _get_completions(cli, ["--z"], "")[0].help == "eee"
+
+
+@pytest.fixture
+def completion_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr("click.utils.get_app_dir", lambda name: str(tmp_path))
+    return tmp_path / "completion-cache"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_shell_complete_timeout(completion_cache):
+    def complete(ctx, param, incomplete):
+        yield "fast"
+        time.sleep(0.5)
+        yield "slow"
+
+    param = Option(["--x"], shell_complete=complete, shell_complete_timeout=0.2)
+    cli = Command("cli", params=[param])
+    # Items produced within the budget are used.
+    assert _get_words(cli, ["--x"], "") == ["fast"]
+
+    # The worker is detached, only the intermediate process is a child.
+    with pytest.raises(ChildProcessError):
+        os.waitpid(-1, os.WNOHANG)
+
+    # The worker finishes in the background and caches its results.
+    for _ in range(50):
+        if any(p.suffix != ".tmp" for p in completion_cache.glob("*")):
+            break
+
+        time.sleep(0.1)
+
+    # The next completion uses the cached results when the budget runs out.
+    assert _get_words(cli, ["--x"], "") == ["fast", "slow"]
+    assert _get_words(cli, ["--x"], "s") == ["slow"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_shell_complete_timeout_error(completion_cache, capfd, monkeypatch):
+    monkeypatch.setattr("click._completion_runner._MAX_CACHE", 2)
+
+    def complete(ctx, param, incomplete):
+        if incomplete == "x":
+            raise ValueError("failed")
+
+        return [f"{incomplete}1"]
+
+    param = Option(["--x"], shell_complete=complete, shell_complete_timeout=5)
+    cli = Command("cli", params=[param])
+    assert _get_words(cli, ["--x"], "x") == []
+    assert "ValueError: failed" in capfd.readouterr().err
+
+    # The cache keeps the most recent results.
+    for incomplete in "abcd":
+        assert _get_words(cli, ["--x"], incomplete) == [f"{incomplete}1"]
+
+    assert len(list(completion_cache.iterdir())) == 2
+
+
+def test_shell_complete_timeout_thread(completion_cache, monkeypatch):
+    from click import _completion_runner
+
+    monkeypatch.delattr(os, "fork", raising=False)
+    calls = []
+
+    def complete(ctx, param, incomplete):
+        calls.append(incomplete)
+        return ["a", "b"]
+
+    param = Option(["--x"], shell_complete=complete, shell_complete_timeout=5)
+    cli = Command("cli", params=[param])
+    assert _get_words(cli, ["--x"], "") == ["a", "b"]
+    assert calls == [""]
+    ctx = click.Context(cli, info_name="cli")
+    assert [i.value for i in _completion_runner._read_cache(ctx, param, "b")] == ["b"]
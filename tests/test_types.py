@@ -1,12 +1,15 @@
 import os.path
 import pathlib
 import platform
+import re
+import stat
 import tempfile
 
 import pytest
 
 import click
 from click import FileError
+from click.testing import CliRunner
 
 
 @pytest.mark.parametrize(
@@ -216,6 +219,350 @@ def test_path_surrogates(tmp_path, monkeypatch):
     path.unlink()
 
 
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="Needs os.getuid.")
+@pytest.mark.parametrize(
+    ("mode", "kwargs", "valid", "accessed"),
+    [
+        (0o600, {}, True, False),
+        (0o200, {}, False, False),
+        (0o400, {"writable": True}, False, False),
+        (0o600, {"writable": True}, True, True),
+        (0o600, {"executable": True}, False, False),
+        (0o700, {"executable": True}, True, True),
+    ],
+)
+def test_path_access_mode_bits(monkeypatch, tmp_path, mode, kwargs, valid, accessed):
+    path = tmp_path / "file"
+    path.touch()
+    st = os.stat(path)
+    fake = os.stat_result((stat.S_IFREG | mode, *st[1:4], 1000, *st[5:10]))
+    calls = []
+
+    def access(*args):
+        calls.append(args)
+        return True
+
+    monkeypatch.setattr(os, "stat", lambda p: fake)
+    monkeypatch.setattr(os, "getuid", lambda: 1000)
+    monkeypatch.setattr(os, "access", access)
+    type = click.Path(**kwargs)
+
+    if valid:
+        assert type.convert(str(path), None, None) == str(path)
+    else:
+        with pytest.raises(click.BadParameter):
+            type.convert(str(path), None, None)
+
+    assert bool(calls) is accessed
+
+
+def test_path_stat_cache(runner, monkeypatch, tmp_path):
+    path = tmp_path.resolve() / "file"
+    path.touch()
+    real_stat = os.stat
+    calls = []
+
+    def counting_stat(p):
+        calls.append(p)
+        return real_stat(p)
+
+    monkeypatch.setattr(os, "stat", counting_stat)
+
+    @click.group()
+    @click.option("--config", type=click.Path(exists=True))
+    def cli(config):
+        pass
+
+    @cli.command()
+    @click.argument("input", type=click.Path(exists=True, resolve_path=True))
+    @click.pass_context
+    def run(ctx, input):
+        click.echo(ctx.stat(input).st_size)
+
+    result = runner.invoke(cli, ["--config", str(path), "run", str(path)])
+    assert result.output == "0\n"
+    assert len(calls) == 1
+
+
+@pytest.fixture
+def file_tree(tmp_path, monkeypatch):
+    for name in ("a/1.py", "a/2.txt", "a/b/3.py", "a/.4.py", "c/5.py"):
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.touch()
+
+    monkeypatch.chdir(tmp_path)
+
+
+def _expanded(type, *values):
+    @click.command()
+    @click.argument("paths", nargs=-1, type=type)
+    def cli(paths):
+        # The paths are found as they're used.
+        assert iter(paths) is paths
+        click.echo(" ".join(sorted(p.replace(os.sep, "/") for p in paths)))
+
+    return CliRunner().invoke(cli, values).output
+
+
+@pytest.mark.usefixtures("file_tree")
+@pytest.mark.parametrize(
+    ("kwargs", "values", "expect"),
+    [
+        ({}, ["a/*"], "a/1.py a/2.txt a/b"),
+        ({"dir_okay": False}, ["a/*", "c/*"], "a/1.py a/2.txt c/5.py"),
+        ({}, ["**/*.py"], "a/1.py a/b/3.py c/5.py"),
+        ({"exclude": ["b"]}, ["a/**/*.py"], "a/1.py"),
+        ({}, ["a/.*"], "a/.4.py"),
+        ({}, ["missing*"], ""),
+    ],
+)
+def test_path_expand_glob(kwargs, values, expect):
+    assert _expanded(click.Path(expand="glob", **kwargs), *values) == f"{expect}\n"
+
+
+@pytest.mark.usefixtures("file_tree")
+@pytest.mark.parametrize(
+    ("kwargs", "values", "expect"),
+    [
+        ({}, ["a"], "a/.4.py a/1.py a/2.txt a/b/3.py"),
+        (
+            {"include": ["*.py"], "exclude": [".*"]},
+            ["a", "c"],
+            "a/1.py a/b/3.py c/5.py",
+        ),
+        ({"exclude": ["b/*"]}, ["a"], "a/.4.py a/1.py a/2.txt"),
+        ({"include": ["*.py"]}, ["a/2.txt"], "a/2.txt"),
+        ({"file_okay": False}, ["."], "./a ./a/b ./c"),
+    ],
+)
+def test_path_expand_recursive(kwargs, values, expect):
+    type = click.Path(expand="recursive", **kwargs)
+    assert _expanded(type, *values) == f"{expect}\n"
+
+
+@pytest.mark.usefixtures("file_tree")
+def test_path_expand_normcase(monkeypatch):
+    from click import _expand
+
+    # Patterns match names the same way as glob components, after
+    # normalizing the case, as on Windows.
+    monkeypatch.setattr(os.path, "normcase", str.lower)
+    _expand._compile.cache_clear()
+
+    try:
+        type = click.Path(expand="recursive", include=["*.PY"], exclude=["B"])
+        assert _expanded(type, "a") == "a/.4.py a/1.py\n"
+        # Each pattern is compiled once, not for every name.
+        assert _expand._compile.cache_info().misses == 2
+    finally:
+        _expand._compile.cache_clear()
+
+
+@pytest.mark.usefixtures("file_tree")
+@pytest.mark.parametrize(
+    ("decorator", "args", "message"),
+    [
+        (click.argument, {"nargs": -1}, "Missing argument 'PATHS...'."),
+        (click.argument, {}, "Missing argument 'PATHS'."),
+        (click.option, {"multiple": True}, "Missing option '--paths'."),
+        (click.option, {}, "Missing option '--paths'."),
+    ],
+)
+def test_path_expand_required(runner, decorator, args, message):
+    name = "paths" if decorator is click.argument else "--paths"
+
+    @click.command()
+    @decorator(name, type=click.Path(expand="glob"), required=True, **args)
+    def cli(paths):
+        click.echo(" ".join(p.replace(os.sep, "/") for p in paths))
+
+    prefix = [] if decorator is click.argument else ["--paths"]
+    result = runner.invoke(cli, [*prefix, "missing*"])
+    assert result.exit_code == 2
+    assert message in result.output
+    # A pattern that matches something is accepted.
+    result = runner.invoke(cli, [*prefix, "c/*"])
+    assert result.output == "c/5.py\n"
+
+
+@pytest.mark.usefixtures("file_tree")
+def test_path_expand_exists():
+    type = click.Path(expand="glob", exists=True)
+    output = _expanded(type, "a/*.py", "missing*")
+    assert "Path pattern 'missing*' matches nothing." in output
+    type = click.Path(expand="recursive", exists=True)
+    assert "Path 'missing' does not exist." in _expanded(type, "missing")
+
+
+def test_convert_many(runner):
+    calls = []
+
+    class Upper(click.ParamType):
+        name = "upper"
+
+        def convert_many(self, values, param, ctx):
+            calls.append(values)
+            return tuple(value.upper() for value in values)
+
+    @click.command()
+    @click.argument("args", nargs=-1, type=Upper())
+    @click.option("--opt", multiple=True, type=Upper())
+    def cli(args, opt):
+        click.echo(f"{args} {opt}")
+
+    result = runner.invoke(cli, ["a", "b", "--opt", "c", "--opt", "d"])
+    assert result.output == "('A', 'B') ('C', 'D')\n"
+    assert sorted(calls) == [("a", "b"), ("c", "d")]
+
+
+@pytest.mark.parametrize(
+    ("type", "values", "expect"),
+    [
+        (click.INT, ["1", "-2", 3], (1, -2, 3)),
+        (click.FLOAT, ["1.5", "-2"], (1.5, -2.0)),
+        (click.IntRange(0, 5), ["0", "5"], (0, 5)),
+        (click.IntRange(0, 5, clamp=True), ["-1", "3", "9"], (0, 3, 5)),
+        (click.IntRange(0, 5, True, True, clamp=True), ["0", "5"], (1, 4)),
+        (click.FloatRange(0, 1), ["nan", "0.5"], None),
+        (click.FloatRange(0, 1, clamp=True), ["-1", "2"], (0.0, 1.0)),
+        (click.IntRange(container="array"), [], ()),
+        (click.INT, ["1", None], (1, None)),
+        (click.IntRange(0, 5, clamp=True), [None, "9"], (None, 5)),
+    ],
+)
+def test_number_convert_many(type, values, expect):
+    rv = type.convert_many(values, None, None)
+
+    if expect is None:
+        assert rv[0] != rv[0] and rv[1:] == (0.5,)
+    else:
+        assert rv == expect
+
+
+@pytest.mark.parametrize(
+    ("type", "values", "message"),
+    [
+        (click.INT, ["1", "x"], "'x' is not a valid integer."),
+        (click.IntRange(0, 5), ["1", "6"], "6 is not in the range 0<=x<=5."),
+        (click.FloatRange(0, 1), ["nan", "2"], "2.0 is not in the range 0<=x<=1."),
+        (click.FloatRange(0, 1, max_open=True), ["1"], "1.0 is not in the range"),
+        (
+            click.IntRange(container="array"),
+            ["1", str(2**64)],
+            f"{2**64} is too large to store in an array.",
+        ),
+    ],
+)
+def test_number_convert_many_fail(type, values, message):
+    with pytest.raises(click.BadParameter, match=re.escape(message)):
+        type.convert_many(values, None, None)
+
+
+def test_number_convert_many_container(runner):
+    @click.command()
+    @click.argument("ints", nargs=-1, type=click.IntRange(0, container="array"))
+    @click.option("--f", multiple=True, type=click.FloatRange(container="array"))
+    def cli(ints, f):
+        click.echo(f"{ints!r} {f!r}")
+
+    result = runner.invoke(cli, ["1", "2", "--f", "0.5"])
+    assert result.output == "array('q', [1, 2]) array('d', [0.5])\n"
+    assert isinstance(click.INT.convert_many(["1"], None, None), tuple)
+
+    with pytest.raises(ValueError, match="'container' must be"):
+        click.IntRange(container="list")
+
+
+def test_number_convert_many_numpy_missing(monkeypatch):
+    import importlib.util
+
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name: None)
+
+    # Fails when the parameter is defined, not when values are converted.
+    with pytest.raises(RuntimeError, match="NumPy must be installed"):
+        click.FloatRange(container="numpy")
+
+
+def test_number_convert_many_numpy():
+    numpy = pytest.importorskip("numpy")
+    rv = click.FloatRange(0, 1, container="numpy").convert_many(["0.5"], None, None)
+    assert rv.dtype == numpy.float64 and rv.tolist() == [0.5]
+
+
+def test_number_convert_many_subclass():
+    class Doubled(click.types.IntParamType):
+        def convert(self, value, param, ctx):
+            return super().convert(value, param, ctx) * 2
+
+    assert Doubled().convert_many(["1", "2"], None, None) == (2, 4)
+
+
+@pytest.mark.parametrize("count", [3, 200])
+def test_path_convert_many(runner, tmp_path, count):
+    paths = []
+
+    for i in range(count):
+        path = tmp_path / f"{i}.txt"
+        paths.append(str(path))
+
+        if i != 1 and i != count - 1:
+            path.touch()
+
+    @click.command()
+    @click.argument("paths", nargs=-1, type=click.Path(exists=True))
+    def cli(paths):
+        click.echo(len(paths))
+
+    result = runner.invoke(cli, paths[:1] + paths[2:-1])
+    assert result.output == f"{count - 2}\n"
+    result = runner.invoke(cli, paths)
+    assert result.exit_code == 2
+    # The first invalid value is reported.
+    assert f"Path '{paths[1]}' does not exist." in result.output
+    assert f"Path '{paths[-1]}' does not exist." not in result.output
+
+
+def test_path_convert_many_context(runner, monkeypatch):
+    import threading
+
+    threads = set()
+    original = click.Path.convert
+
+    def convert(self, value, param, ctx):
+        assert click.get_current_context() is ctx
+        threads.add(threading.get_ident())
+        return original(self, value, param, ctx)
+
+    monkeypatch.setattr(click.Path, "convert", convert)
+
+    @click.command()
+    @click.argument("paths", nargs=-1, type=click.Path())
+    def cli(paths):
+        click.echo(len(paths))
+
+    result = runner.invoke(cli, [f"{i}.txt" for i in range(100)])
+    assert result.exception is None
+    assert result.output == "100\n"
+    assert threading.get_ident() not in threads
+
+
+def test_path_convert_many_subclass():
+    import threading
+
+    threads = set()
+
+    class RecordPath(click.Path):
+        def convert(self, value, param, ctx):
+            threads.add(threading.get_ident())
+            return super().convert(value, param, ctx)
+
+    values = [f"{i}.txt" for i in range(100)]
+    assert RecordPath().convert_many(values, None, None) == tuple(values)
+    # An overridden convert isn't called from other threads.
+    assert threads == {threading.get_ident()}
+
+
 @pytest.mark.parametrize(
     "type",
     [
@@ -235,6 +582,125 @@ def test_file_surrogates(type, tmp_path):
         type.convert(path, None, None)
 
 
+def test_mapped_file(runner, tmp_path):
+    import mmap
+
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc" * 1000)
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    seen = []
+
+    @click.command()
+    @click.argument("inputs", nargs=-1, type=click.MappedFile())
+    def cli(inputs):
+        for value in inputs:
+            seen.append(value)
+            click.echo(f"{isinstance(value, mmap.mmap)} {value.read()[:6]!r}")
+
+    result = runner.invoke(cli, [str(path), str(empty), "-"], input=b"xyz")
+    assert result.output.splitlines() == [
+        "True b'abcabc'",
+        "False b''",
+        "False b'xyz'",
+    ]
+    assert seen[0].closed
+    assert seen[1].closed
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="requires mkfifo")
+def test_mapped_file_fifo(tmp_path, monkeypatch):
+    import builtins
+
+    path = tmp_path / "fifo"
+    os.mkfifo(path)
+    # Keep a writer open, so opening to read doesn't block.
+    fd = os.open(path, os.O_RDWR)
+    os.write(fd, b"xyz")
+    opened = []
+    original_open = builtins.open
+
+    def record_open(file, *args, **kwargs):
+        opened.append(file)
+        return original_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", record_open)
+
+    try:
+        value = click.MappedFile().convert(path, None, None)
+        # Only opened once, as a stream.
+        assert path not in opened
+        assert value.read(3) == b"xyz"
+        value.close()
+    finally:
+        os.close(fd)
+
+
+@pytest.mark.parametrize("name", ["missing", "."])
+def test_mapped_file_error(tmp_path, name):
+    # Errors are reported the same as for File.
+    path = tmp_path / name
+
+    with pytest.raises(click.BadParameter) as expect:
+        click.File("rb").convert(path, None, None)
+
+    with pytest.raises(click.BadParameter) as e:
+        click.MappedFile().convert(path, None, None)
+
+    assert e.value.message == expect.value.message
+
+
+@pytest.mark.parametrize(
+    ("separator", "data", "expect"),
+    [
+        (b"\n", b"a\nbb\n\nc", [b"a", b"bb", b"", b"c"]),
+        (b"\n", b"a\nb\n", [b"a", b"b"]),
+        (b"\0", b"a b\0c\nd\0", [b"a b", b"c\nd"]),
+        (b"--", b"a-b--c---d", [b"a-b", b"c", b"-d"]),
+        ("\n", "é\n€\r\n".encode(), ["é", "€\r"]),
+        (b"\n", b"", []),
+    ],
+)
+@pytest.mark.parametrize("buffer_size", [1, 2, 1 << 16])
+@pytest.mark.parametrize("read_ahead", [False, True])
+def test_record_stream(tmp_path, separator, data, expect, buffer_size, read_ahead):
+    path = tmp_path / "data"
+    path.write_bytes(data)
+    type = click.RecordStream(
+        separator, encoding="utf-8", buffer_size=buffer_size, read_ahead=read_ahead
+    )
+    assert list(type.convert(path, None, None)) == expect
+
+
+def test_line_stream(runner, tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_text("a\nb\n", encoding="utf-8")
+
+    @click.command()
+    @click.argument("inputs", nargs=-1, type=click.LineStream(encoding="utf-8"))
+    def cli(inputs):
+        for lines in inputs:
+            click.echo(repr(list(lines)))
+
+    result = runner.invoke(cli, [str(path), "-"], input="c\nd")
+    assert result.output.splitlines() == ["['a', 'b']", "['c', 'd']"]
+
+
+def test_record_stream_errors(tmp_path):
+    with pytest.raises(ValueError, match="must not be empty"):
+        click.RecordStream(b"")
+
+    with pytest.raises(click.BadParameter, match="No such file or directory"):
+        click.RecordStream().convert(tmp_path / "missing", None, None)
+
+    path = tmp_path / "data"
+    path.write_bytes(b"\xff\n")
+    records = click.LineStream(encoding="utf-8").convert(path, None, None)
+
+    with pytest.raises(UnicodeDecodeError):
+        list(records)
+
+
 def test_file_error_surrogates():
     message = FileError(filename="\udcff").format_message()
     assert message == "Could not open file '�': unknown error"
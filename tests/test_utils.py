@@ -8,6 +8,9 @@ from contextlib import nullcontext
 from decimal import Decimal
 from fractions import Fraction
 from functools import partial
+from io import BufferedReader
+from io import BytesIO
+from io import FileIO
 from io import StringIO
 from pathlib import Path
 from tempfile import tempdir
@@ -657,6 +660,223 @@ def test_open_file_atomic_permissions_new_file(runner):
         assert stat.S_IMODE(os.stat("new.txt").st_mode) == permissions
 
 
+@pytest.mark.parametrize("durability", ["none", "file", "dir"])
+def test_open_file_atomic_durability(tmp_path, monkeypatch, durability):
+    synced = []
+    monkeypatch.setattr(os, "fsync", synced.append)
+    path = tmp_path / "out.txt"
+
+    with click.open_file(path, "w", atomic=True, durability=durability) as f:
+        f.write("new")
+
+    assert path.read_text() == "new"
+    assert len(synced) == {"none": 0, "file": 1, "dir": 2}[durability]
+
+
+def test_open_file_atomic_error(tmp_path):
+    path = tmp_path / "out.txt"
+    path.write_text("old")
+
+    with pytest.raises(RuntimeError):
+        with click.open_file(path, "w", atomic=True) as f:
+            f.write("new")
+            raise RuntimeError
+
+    assert path.read_text() == "old"
+    assert os.listdir(tmp_path) == ["out.txt"]
+
+    with pytest.raises(click.exceptions.Exit):
+        with click.open_file(path, "w", atomic=True) as f:
+            f.write("new")
+            raise click.exceptions.Exit(0)
+
+    assert path.read_text() == "new"
+
+
+def test_atomic_batch(tmp_path):
+    a = tmp_path / "a.txt"
+    b = tmp_path / "b.txt"
+
+    with click.atomic_batch():
+        with click.open_file(a, "w", atomic=True) as f:
+            f.write("a")
+
+        # Closed files wait for the batch.
+        assert not a.exists()
+        f = click.open_file(b, "w", atomic=True)
+        f.write("b")
+
+    assert a.read_text() == "a"
+    assert b.read_text() == "b"
+
+    with pytest.raises(RuntimeError):
+        with click.atomic_batch():
+            with click.open_file(a, "w", atomic=True) as f:
+                f.write("new a")
+
+            with click.atomic_batch():
+                with click.open_file(b, "w", atomic=True) as f:
+                    f.write("new b")
+
+            raise RuntimeError
+
+    assert a.read_text() == "a"
+    assert b.read_text() == "b"
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_atomic_batch_caught_error(tmp_path):
+    a = tmp_path / "a.txt"
+    b = tmp_path / "b.txt"
+    b.write_text("b")
+
+    with click.atomic_batch():
+        with click.open_file(a, "w", atomic=True) as f:
+            f.write("a")
+
+        # A file discarded by an error that is caught isn't committed.
+        with pytest.raises(ValueError):
+            with click.open_file(b, "w", atomic=True) as f:
+                f.write("new b")
+                raise ValueError
+
+    assert a.read_text() == "a"
+    assert b.read_text() == "b"
+    assert sorted(os.listdir(tmp_path)) == ["a.txt", "b.txt"]
+
+
+def test_open_file_buffering(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"abc")
+
+    with click.open_file(path, "rb", buffering=0) as f:
+        assert isinstance(f, FileIO)
+        buffer = bytearray(2)
+        assert f.readinto(buffer) == 2
+        assert buffer == b"ab"
+
+    f = click.File("rb", buffering=0).convert(path, None, None)
+    assert isinstance(f, FileIO)
+    f.close()
+
+
+@pytest.mark.parametrize(
+    ("src", "dst"),
+    [
+        (lambda: StringIO("abc" * 100), StringIO),
+        (lambda: BytesIO(b"abc" * 100), BytesIO),
+    ],
+)
+def test_copy_stream(src, dst):
+    src = src()
+    src.read(3)
+    out = dst()
+    assert click.copy_stream(src, out, buffer_size=7) == 297
+    assert out.getvalue() == src.getvalue()[3:]
+
+
+@pytest.mark.parametrize(
+    "pipe",
+    [False, pytest.param(True, marks=pytest.mark.skipif(WIN, reason="Uses cat."))],
+)
+def test_copy_stream_files(tmp_path, monkeypatch, pipe):
+    data = os.urandom(200_000)
+    path = tmp_path / "in.bin"
+    path.write_bytes(data)
+    kernel = []
+
+    for name in ("sendfile", "splice"):
+        func = getattr(os, name, None)
+
+        if func is not None:
+
+            def wrapped(*args, _func=func, _name=name):
+                kernel.append(_name)
+                return _func(*args)
+
+            monkeypatch.setattr(os, name, wrapped)
+
+    if pipe:
+        proc = subprocess.Popen(["cat", str(path)], stdout=subprocess.PIPE)
+        src = proc.stdout
+    else:
+        src = open(path, "rb")
+
+    with src, open(tmp_path / "out.bin", "wb") as dst:
+        # Data in the source's buffer is copied first.
+        assert src.read(5) == data[:5]
+        assert click.copy_stream(src, dst) == len(data) - 5
+
+    if pipe:
+        proc.wait()
+
+    assert (tmp_path / "out.bin").read_bytes() == data[5:]
+
+    if sys.platform.startswith("linux"):
+        assert kernel
+
+
+def test_copy_stream_file_values(runner, tmp_path, monkeypatch):
+    """Lazy and kept open files from File are copied by file descriptor."""
+    data = os.urandom(100_000)
+    (tmp_path / "in.bin").write_bytes(data)
+    calls = []
+    monkeypatch.setattr(
+        click.utils, "_copy_fds", lambda *args: calls.append(args) or None
+    )
+
+    @click.command()
+    @click.argument("src", type=click.File("rb", lazy=True))
+    @click.argument("dst", type=click.File("wb"))
+    def cli(src, dst):
+        click.copy_stream(src, dst)
+
+    result = runner.invoke(cli, [str(tmp_path / "in.bin"), str(tmp_path / "out.bin")])
+    assert result.exit_code == 0, result.output
+    # The kernel copy is disabled, so the data is copied through a buffer.
+    assert (tmp_path / "out.bin").read_bytes() == data
+
+    if sys.platform.startswith("linux"):
+        assert calls
+
+
+def test_copy_stream_read_write_file(tmp_path):
+    """A stream opened for reading and writing keeps its own position, so
+    it's copied through the buffer instead of by file descriptor.
+    """
+    data = os.urandom(100_000)
+    path = tmp_path / "in.bin"
+    path.write_bytes(data)
+
+    with open(path, "r+b") as src, open(tmp_path / "out.bin", "wb") as dst:
+        assert src.read(5) == data[:5]
+        assert click.copy_stream(src, dst) == len(data) - 5
+
+    assert (tmp_path / "out.bin").read_bytes() == data[5:]
+
+
+def test_copy_stream_wrapper_with_fileno(tmp_path):
+    """A wrapper that exposes the underlying file descriptor but changes
+    the data is copied through its own read method.
+    """
+    path = tmp_path / "in.bin"
+    path.write_bytes(b"abc" * 10_000)
+
+    class Upper(BufferedReader):
+        def read(self, size=-1):
+            return super().read(size).upper()
+
+        def readinto(self, buffer):
+            data = self.read(len(buffer))
+            buffer[: len(data)] = data
+            return len(data)
+
+    with Upper(FileIO(path)) as src, open(tmp_path / "out.bin", "wb") as dst:
+        assert click.copy_stream(src, dst) == 30_000
+
+    assert (tmp_path / "out.bin").read_bytes() == b"ABC" * 10_000
+
+
 def test_iter_keepopenfile(tmpdir):
     expected = list(map(str, range(10)))
     p = tmpdir.mkdir("testdir").join("testfile")